@@ -0,0 +1,222 @@
+# backup_store.py
+"""
+Content-addressed, incremental backups of the transactions CSV.
+
+A backup splits the file into chunks, stores each chunk once under its
+SHA-256 (zlib-compressed, in chunks/<2 hex>/<hash>.z) and writes a small
+manifest listing the chunk hashes in order (snapshots/<id>.json). A chunk
+already in the store is not written again, so a backup after an import costs
+the chunks holding the new rows, not another full copy of the file.
+
+Chunk boundaries are content-defined and always fall between lines: a new
+chunk starts at a line whose first bytes (for this CSV, the Id and the start
+of the Date) hash to 1 in LINES_PER_CUT, within MIN_CHUNK..MAX_CHUNK bytes. The choice depends on the line itself, not on its offset, so
+inserting or deleting rows only changes the chunk(s) around the edit and
+every later chunk keeps its hash.
+
+Restore reassembles a snapshot's chunks, checks the file hash and replaces
+the target atomically. prune() applies a keep-last/daily/weekly retention
+policy and deletes the chunks no remaining snapshot uses.
+"""
+import datetime
+import hashlib
+import json
+import os
+import zlib
+
+import numpy as np
+
+LINES_PER_CUT = 512               # average lines per chunk
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 1024 * 1024
+FINGERPRINT_BYTES = 16            # bytes at the start of a line that decide whether it starts a new chunk
+COMPRESS_LEVEL = 6
+DEFAULT_RETENTION = {"keep_last": 10, "keep_daily": 7, "keep_weekly": 8}
+
+_MIX1 = np.uint64(0x9E3779B97F4A7C15)
+_MIX2 = np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+def chunk_bounds(data: bytes) -> list[int]:
+    """End offsets of the chunks of data (the last one is len(data))."""
+    if not data:
+        return []
+    buf = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(buf == 10) + 1   # just after each "\n" = start of the next line
+    starts = ends[ends <= len(buf) - FINGERPRINT_BYTES]   # a line too close to the end never starts a chunk
+    if len(starts):
+        words = buf[starts[:, None] + np.arange(FINGERPRINT_BYTES)].view("<u8")
+        h = words[:, 0] * _MIX1 ^ words[:, 1] * _MIX2
+        h ^= h >> np.uint64(31)
+        h *= _MIX1
+        cuts = starts[(h >> np.uint64(40)) % np.uint64(LINES_PER_CUT) == 0]
+    else:
+        cuts = starts
+    bounds = []
+    last = 0
+    for cut in [int(c) for c in cuts] + [len(data)]:
+        while cut - last > MAX_CHUNK:
+            # No natural cut for too long: cut at the last line end that fits (mid-line only for a huge line)
+            i = np.searchsorted(ends, last + MAX_CHUNK, side="right") - 1
+            forced = int(ends[i]) if i >= 0 and ends[i] > last else last + MAX_CHUNK
+            bounds.append(forced)
+            last = forced
+        if cut - last >= MIN_CHUNK or (cut == len(data) and cut > last):
+            bounds.append(cut)
+            last = cut
+    return bounds
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now().replace(microsecond=0)
+
+
+def _write_atomic(path: str, payload: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+class BackupStore:
+    """Backups of one or more files under root (created on first backup)."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.chunk_dir = os.path.join(root, "chunks")
+        self.snapshot_dir = os.path.join(root, "snapshots")
+
+    # ---------- backup
+    def backup(self, path: str, label: str = "") -> dict:
+        """
+        Snapshot the file at path; returns its manifest. When the file is unchanged since the latest
+        snapshot of it, that snapshot is returned and nothing is written.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        source = os.path.basename(path)
+        latest = next((s for s in reversed(self.snapshots()) if s["source"] == source), None)
+        if latest is not None and latest["sha256"] == digest:
+            return latest
+
+        chunks = []
+        new_chunks = new_bytes = 0
+        start = 0
+        for end in chunk_bounds(data):
+            piece = data[start:end]
+            h = hashlib.sha256(piece).hexdigest()
+            chunk_path = self._chunk_path(h)
+            if not os.path.exists(chunk_path):
+                os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+                packed = zlib.compress(piece, COMPRESS_LEVEL)
+                _write_atomic(chunk_path, packed)
+                new_chunks += 1
+                new_bytes += len(packed)
+            chunks.append([h, end - start])
+            start = end
+
+        created = _now()
+        manifest = {
+            "id": f"{created:%Y%m%d-%H%M%S}-{digest[:8]}",
+            "created": created.isoformat(),
+            "label": label,
+            "source": source,
+            "size": len(data),
+            "sha256": digest,
+            "chunks": chunks,
+            "new_chunks": new_chunks,
+            "new_bytes": new_bytes,
+        }
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        _write_atomic(self._snapshot_path(manifest["id"]), json.dumps(manifest).encode("utf-8"))
+        return manifest
+
+    # ---------- listing / restore
+    def snapshots(self) -> list[dict]:
+        """Manifests, oldest first."""
+        if not os.path.isdir(self.snapshot_dir):
+            return []
+        out = []
+        for name in os.listdir(self.snapshot_dir):
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.snapshot_dir, name), "r", encoding="utf-8") as f:
+                        out.append(json.load(f))
+                except (OSError, ValueError):
+                    continue   # half-written or damaged manifest: not a usable snapshot
+        return sorted(out, key=lambda s: (s["created"], s["id"]))
+
+    def read(self, snapshot_id: str) -> bytes:
+        """The file content of a snapshot (checked against its SHA-256)."""
+        with open(self._snapshot_path(snapshot_id), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        parts = []
+        for h, size in manifest["chunks"]:
+            with open(self._chunk_path(h), "rb") as f:
+                piece = zlib.decompress(f.read())
+            if len(piece) != size:
+                raise ValueError(f"Backup chunk {h[:12]} is damaged.")
+            parts.append(piece)
+        data = b"".join(parts)
+        if hashlib.sha256(data).hexdigest() != manifest["sha256"]:
+            raise ValueError(f"Backup {snapshot_id} does not match its checksum.")
+        return data
+
+    def restore(self, snapshot_id: str, dest: str):
+        """Replace dest with the snapshot's content (atomically: dest is untouched if anything fails)."""
+        _write_atomic(dest, self.read(snapshot_id))
+
+    # ---------- retention
+    def prune(self, keep_last: int = DEFAULT_RETENTION["keep_last"],
+              keep_daily: int = DEFAULT_RETENTION["keep_daily"],
+              keep_weekly: int = DEFAULT_RETENTION["keep_weekly"]) -> tuple[list[str], int]:
+        """
+        Delete the snapshots no rule keeps, then the chunks nothing references.
+        Rules: the keep_last newest; the newest of each of the keep_daily most recent days with a
+        snapshot; the same per ISO week for keep_weekly. Returns (deleted ids, chunk bytes freed).
+        """
+        snaps = self.snapshots()[::-1]   # newest first
+        keep = {s["id"] for s in snaps[:max(0, keep_last)]}
+        for fmt, count in (("%Y-%m-%d", keep_daily), ("%G-W%V", keep_weekly)):
+            buckets = []
+            for s in snaps:
+                bucket = datetime.datetime.fromisoformat(s["created"]).strftime(fmt)
+                if bucket in buckets:
+                    continue
+                if len(buckets) >= count:
+                    break
+                buckets.append(bucket)
+                keep.add(s["id"])
+        deleted = [s["id"] for s in snaps if s["id"] not in keep]
+        for snapshot_id in deleted:
+            os.remove(self._snapshot_path(snapshot_id))
+        return deleted, self.collect_garbage()
+
+    def collect_garbage(self) -> int:
+        """Delete chunks no snapshot references; returns the bytes freed."""
+        if not os.path.isdir(self.chunk_dir):
+            return 0
+        used = {h for s in self.snapshots() for h, _ in s["chunks"]}
+        freed = 0
+        for sub in os.listdir(self.chunk_dir):
+            folder = os.path.join(self.chunk_dir, sub)
+            for name in os.listdir(folder):
+                if name.endswith(".z") and name[:-2] not in used:
+                    path = os.path.join(folder, name)
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+        return freed
+
+    def stored_bytes(self) -> int:
+        """Disk used by chunks and manifests."""
+        total = 0
+        for folder, _, names in os.walk(self.root):
+            total += sum(os.path.getsize(os.path.join(folder, n)) for n in names)
+        return total
+
+    def _chunk_path(self, h: str) -> str:
+        return os.path.join(self.chunk_dir, h[:2], h + ".z")
+
+    def _snapshot_path(self, snapshot_id: str) -> str:
+        return os.path.join(self.snapshot_dir, snapshot_id + ".json")
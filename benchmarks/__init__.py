@@ -0,0 +1 @@
+"""Benchmark suite for FinanceTool (run from the repo root with `python -m benchmarks.<script>`)."""
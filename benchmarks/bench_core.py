@@ -0,0 +1,305 @@
+# benchmarks/bench_core.py
+"""
+Non-GUI core benchmarks over synthetic ledgers.
+
+    python -m benchmarks.bench_core                          # 10k + 100k rows
+    python -m benchmarks.bench_core --sizes 10000 100000 1000000
+    python -m benchmarks.bench_core --out before.json
+
+Runs FinanceApp's data methods against a headless host object (no widgets),
+in a scratch directory so no real data files are touched.
+"""
+import os
+import datetime
+import random
+import argparse
+import tempfile
+
+from benchmarks import synthetic
+from benchmarks.harness import run_case, run_meta, write_results, default_out_path
+
+import main
+from main import FinanceApp
+import import_wizard as iw
+from ledger import BalanceLedger
+import transfers
+import budget_engine
+import recurring
+import forecast
+import dashboard_data
+from rollups import MonthlyRollup
+from month_store import MonthStore, row_months
+from history import CommandLog
+from snapshot import TransactionSnapshot
+from search_index import TokenIndex, SEARCH_COLUMNS
+import filter_engine
+
+
+class LedgerHost:
+    """Carries the state FinanceApp's data methods read, so they run without a window."""
+    load_transactions = FinanceApp.load_transactions
+    _read_transactions_file = FinanceApp._read_transactions_file
+    save_transactions = FinanceApp.save_transactions
+    _wanted_months = FinanceApp._wanted_months
+    _load_months = FinanceApp._load_months
+    _load_window = FinanceApp._load_window
+    _paging_changed = FinanceApp._paging_changed
+    repair_transaction_ids = FinanceApp.repair_transaction_ids
+    get_today = FinanceApp.get_today
+    compute_date_window = FinanceApp.compute_date_window
+    snapshot = FinanceApp.snapshot
+    search_columns = FinanceApp.search_columns
+    get_filtered_transactions = FinanceApp.get_filtered_transactions
+    get_sorted_transactions = FinanceApp.get_sorted_transactions
+    _sorted_positions = FinanceApp._sorted_positions
+    _transactions_mask = FinanceApp._transactions_mask
+    sort_transactions_df = FinanceApp.sort_transactions_df
+    get_spend_by_category_in_range = FinanceApp.get_spend_by_category_in_range
+    spend_index = FinanceApp.spend_index
+    budget_engine = FinanceApp.budget_engine
+    get_spend_by_account_in_range = FinanceApp.get_spend_by_account_in_range
+    get_recent_transactions_in_range = FinanceApp.get_recent_transactions_in_range
+    balances_from_start = FinanceApp.balances_from_start
+    _autocat_suggest = FinanceApp._autocat_suggest
+
+    def __init__(self, df, autocat):
+        self.df = df
+        self.data_version = 0
+        self.store = MonthStore(main.TRANSACTIONS_FILE, main.TRANSACTIONS_INDEX_FILE, main.TRANSACTION_COLUMNS,
+                                main.normalize_transactions)
+        self._loaded = set(row_months(df).tolist())   # the generated ledger is all in memory
+        self._views = {}
+        self._page_base = self.store.base(self._loaded)
+        self.history = CommandLog()
+        self.ledger = BalanceLedger.from_frame(df)
+        self._spend_index = None
+        self._spend_index_version = -1
+        self._snapshot = None
+        self.search_index = TokenIndex(main._vendor_tokens)
+        self._search_columns = []
+        self._search_snapshot = None
+        self.txn_filters = filter_engine.empty_spec()
+        self.filter_engine = filter_engine.FilterEngine()
+        self.autocat = autocat
+        self.budgets = {}
+        self.accounts = synthetic.accounts_json()
+        self.settings = {
+            "today_override": synthetic.ANCHOR_DATE.strftime("%Y-%m-%d"),
+            "auto_categorize_enabled": True,
+            "auto_categorize_threshold": 0.70,
+        }
+        self.txn_sort_mode = main.TXN_SORT_MODES[0]
+
+
+def load_autocat() -> dict:
+    """Seed vendor map plus the repo's sample memory (what a real install starts with)."""
+    autocat = main._read_json_file(main._project_path(main.AUTOCAT_FILE), {})
+    return main._merge_seed_autocat_from_file(autocat, synthetic.SEED_VENDORS_FILE)
+
+
+def bench_size(n: int, args, results: list):
+    print(f"\n== {n:,} rows ==")
+    ledger = synthetic.generate_ledger(n, seed=args.seed)
+    host = LedgerHost(ledger.copy(), load_autocat())
+    size = len(ledger)
+
+    # --- Persistence
+    results.append(run_case("save_transactions", host.save_transactions, size=size, rows=size, repeat=args.repeat))
+    # Paged load: only the resident months are read; then the whole file, as an unpaged load reads it
+    results.append(run_case("load_transactions", host.load_transactions, size=size, rows=size, repeat=args.repeat))
+    results.append(run_case("load_transactions[whole file]", host._read_transactions_file, size=size, rows=size,
+                            repeat=args.repeat))
+    host.df = host.load_transactions(keep=None)   # the cases below run over the full ledger
+    results.append(run_case("repair_transaction_ids", lambda: host.repair_transaction_ids(save=False),
+                            size=size, rows=size, repeat=args.repeat))
+
+    # --- Snapshot of a new data version: take it, then the first parse (shared by every reader after)
+    results.append(run_case("snapshot.take", lambda: TransactionSnapshot(host.df, 0), size=size, rows=size,
+                            repeat=args.repeat))
+    results.append(run_case("snapshot.parsed[cold]", lambda: TransactionSnapshot(host.df, 0).parsed(),
+                            size=size, rows=size, repeat=args.repeat))
+
+    # --- Date filtering
+    for mode in ["This Month", "Last 30 Days", "This Year", "All"]:
+        results.append(run_case(f"filter[{mode}]", lambda m=mode: host.get_filtered_transactions(mode=m, query=""),
+                                size=size, rows=size, repeat=args.repeat))
+
+    # --- Multi-column filters: every predicate built (cold), then one filter changed against cached masks
+    spec = dict(filter_engine.empty_spec(), accounts=sorted(set(host.df["Account"]))[:2],
+                categories=sorted(set(host.df["Category"]))[:6], amount_min=-250.0, amount_max=0.0,
+                transfers=filter_engine.TRANSFER_MODES[1])
+
+    def _filters_cold():
+        host.filter_engine = filter_engine.FilterEngine()
+        host.get_filtered_transactions(mode="This Year", query="", filters=spec)
+    results.append(run_case("filters[This Year, cold]", _filters_cold, size=size, rows=size, repeat=args.repeat))
+    host.get_filtered_transactions(mode="All", query="", filters=spec)
+    changed = dict(spec, amount_min=-100.0)
+    results.append(run_case("filters[All, one changed]",
+                            lambda: host.get_filtered_transactions(mode="All", query="", filters=changed),
+                            size=size, rows=size, repeat=args.repeat))
+
+    # --- Text search: index build over a new snapshot, then as-you-type queries (All + This Year)
+    def _index_build():
+        host.search_index = TokenIndex(main._vendor_tokens)
+        host._search_snapshot = None
+        host.search_columns()
+    results.append(run_case("search.index_build", _index_build, size=size, rows=size, repeat=args.repeat))
+    results.append(run_case("search.new_version", lambda: host.search_index.value_ids(
+        TransactionSnapshot(host.df, 0).factorized("Vendor")[1]), size=size, rows=size, repeat=args.repeat))
+    vendor = str(host.df["Vendor"].iloc[0])
+    typed = [vendor[:k] for k in range(1, min(len(vendor), 8) + 1)]
+    for mode in ["All", "This Year"]:
+        results.append(run_case(f"search[{mode}, typing]",
+                                lambda m=mode: [host.get_filtered_transactions(mode=m, query=q) for q in typed],
+                                size=size, rows=len(typed), repeat=args.repeat))
+
+    # --- Sorting (every dropdown mode over the full ledger)
+    for mode in main.TXN_SORT_MODES:
+        def _sort(m=mode):
+            host.txn_sort_mode = m
+            host.sort_transactions_df(host.df)
+        results.append(run_case(f"sort[{mode}]", _sort, size=size, rows=size, repeat=args.repeat))
+
+    # --- Filter + sort through the snapshot permutations (what update_table fetches), first on a new
+    # snapshot (ranks and permutation built) and then on the cached permutation
+    for mode in main.TXN_SORT_MODES:
+        def _sorted_cold(m=mode):
+            host.txn_sort_mode = m
+            host._snapshot = None
+            host.get_sorted_transactions(mode="This Year", query="")
+        results.append(run_case(f"sorted_view[{mode}, cold]", _sorted_cold, size=size, rows=size, repeat=args.repeat))
+        host.txn_sort_mode = mode
+        results.append(run_case(f"sorted_view[{mode}, This Year]",
+                                lambda: host.get_sorted_transactions(mode="This Year", query=""),
+                                size=size, rows=size, repeat=args.repeat))
+
+    # --- Spend aggregations (dashboard/report helpers)
+    today = synthetic.ANCHOR_DATE
+    results.append(run_case("spend_index.build", lambda: budget_engine.SpendIndex.from_frame(host.df),
+                            size=size, rows=size, repeat=args.repeat))
+    ranges = {"month": (today.replace(day=1), today), "ytd": (today.replace(month=1, day=1), today),
+              "all": host.compute_date_window("All")}
+    for label, (start, end) in ranges.items():
+        results.append(run_case(f"spend_by_category[{label}]", lambda s=start, e=end: host.get_spend_by_category_in_range(s, e),
+                                size=size, rows=size, repeat=args.repeat))
+        results.append(run_case(f"spend_by_account[{label}]", lambda s=start, e=end: host.get_spend_by_account_in_range(s, e),
+                                size=size, rows=size, repeat=args.repeat))
+    results.append(run_case("recent_transactions[ytd]", lambda: host.get_recent_transactions_in_range(*ranges["ytd"], n=10),
+                            size=size, rows=size, repeat=args.repeat))
+
+    # --- Budget statuses (one budget per spending category, all periods and modes)
+    cats = sorted(set(host.df["Category"]) - {main.UNCATEGORIZED, "Salary", "Transfer"})
+    host.budgets = {c: {"amount": 150.0 + 25 * i, "period": budget_engine.PERIODS[i % 3],
+                        "mode": budget_engine.MODES[(i // 3) % 3], "since": "2024-01-01"}
+                    for i, c in enumerate(cats)}
+    results.append(run_case("budget_statuses", lambda: host.budget_engine().statuses(today),
+                            size=size, rows=len(host.budgets), repeat=args.repeat))
+
+    # --- Dashboard snapshot (what the worker thread computes per request)
+    inputs = {"transactions": None, "spend_index": None, "data_version": 0,
+              "start": ranges["ytd"][0], "end": ranges["ytd"][1], "today": today,
+              "budgets": host.budgets, "balances": [float(a["balance"]) for a in host.accounts]}
+    results.append(run_case("dashboard_snapshot[ytd, cold]",
+                            lambda: dashboard_data.compute_snapshot(dict(inputs, transactions=TransactionSnapshot(host.df, 0))),
+                            size=size, rows=size, repeat=args.repeat))
+    warm = dict(inputs, transactions=host.snapshot(), spend_index=host.spend_index())
+    results.append(run_case("dashboard_snapshot[ytd, warm]", lambda: dashboard_data.compute_snapshot(warm),
+                            size=size, rows=size, repeat=args.repeat))
+
+    # --- Auto-categorization throughput (sampled vendors)
+    rnd = random.Random(args.seed)
+    vendors = host.df["Vendor"].tolist()
+    sample = [vendors[rnd.randrange(len(vendors))] for _ in range(min(args.autocat_samples, len(vendors)))]
+    results.append(run_case("_autocat_suggest", lambda: [host._autocat_suggest(v) for v in sample],
+                            size=size, rows=len(sample), repeat=args.repeat))
+
+    # --- Import parsing + dup_key dedup against the ledger
+    raw = synthetic.generate_import_file(host.df, args.import_rows, seed=args.seed)
+    mapping = iw.guess_mapping(list(raw.columns))
+    opts = dict(strip_currency=True, paren_negative=True, thousands_sep=True, invert=False)
+    results.append(run_case("import.existing_dup_keys", lambda: iw.existing_dup_keys(host.df),
+                            size=size, rows=size, repeat=args.repeat))
+    existing = iw.existing_dup_keys(host.df)
+
+    def _parse_and_dedup():
+        seen = set()
+        for _, row in raw.iterrows():
+            norm = iw.normalize_import_row(row, mapping, opts, "Visa")
+            key = iw.dup_key(norm)
+            if key not in existing and key not in seen:
+                seen.add(key)
+    results.append(run_case("import.parse_and_dedup", _parse_and_dedup, size=size, rows=len(raw), repeat=args.repeat))
+
+    # --- Transfer pair detection (hash join on amount + date bucket)
+    results.append(run_case("find_transfer_pairs", lambda: transfers.find_transfer_pairs(host.df),
+                            size=size, rows=size, repeat=args.repeat))
+
+    # --- Recurring charge detection (cold key memo on the first repeat)
+    results.append(run_case("detect_recurring", lambda: recurring.detect_recurring(host.df, main._vendor_root, today=today),
+                            size=size, rows=size, repeat=args.repeat))
+
+    # --- 12-month cash-flow forecast (recurring series and category accounts precomputed, as the app caches them)
+    rec = recurring.detect_recurring(host.df, main._vendor_root, today=today)
+    cat_accounts = forecast.category_accounts(host.df, today)
+    balances = {a["name"]: float(a["balance"]) for a in host.accounts}
+    results.append(run_case("forecast[12m]", lambda: forecast.forecast(balances, today, 12, recurring_df=rec,
+                                                                       budgets=host.budgets,
+                                                                       category_accounts=cat_accounts),
+                            size=size, rows=len(host.budgets), repeat=args.repeat))
+
+    # --- Monthly rollups: full build, no-op / one-edit sync, and a multi-year Reports query
+    results.append(run_case("rollups.rebuild", lambda: MonthlyRollup.from_frame(host.df), size=size, rows=size, repeat=args.repeat))
+    rollup = MonthlyRollup.from_frame(host.df)
+    edited = host.df.copy()
+
+    def _sync_one_edit():
+        edited.iat[0, edited.columns.get_loc("Amount")] += 1.0
+        rollup.sync(edited)
+    results.append(run_case("rollups.sync[1 edit]", _sync_one_edit, size=size, rows=size, repeat=args.repeat))
+    first = datetime.date.fromisoformat(str(host.df["Date"].min())[:10])
+    results.append(run_case("rollups.query[all years]", lambda: (rollup.monthly_totals(first, today),
+                                                                 rollup.category_totals(first, today)),
+                            size=size, rows=len(rollup.months()), repeat=args.repeat))
+
+    # --- Balance recalculation
+    results.append(run_case("balances_from_start", host.balances_from_start, size=size, rows=size, repeat=args.repeat))
+    results.append(run_case("ledger.rebuild", lambda: BalanceLedger.from_frame(host.df), size=size, rows=size, repeat=args.repeat))
+    ledger = BalanceLedger.from_frame(host.df)
+    edits = host.df.sample(n=min(1_000, size), random_state=args.seed)[["Id", "Account", "Amount", "AppliedToBalance"]]
+    edits = list(edits.itertuples(index=False, name=None))
+
+    def _edit_rows():
+        for tx_id, acct, amt, applied in edits:
+            ledger.set_row(tx_id, acct, amt + 1.0, applied)
+            ledger.set_row(tx_id, acct, amt, applied)
+    results.append(run_case("ledger.set_row", _edit_rows, size=size, rows=2 * len(edits), repeat=args.repeat))
+
+
+def main_cli(argv=None):
+    ap = argparse.ArgumentParser(description="FinanceTool non-GUI core benchmarks")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                    help="ledger sizes in rows (e.g. 10000 100000 1000000)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--import-rows", type=int, default=5_000, help="rows in the synthetic import file")
+    ap.add_argument("--autocat-samples", type=int, default=2_000, help="vendors passed to _autocat_suggest")
+    ap.add_argument("--out", default=None, help="results JSON (default benchmarks/results/core-<commit>.json)")
+    args = ap.parse_args(argv)
+
+    meta = run_meta(suite="core", sizes=args.sizes, repeat=args.repeat, seed=args.seed,
+                    import_rows=args.import_rows, autocat_samples=args.autocat_samples)
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="financetool-bench-") as work:
+        os.chdir(work)  # load/save_transactions use relative data paths
+        try:
+            for n in args.sizes:
+                bench_size(n, args, results)
+        finally:
+            os.chdir(cwd)
+    write_results(args.out or default_out_path("core", meta["commit"]), meta, results)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,166 @@
+# benchmarks/bench_ui.py
+"""
+Headless GUI refresh benchmarks (Qt 'offscreen' platform, no display needed).
+
+    python -m benchmarks.bench_ui                      # 10k + 100k rows
+    python -m benchmarks.bench_ui --sizes 10000 --repeat 5
+    python -m benchmarks.bench_ui --chart-backend native   # QPainter charts instead of Matplotlib
+
+Builds a real FinanceApp over a synthetic ledger in a scratch directory and
+times the refresh paths users wait on: Transactions table population,
+Dashboard (budget progress bars, tables, donut), and the Reports charts.
+Each timing includes processEvents() so layout/paint of the visible tab counts.
+Chart cases drop the render cache first; the "cached charts" cases time a
+refresh whose inputs did not change (what a tab switch costs).
+Peak memory per case comes from one extra call (see harness.measure_memory).
+"""
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import json
+import argparse
+import datetime
+import tempfile
+
+from benchmarks import synthetic
+from benchmarks.harness import run_case, run_meta, measure_memory, write_results, default_out_path
+
+import main
+
+
+def write_dataset(n: int, seed: int, chart_backend: str = main.DEFAULT_CHART_BACKEND):
+    """Ledger + accounts/budgets/categories/settings files in the current directory."""
+    ledger = synthetic.generate_ledger(n, seed=seed)
+    out = ledger.copy()
+    out["AppliedToBalance"] = out["AppliedToBalance"].map(lambda x: "True" if x else "False")
+    out.to_csv("sample_transactions.csv", index=False)
+
+    cats = sorted({c for _, c in synthetic.load_seed_vendors()})
+    with open("accounts.json", "w") as f:
+        json.dump(synthetic.accounts_json(), f)
+    with open("categories.json", "w") as f:
+        json.dump([{"name": "Uncategorized", "type": "Expense"}, {"name": "Salary", "type": "Income"}]
+                  + [{"name": c, "type": "Expense"} for c in cats], f)
+    with open("budgets.json", "w") as f:
+        json.dump({c: {"amount": 150.0 + 25 * i, "period": ["monthly", "weekly", "daily"][i % 3]}
+                   for i, c in enumerate(cats)}, f)
+    with open("settings.json", "w") as f:
+        json.dump({"today_override": synthetic.ANCHOR_DATE.strftime("%Y-%m-%d"),
+                   "auto_categorize_enabled": False, "auto_categorize_threshold": 0.70,
+                   "chart_backend": chart_backend}, f)
+    return len(ledger)
+
+
+def _set_combo(combo, text):
+    """Change a filter dropdown without firing its refresh signal (we time the refresh ourselves)."""
+    combo.blockSignals(True)
+    combo.setCurrentText(text)
+    combo.blockSignals(False)
+
+
+def _set_date(picker, d: datetime.date):
+    from PySide6.QtCore import QDate
+    picker.blockSignals(True)
+    picker.setDate(QDate(d.year, d.month, d.day))
+    picker.blockSignals(False)
+
+
+def _forget_renders(window):
+    """Make every chart redraw on its next refresh (the render cache would otherwise skip it)."""
+    for name in ("mtd_category_pie", "net_worth_chart", "forecast_chart", "reports_pie", "reports_bar"):
+        canvas = getattr(window, name, None)   # tabs are built lazily
+        if canvas is not None:
+            canvas.render_key = None
+
+
+def bench_size(app, n: int, args, results: list):
+    print(f"\n== {n:,} rows ==")
+    size = write_dataset(n, args.seed, args.chart_backend)
+
+    window = main.FinanceApp()
+    window.resize(1300, 900)
+    window.show()
+    app.processEvents()
+
+    def case(name, fn, rows):
+        def _run():
+            fn()
+            app.processEvents()
+        res = run_case(name, _run, size=size, rows=rows, repeat=args.repeat)
+        # Qt allocates in C++ (invisible to tracemalloc), so resident memory is what counts here
+        res.update(measure_memory(_run, trace_python=False))
+        results.append(res)
+
+    # --- Transactions table
+    window.tabs.setCurrentWidget(window.trans_tab)
+    app.processEvents()
+    for mode in ["This Month", "This Year"]:
+        _set_combo(window.txn_filter_dropdown, mode)
+        window.update_table()
+        case(f"update_table[{mode}]", window.update_table, window.txn_model.total_rows())
+    if args.full_table:
+        start, end = window.compute_date_window("All")
+        _set_combo(window.txn_filter_dropdown, "Custom Range")
+        _set_date(window.txn_filter_from_picker, start)
+        _set_date(window.txn_filter_to_picker, end)
+        case("update_table[All]", window.update_table, size)
+
+    # --- Dashboard
+    window.tabs.setCurrentWidget(window.dashboard_tab)
+    app.processEvents()
+    for mode in ["This Month", "YTD"]:
+        _set_combo(window.dashboard_range_dropdown, mode)
+        # The aggregates arrive from the worker thread; wait so the case covers applying them too
+        case(f"update_dashboard_tab[{mode}]",
+             lambda: (_forget_renders(window), window.update_dashboard_tab(), window.wait_for_dashboard()), size)
+        case(f"update_dashboard_tab[{mode}, cached charts]",
+             lambda: (window.update_dashboard_tab(), window.wait_for_dashboard()), size)
+        start, end = window.compute_dashboard_range()
+        case(f"_draw_category_donut_for_range[{mode}]",
+             lambda s=start, e=end: (_forget_renders(window), window._draw_category_donut_for_range(s, e)), size)
+
+    # --- Reports
+    window.tabs.setCurrentWidget(window.reports_tab)
+    app.processEvents()
+    for mode in ["This Month", "Last 3 Months", "This Year"]:
+        _set_combo(window.reports_filter_dropdown, mode)
+        case(f"refresh_reports[{mode}]", lambda: (_forget_renders(window), window.refresh_reports()), size)
+        case(f"refresh_reports[{mode}, cached charts]", window.refresh_reports, size)
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+
+
+def main_cli(argv=None):
+    ap = argparse.ArgumentParser(description="FinanceTool headless GUI refresh benchmarks")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--chart-backend", choices=list(main.CHART_BACKENDS), default=main.DEFAULT_CHART_BACKEND,
+                    help="chart renderer for the Dashboard/Reports cases")
+    ap.add_argument("--full-table", action="store_true",
+                    help="also time the Transactions table over the whole ledger (slow at 100k+)")
+    ap.add_argument("--out", default=None, help="results JSON (default benchmarks/results/ui-<commit>.json)")
+    args = ap.parse_args(argv)
+
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    meta = run_meta(suite="ui", sizes=args.sizes, repeat=args.repeat, seed=args.seed,
+                    chart_backend=args.chart_backend,
+                    qt_platform=os.environ.get("QT_QPA_PLATFORM", ""))
+    results = []
+    cwd = os.getcwd()
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory(prefix="financetool-bench-ui-") as work:
+            os.chdir(work)  # FinanceApp reads/writes its data files relative to cwd
+            try:
+                bench_size(app, n, args, results)
+            finally:
+                os.chdir(cwd)
+    write_results(args.out or default_out_path("ui", meta["commit"]), meta, results)
+
+
+if __name__ == "__main__":
+    main_cli()
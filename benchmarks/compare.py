@@ -0,0 +1,64 @@
+# benchmarks/compare.py
+"""
+Compare two benchmark result files (e.g. from two commits).
+
+    python -m benchmarks.compare benchmarks/results/core-abc123.json benchmarks/results/core-def456.json
+    python -m benchmarks.compare old.json new.json --threshold 0.15 --fail-on-regression
+"""
+import sys
+import json
+import argparse
+
+
+def load_results(path: str) -> tuple[dict, dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    by_key = {(r["case"], r["size"]): r for r in data.get("results", [])}
+    return data.get("meta", {}), by_key
+
+
+def compare(old_path: str, new_path: str, threshold: float = 0.10, metric: str = "median_ms") -> list[dict]:
+    """Rows of {case, size, old, new, ratio, status} for cases present in both files."""
+    _, old = load_results(old_path)
+    _, new = load_results(new_path)
+    rows = []
+    for key in sorted(set(old) & set(new), key=lambda k: (k[1], k[0])):
+        o = float(old[key].get(metric) or 0.0)
+        n = float(new[key].get(metric) or 0.0)
+        ratio = (n / o) if o > 0 else None
+        status = "same"
+        if ratio is not None and ratio > 1.0 + threshold:
+            status = "SLOWER"
+        elif ratio is not None and ratio < 1.0 - threshold:
+            status = "faster"
+        rows.append({"case": key[0], "size": key[1], "old": o, "new": n, "ratio": ratio, "status": status})
+    return rows
+
+
+def main_cli(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Compare two benchmark result files")
+    ap.add_argument("old")
+    ap.add_argument("new")
+    ap.add_argument("--threshold", type=float, default=0.10, help="relative change treated as noise (default 0.10)")
+    ap.add_argument("--metric", default="median_ms", choices=["median_ms", "min_ms", "mean_ms"])
+    ap.add_argument("--fail-on-regression", action="store_true", help="exit 1 if any case got slower")
+    args = ap.parse_args(argv)
+
+    old_meta, _ = load_results(args.old)
+    new_meta, _ = load_results(args.new)
+    print(f"old: {old_meta.get('commit', '?')} ({old_meta.get('timestamp', '')})")
+    print(f"new: {new_meta.get('commit', '?')} ({new_meta.get('timestamp', '')})\n")
+
+    rows = compare(args.old, args.new, args.threshold, args.metric)
+    print(f"{'Case':<40}{'Size':>10}{'Old ms':>12}{'New ms':>12}{'Ratio':>8}  Status")
+    for r in rows:
+        ratio = f"{r['ratio']:.2f}" if r["ratio"] is not None else "—"
+        print(f"{r['case']:<40}{r['size']:>10,}{r['old']:>12.2f}{r['new']:>12.2f}{ratio:>8}  {r['status']}")
+
+    slower = [r for r in rows if r["status"] == "SLOWER"]
+    print(f"\n{len(slower)} slower, {sum(r['status'] == 'faster' for r in rows)} faster, {len(rows)} compared")
+    return 1 if (slower and args.fail_on_regression) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
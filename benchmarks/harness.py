@@ -0,0 +1,127 @@
+# benchmarks/harness.py
+"""Timing loop, run metadata and result files shared by the benchmark scripts."""
+import os
+import json
+import time
+import platform
+import datetime
+import statistics
+import subprocess
+
+from benchmarks.synthetic import REPO_ROOT
+
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def run_meta(**extra) -> dict:
+    import numpy as np
+    import pandas as pd
+    meta = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+    meta.update(extra)
+    return meta
+
+
+def run_case(name: str, fn, *, size: int, rows: int, repeat: int = 3, setup=None) -> dict:
+    """
+    Time fn() `repeat` times (setup() runs before each, untimed).
+    rows = items processed per call, used for rows/s.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000.0)
+    best = min(times)
+    result = {
+        "case": name,
+        "size": size,
+        "repeat": repeat,
+        "rows": rows,
+        "min_ms": round(best, 3),
+        "median_ms": round(statistics.median(times), 3),
+        "mean_ms": round(statistics.fmean(times), 3),
+        "rows_per_s": round(rows / (best / 1000.0), 1) if best > 0 else None,
+    }
+    print(f"  {name:<40}{size:>10,}{result['median_ms']:>12.2f} ms{result['rows_per_s'] or 0:>14,.0f} rows/s",
+          flush=True)
+    return result
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak-RSS counter (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except Exception:
+        return False
+
+
+def _peak_rss_bytes() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def measure_memory(fn, trace_python: bool = True) -> dict:
+    """
+    One extra (untimed) call of fn() to measure memory:
+    - peak_rss_delta_kb: peak resident memory above the starting point (Linux)
+    - py_peak_kb: Python heap peak via tracemalloc (trace_python=True)
+    - rss_kb / rss_delta_kb: resident memory after the call
+    Kept separate from run_case because tracing slows calls down.
+    """
+    import tracemalloc
+    from perf import rss_bytes
+    rss_before = rss_bytes()
+    peak_ok = _reset_peak_rss()
+    if trace_python:
+        tracemalloc.start()
+    try:
+        fn()
+        py_peak = tracemalloc.get_traced_memory()[1] if trace_python else None
+    finally:
+        if trace_python:
+            tracemalloc.stop()
+    rss_after = rss_bytes()
+    out = {
+        "rss_kb": round(rss_after / 1024.0, 1),
+        "rss_delta_kb": round((rss_after - rss_before) / 1024.0, 1),
+    }
+    if peak_ok:
+        out["peak_rss_delta_kb"] = round((_peak_rss_bytes() - rss_before) / 1024.0, 1)
+    if py_peak is not None:
+        out["py_peak_kb"] = round(py_peak / 1024.0, 1)
+    return out
+
+
+def default_out_path(suite: str, commit: str) -> str:
+    return os.path.join(RESULTS_DIR, f"{suite}-{commit}.json")
+
+
+def write_results(path: str, meta: dict, results: list[dict]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\nResults written to {path}")
+
@@ -0,0 +1,186 @@
+# benchmarks/synthetic.py
+"""
+Reproducible synthetic ledgers for benchmarks.
+
+Vendors come from seeds/autocategorize_seed_on_ca.json with a Zipf-like
+popularity curve (a few merchants dominate, long tail of rare ones), spread
+over several accounts, with payroll income and paired transfers.
+Same (n_rows, seed) -> same ledger.
+"""
+import os
+import json
+import datetime
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_VENDORS_FILE = os.path.join(REPO_ROOT, "seeds", "autocategorize_seed_on_ca.json")
+
+ANCHOR_DATE = datetime.date(2025, 6, 30)   # "today" for generated data
+LEDGER_COLUMNS = ['Id', 'Date', 'Vendor', 'Amount', 'Type', 'Category', 'Account',
+                  'AppliedToBalance', 'ExternalId', 'TransferGroup', 'CategorySource']
+
+# (name, starting balance, share of card/debit spending)
+ACCOUNTS = [
+    ("Chequing", 3500.0, 0.35),
+    ("Savings", 12000.0, 0.0),
+    ("Visa", 0.0, 0.40),
+    ("Mastercard", 0.0, 0.25),
+]
+CITIES = ["TORONTO ON", "GUELPH ON", "HAMILTON ON", "KITCHENER ON", "WATERLOO ON",
+          "LONDON ON", "MISSISSAUGA ON", "OAKVILLE ON", "BURLINGTON ON"]
+PAYROLL_VENDOR = "PAYROLL DEPOSIT ACME CORP"
+TRANSFER_VENDORS = [("TRANSFER TO SAVINGS", "Savings"), ("VISA PAYMENT THANK YOU", "Visa"),
+                    ("MASTERCARD PAYMENT", "Mastercard")]
+
+
+def load_seed_vendors(path: str = SEED_VENDORS_FILE) -> list[tuple[str, str]]:
+    """[(vendor key, category)] from the Ontario vendor seed."""
+    with open(path, "r", encoding="utf-8") as f:
+        vendors = json.load(f).get("vendors", {}) or {}
+    return sorted((k, v) for k, v in vendors.items() if isinstance(v, str))
+
+
+def accounts_json() -> list[dict]:
+    """accounts.json content matching the generated ledger."""
+    return [{"name": n, "balance": b, "starting_balance": b} for n, b, _ in ACCOUNTS]
+
+
+def _descriptors(rng, vendor_keys, vendor_idx):
+    """Bank-style descriptors: 'TIM HORTONS #0412 GUELPH ON' (some without store/city)."""
+    stores = rng.integers(1, 9999, size=len(vendor_idx))
+    cities = rng.integers(0, len(CITIES), size=len(vendor_idx))
+    style = rng.random(len(vendor_idx))
+    upper = [k.upper() for k in vendor_keys]
+    out = []
+    for vi, st, ci, sy in zip(vendor_idx.tolist(), stores.tolist(), cities.tolist(), style.tolist()):
+        if sy < 0.55:
+            out.append(f"{upper[vi]} #{st:04d} {CITIES[ci]}")
+        elif sy < 0.85:
+            out.append(f"{upper[vi]} {CITIES[ci]}")
+        else:
+            out.append(upper[vi])
+    return out
+
+
+def generate_ledger(n_rows: int, seed: int = 42, years: int = 5,
+                    anchor: datetime.date = ANCHOR_DATE,
+                    income_share: float = 0.05, transfer_share: float = 0.04,
+                    uncategorized_share: float = 0.4) -> pd.DataFrame:
+    """
+    Ledger in the in-memory shape produced by FinanceApp.load_transactions
+    (Amount float, AppliedToBalance bool, other columns str), sorted by date.
+    """
+    rng = np.random.default_rng(seed)
+    vendors = load_seed_vendors()
+    vendor_keys = [k for k, _ in vendors]
+    vendor_cats = [c for _, c in vendors]
+    span_days = max(1, int(365 * years))
+    start = np.datetime64(anchor) - np.timedelta64(span_days - 1, "D")
+
+    n_pairs = int(n_rows * transfer_share / 2)
+    n_income = int(n_rows * income_share)
+    n_exp = max(0, n_rows - n_income - 2 * n_pairs)
+
+    # --- Expenses: Zipf-like vendor popularity, per-vendor typical amount
+    ranks = np.arange(1, len(vendors) + 1)
+    weights = 1.0 / ranks ** 1.1
+    popularity = rng.permutation(len(vendors))
+    probs = np.empty(len(vendors))
+    probs[popularity] = weights / weights.sum()
+    vidx = rng.choice(len(vendors), size=n_exp, p=probs)
+    typical = rng.lognormal(mean=3.2, sigma=0.9, size=len(vendors))
+    exp_amount = -np.round(typical[vidx] * rng.lognormal(0.0, 0.35, size=n_exp), 2)
+    spend_accts = [a for a in ACCOUNTS if a[2] > 0]
+    acct_p = np.array([a[2] for a in spend_accts])
+    exp_acct = np.array([a[0] for a in spend_accts], dtype=object)[rng.choice(len(spend_accts), size=n_exp, p=acct_p / acct_p.sum())]
+    exp_cat = np.array(vendor_cats, dtype=object)[vidx]
+    uncategorized = rng.random(n_exp) < uncategorized_share
+    exp_cat[uncategorized] = "Uncategorized"
+    exp_src = np.where(uncategorized, "", np.where(rng.random(n_exp) < 0.5, "Manual", "Auto"))
+    exp = pd.DataFrame({
+        "Date": start + rng.integers(0, span_days, size=n_exp).astype("timedelta64[D]"),
+        "Vendor": _descriptors(rng, vendor_keys, vidx),
+        "Amount": exp_amount,
+        "Type": "Expense",
+        "Category": exp_cat,
+        "Account": exp_acct,
+        "TransferGroup": "",
+        "CategorySource": exp_src,
+    })
+
+    # --- Income: payroll into Chequing
+    inc = pd.DataFrame({
+        "Date": start + rng.integers(0, span_days, size=n_income).astype("timedelta64[D]"),
+        "Vendor": PAYROLL_VENDOR,
+        "Amount": np.round(rng.normal(2400.0, 150.0, size=n_income), 2),
+        "Type": "Income",
+        "Category": "Salary",
+        "Account": "Chequing",
+        "TransferGroup": "",
+        "CategorySource": "Manual",
+    })
+
+    # --- Transfers: Chequing outflow + matching inflow 0-3 days later; half already linked
+    t_kind = rng.integers(0, len(TRANSFER_VENDORS), size=n_pairs)
+    t_amt = np.round(rng.lognormal(6.0, 0.8, size=n_pairs), 2)
+    t_date = start + rng.integers(0, max(1, span_days - 3), size=n_pairs).astype("timedelta64[D]")
+    t_lag = rng.integers(0, 4, size=n_pairs).astype("timedelta64[D]")
+    linked = rng.random(n_pairs) < 0.5
+    groups = np.where(linked, np.char.add("tg-", np.arange(n_pairs).astype(str)), "")
+    kinds = np.array(TRANSFER_VENDORS, dtype=object)
+    out_leg = pd.DataFrame({
+        "Date": t_date, "Vendor": kinds[t_kind, 0], "Amount": -t_amt,
+        "Type": np.where(linked, "Transfer", "Expense"),
+        "Category": np.where(linked, "Transfer", "Uncategorized"),
+        "Account": "Chequing", "TransferGroup": groups,
+        "CategorySource": np.where(linked, "Manual", ""),
+    })
+    in_leg = pd.DataFrame({
+        "Date": t_date + t_lag, "Vendor": "ONLINE TRANSFER FROM CHEQUING", "Amount": t_amt,
+        "Type": np.where(linked, "Transfer", "Income"),
+        "Category": np.where(linked, "Transfer", "Uncategorized"),
+        "Account": kinds[t_kind, 1], "TransferGroup": groups,
+        "CategorySource": np.where(linked, "Manual", ""),
+    })
+
+    df = pd.concat([exp, inc, out_leg, in_leg], ignore_index=True)
+    df = df.sort_values("Date", kind="stable").reset_index(drop=True)
+    n = len(df)
+    cutoff = np.datetime64(anchor) - np.timedelta64(30, "D")
+    df["AppliedToBalance"] = (df["Date"].values < cutoff)
+    df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%Y-%m-%d")
+    df["Id"] = np.arange(1, n + 1).astype(str)
+    has_ext = rng.random(n) < 0.5
+    df["ExternalId"] = np.where(has_ext, np.char.add("FIT", np.char.zfill(df["Id"].to_numpy(dtype=str), 9)), "")
+    df["Amount"] = df["Amount"].astype(float)
+    for c in ["Vendor", "Type", "Category", "Account", "TransferGroup", "CategorySource"]:
+        df[c] = df[c].astype(str)
+    return df[LEDGER_COLUMNS]
+
+
+def generate_import_file(ledger: pd.DataFrame, n_rows: int, seed: int = 7,
+                         account: str = "Visa", overlap_share: float = 0.2) -> pd.DataFrame:
+    """
+    Raw bank export (all strings, like pd.read_csv(dtype=str)): 'Date' as MM/DD/YYYY,
+    'Description', 'Amount' with $ / thousands separators / parentheses for negatives.
+    overlap_share of rows are re-exports of existing ledger rows on `account` (duplicates).
+    """
+    rng = np.random.default_rng(seed)
+    n_dup = int(n_rows * overlap_share)
+    src = ledger[ledger["Account"] == account]
+    dups = src.sample(n=min(n_dup, len(src)), random_state=seed) if len(src) else src.iloc[0:0]
+    fresh = generate_ledger(n_rows - len(dups), seed=seed + 1, years=1)
+    rows = pd.concat([dups[["Date", "Vendor", "Amount"]], fresh[["Date", "Vendor", "Amount"]]], ignore_index=True)
+    rows = rows.iloc[rng.permutation(len(rows))].reset_index(drop=True)
+
+    def _fmt_amount(a):
+        s = f"${abs(a):,.2f}"
+        return f"({s})" if a < 0 else s
+
+    return pd.DataFrame({
+        "Date": pd.to_datetime(rows["Date"]).dt.strftime("%m/%d/%Y"),
+        "Description": rows["Vendor"].astype(str),
+        "Amount": [_fmt_amount(float(a)) for a in rows["Amount"]],
+    })
@@ -0,0 +1,239 @@
+# budget_engine.py
+"""
+Budget evaluation over a precomputed spend index.
+
+SpendIndex is built once per data version: expense spend (transfers excluded)
+summed per category per day and stored as cumulative cents, so the spend of
+any category over any date range is two binary searches. Months that are not
+loaded contribute their per-day sums from the transactions index (see
+month_store.py) instead of rows.
+
+BudgetEngine turns budgets.json entries into statuses for a given date.
+Period boundaries (day / week / month, or the trailing window for rolling
+budgets) are computed once per evaluation date and shared by all budgets, so
+each status is O(log days) regardless of ledger size.
+
+Budget modes:
+- fixed     — the calendar period containing the date (default)
+- rolling   — trailing 1 / 7 / 30 days ending on the date
+- carryover — calendar period, plus what was left over (or overspent) in every
+              period since the budget's "since" date
+"""
+import calendar
+import datetime
+
+import numpy as np
+import pandas as pd
+
+PERIODS = ("daily", "weekly", "monthly")
+MODES = ("fixed", "rolling", "carryover")
+ROLLING_DAYS = {"daily": 1, "weekly": 7, "monthly": 30}
+
+
+def _as_date(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+def normalize_budget(data) -> dict:
+    """budgets.json entry -> {"amount", "period", "mode"[, "since"]} with safe defaults."""
+    if isinstance(data, dict):
+        try:
+            amount = float(data.get("amount", 0) or 0)
+        except (TypeError, ValueError):
+            amount = 0.0
+        period = (data.get("period") or "monthly").lower()
+        mode = (data.get("mode") or "fixed").lower()
+        since = data.get("since")
+    else:
+        try:
+            amount = float(data)
+        except (TypeError, ValueError):
+            amount = 0.0
+        period, mode, since = "monthly", "fixed", None
+    out = {
+        "amount": amount,
+        "period": period if period in PERIODS else "monthly",
+        "mode": mode if mode in MODES else "fixed",
+    }
+    if since:
+        out["since"] = str(since)[:10]
+    return out
+
+
+def period_window(period: str, day: datetime.date) -> tuple[datetime.date, datetime.date]:
+    """Calendar period containing day (weeks start on Monday)."""
+    if period == "daily":
+        return day, day
+    if period == "weekly":
+        start = day - datetime.timedelta(days=day.weekday())
+        return start, start + datetime.timedelta(days=6)
+    last = calendar.monthrange(day.year, day.month)[1]
+    return day.replace(day=1), day.replace(day=last)
+
+
+def rolling_window(period: str, day: datetime.date) -> tuple[datetime.date, datetime.date]:
+    """Trailing window of the period's length ending on day."""
+    return day - datetime.timedelta(days=ROLLING_DAYS.get(period, 30) - 1), day
+
+
+def periods_between(period: str, first_start: datetime.date, current_start: datetime.date) -> int:
+    """Whole periods from the one starting at first_start up to (not including) current_start."""
+    if current_start <= first_start:
+        return 0
+    if period == "daily":
+        return (current_start - first_start).days
+    if period == "weekly":
+        return (current_start - first_start).days // 7
+    return (current_start.year - first_start.year) * 12 + (current_start.month - first_start.month)
+
+
+def monthly_equivalent(amount: float, period: str, today: datetime.date) -> float:
+    period = (period or "monthly").lower()
+    dim = calendar.monthrange(today.year, today.month)[1]
+    if period == "weekly":
+        return float(amount) * (dim / 7.0)
+    if period == "daily":
+        return float(amount) * dim
+    return float(amount)
+
+
+def _daily_spend(df) -> pd.Series:
+    """Expense cents per (category, day ordinal), transfers excluded (empty Series when there are none)."""
+    if df is None or df.empty or not {"Date", "Amount", "Category"}.issubset(df.columns):
+        return pd.Series(dtype="int64")
+    amount = pd.to_numeric(df["Amount"], errors="coerce")
+    mask = amount < 0
+    # Same exclusions as the dashboard/report spend math: no transfers
+    if "Type" in df.columns:
+        mask &= df["Type"].astype(str).str.lower() != "transfer"
+    mask &= df["Category"].astype(str).str.lower() != "transfer"
+    dates = pd.to_datetime(df.loc[mask, "Date"], errors="coerce")
+    exp = pd.DataFrame({
+        "Category": df.loc[mask, "Category"].astype(str),
+        "Day": dates,
+        "Cents": (-amount[mask] * 100).round(),
+    }).dropna(subset=["Day", "Cents"])
+    if exp.empty:
+        return pd.Series(dtype="int64")
+    exp["Day"] = exp["Day"].dt.date.map(datetime.date.toordinal)
+    return exp.groupby(["Category", "Day"], sort=True)["Cents"].sum().astype("int64")
+
+
+def daily_spend(df) -> dict[str, dict[int, int]]:
+    """{category: {day ordinal: expense cents}} over df: the rows SpendIndex sums, as a plain dict."""
+    out = {}
+    daily = _daily_spend(df)
+    for (cat, day), cents in zip(daily.index.tolist(), daily.tolist()):
+        out.setdefault(cat, {})[day] = cents
+    return out
+
+
+class SpendIndex:
+    """Per-category cumulative daily expense spend (cents)."""
+
+    def __init__(self, by_category: dict[str, tuple[np.ndarray, np.ndarray]]):
+        self._by_category = by_category   # category -> (sorted day ordinals, cumulative cents)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, base: dict | None = None) -> "SpendIndex":
+        """base: daily_spend() of rows kept out of df (months not loaded), added to df's spend."""
+        parts = [_daily_spend(df)]
+        if base:
+            parts.append(pd.Series({(cat, day): cents for cat, days in base.items() for day, cents in days.items()},
+                                   dtype="int64"))
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls({})
+        daily = pd.concat(parts).groupby(level=[0, 1], sort=True).sum() if base else parts[0]
+        by_category = {}
+        for cat, series in daily.groupby(level=0, sort=False):
+            days = series.index.get_level_values(1).to_numpy(dtype="int64")
+            by_category[cat] = (days, np.cumsum(series.to_numpy()))
+        return cls(by_category)
+
+    def categories(self) -> list[str]:
+        return list(self._by_category)
+
+    def spent(self, category: str, start, end) -> float:
+        """Expense spend for category with start <= date <= end."""
+        entry = self._by_category.get(category)
+        if entry is None:
+            return 0.0
+        days, cum = entry
+        hi = int(np.searchsorted(days, _as_date(end).toordinal(), side="right"))
+        if hi == 0:
+            return 0.0
+        lo = int(np.searchsorted(days, _as_date(start).toordinal(), side="left"))
+        return float(cum[hi - 1] - (cum[lo - 1] if lo > 0 else 0)) / 100.0
+
+    def spent_by_category(self, start, end) -> dict[str, float]:
+        """{category: spend} over the range, categories with spend only."""
+        out = {}
+        for cat in self._by_category:
+            value = self.spent(cat, start, end)
+            if value > 0:
+                out[cat] = value
+        return out
+
+
+class BudgetEngine:
+    """Budget statuses for any date from a SpendIndex."""
+
+    def __init__(self, budgets: dict, index: SpendIndex):
+        self.budgets = {cat: normalize_budget(data) for cat, data in (budgets or {}).items()}
+        self.index = index
+
+    def _windows(self, on: datetime.date) -> dict:
+        """(mode, period) -> (start, end) for every combination, computed once per date."""
+        windows = {}
+        for period in PERIODS:
+            calendar_window = period_window(period, on)
+            windows[("fixed", period)] = calendar_window
+            windows[("carryover", period)] = calendar_window
+            windows[("rolling", period)] = rolling_window(period, on)
+        return windows
+
+    def _status(self, cat: str, budget: dict, on: datetime.date, windows: dict) -> dict:
+        period, mode, amount = budget["period"], budget["mode"], budget["amount"]
+        start, end = windows[(mode, period)]
+        carry = 0.0
+        if mode == "carryover" and budget.get("since"):
+            first_start = period_window(period, _as_date(budget["since"]))[0]
+            n = periods_between(period, first_start, start)
+            if n > 0:
+                before = start - datetime.timedelta(days=1)
+                carry = n * amount - self.index.spent(cat, first_start, before)
+        spent = self.index.spent(cat, start, min(end, on))
+        available = amount + carry
+        return {
+            "category": cat,
+            "period": period,
+            "mode": mode,
+            "amount": amount,
+            "start": start,
+            "end": end,
+            "carry": carry,
+            "available": available,
+            "spent": spent,
+            "remaining": available - spent,
+            "pct": (spent / available * 100.0) if available > 0 else 0.0,
+        }
+
+    def status(self, category: str, on) -> dict | None:
+        budget = self.budgets.get(category)
+        if budget is None:
+            return None
+        on = _as_date(on)
+        return self._status(category, budget, on, self._windows(on))
+
+    def statuses(self, on) -> list[dict]:
+        """Status of every positive budget on the given date, sorted by category."""
+        on = _as_date(on)
+        windows = self._windows(on)
+        return [self._status(cat, b, on, windows)
+                for cat, b in sorted(self.budgets.items(), key=lambda kv: kv[0].lower())
+                if b["amount"] > 0]
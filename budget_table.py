@@ -0,0 +1,118 @@
+# budget_table.py
+"""
+Dashboard budget summary as a Qt model + delegate.
+
+BudgetSummaryModel serves the rows straight from the list of dicts the
+Dashboard computes; BudgetProgressDelegate paints the Progress column (a bar
+that may run past 100%, red when over budget, green otherwise) with QPainter.
+A refresh with the same budgets only swaps the list and emits one dataChanged,
+so no widgets, items or stylesheets are created per row.
+"""
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRectF, QSize
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+
+from formatting import fmt_money
+
+HEADERS = ["Category", "Spent (in range)", "Budget (Monthly Eq.)", "Remaining", "Progress"]
+PROGRESS_COLUMN = 4
+OVER_COLOR = "#c62828"
+UNDER_COLOR = "#2e7d32"
+TRACK_COLOR = "#2a2a2a"
+BAR_WIDTH = 140   # preferred Progress column width (what a QProgressBar cell asked for)
+
+
+def progress_pct(row: dict) -> int:
+    """Spent as a whole percentage of the monthly-equivalent budget (0 when there is no budget)."""
+    if row["budget_meq"] > 0:
+        return max(round(row["spent"] / row["budget_meq"] * 100), 0)
+    return 0
+
+
+class BudgetSummaryModel(QAbstractTableModel):
+    """Rows: {"category", "spent", "budget_meq", "remaining"}."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def set_rows(self, rows: list[dict]) -> bool:
+        """
+        Show rows. Returns True when the view should re-size its columns: the categories
+        changed, or a row went over / back under budget (its Remaining text changes form).
+        """
+        if [r["category"] for r in rows] != [r["category"] for r in self._rows]:
+            self.beginResetModel()
+            self._rows = list(rows)
+            self.endResetModel()
+            return True
+        relayout = [r["remaining"] < 0 for r in rows] != [r["remaining"] < 0 for r in self._rows]
+        self._rows = list(rows)
+        if rows:
+            self.dataChanged.emit(self.index(0, 1), self.index(len(rows) - 1, len(HEADERS) - 1))
+        return relayout
+
+    # ---------- QAbstractTableModel
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable if index.isValid() else Qt.NoItemFlags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = self._rows[index.row()], index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return row["category"]
+            if col == 1:
+                return fmt_money(row["spent"])
+            if col == 2:
+                return fmt_money(row["budget_meq"])
+            if col == 3:
+                rem = row["remaining"]
+                return f"Over by {fmt_money(-rem)}" if rem < 0 else fmt_money(rem)
+            return f"{progress_pct(row)}%"
+        if role == Qt.TextAlignmentRole and col in (1, 2, 3):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.ForegroundRole and col == 3:
+            return QColor(Qt.red) if row["remaining"] < 0 else QColor(Qt.darkGreen)
+        if role == Qt.UserRole and col == PROGRESS_COLUMN:
+            return progress_pct(row), row["remaining"] < 0
+        return None
+
+
+class BudgetProgressDelegate(QStyledItemDelegate):
+    """Progress bar for the Progress column; the scale grows past 100% when over budget."""
+
+    def paint(self, painter, option, index):
+        value = index.data(Qt.UserRole)
+        if value is None:
+            super().paint(painter, option, index)
+            return
+        pct, over = value
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        bar = QRectF(option.rect).adjusted(2, 3, -2, -3)
+        painter.fillRect(bar, QColor(TRACK_COLOR))
+        if pct > 0:
+            filled = QRectF(bar)
+            filled.setWidth(bar.width() * pct / max(100, pct))
+            painter.fillRect(filled, QColor(OVER_COLOR if over else UNDER_COLOR))
+        painter.setPen(QColor("white"))
+        painter.drawText(bar, Qt.AlignCenter, f"{pct}%")
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        hint = super().sizeHint(option, index)
+        return QSize(max(hint.width(), BAR_WIDTH), hint.height())
@@ -0,0 +1,292 @@
+# charts.py
+"""
+Incremental chart layer for the dark Matplotlib canvases.
+
+A chart object owns the artists it created on its canvas and keeps them alive
+between refreshes. When new data has the same shape as what is on screen it
+only moves wedge angles / bar heights and swaps label text, then blits: the
+static part of the figure (background, axes decorations) is restored from a
+saved pixel buffer and just the changing artists are re-rendered. No
+ax.clear(), no new artists, no layout pass.
+
+When the shape changes (different number of slices or bars, a new y range,
+new tick labels) the artists are still reused, but the figure gets one normal
+draw. Anything else (first paint, messages, another view taking over the
+axes) rebuilds from scratch.
+
+The pattern follows Matplotlib's blitting guide: dynamic artists are marked
+animated so a full draw skips them, and a draw_event handler re-captures the
+background and paints them back, so resizes and Qt repaints stay correct.
+"""
+DONUT_RING_WIDTH = 0.42
+
+
+class _BlitChart:
+    """Background capture / blit bookkeeping shared by the chart types."""
+
+    def __init__(self, canvas, dark_fig: str, dark_ax: str, text_color: str):
+        self.canvas = canvas
+        self.ax = canvas.ax
+        self.dark_fig = dark_fig
+        self.dark_ax = dark_ax
+        self.text_color = text_color
+        self._animated = []
+        self._background = None
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    # ---------- ownership
+    def _alive(self) -> bool:
+        """Our artists are still on the axes (nobody cleared it for another view)."""
+        return bool(self._animated) and self._animated[0].axes is self.ax and self._animated[0] in self._owned()
+
+    def _owned(self):
+        return self.ax.patches
+
+    def _adopt(self, artists):
+        for a in artists:
+            a.set_animated(True)
+        self._animated = list(artists)
+        self._background = None
+
+    def release(self):
+        """Forget our artists (the caller is about to draw something else on the axes)."""
+        for a in self._animated:
+            a.set_animated(False)
+        self._animated = []
+        self._background = None
+
+    # ---------- drawing
+    def _on_draw(self, _event):
+        if not self._animated:
+            return
+        if not self._alive():
+            self.release()
+            return
+        self._capture()
+        self._draw_animated()
+
+    def _capture(self):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+
+    def _draw_animated(self, fast: bool = False):
+        figure = self.canvas.figure
+        for a in self._animated:
+            figure.draw_artist(a)
+
+    def _blit(self):
+        if self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated(fast=True)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def clear(self):
+        """Drop our artists and reset the axes to the dark theme (for views drawn by hand)."""
+        self.release()
+        self.ax.clear()
+        self.canvas.set_dark()
+
+    def message(self, text: str):
+        """Centered note instead of a chart ("No data")."""
+        self.clear()
+        self.ax.text(0.5, 0.5, text, ha='center', va='center', color=self.text_color)
+        self.ax.axis('off')
+        self.canvas.draw()
+
+
+class DonutChart(_BlitChart):
+    """Donut with a legend on the right and a total in the middle."""
+
+    def __init__(self, canvas, dark_fig: str, dark_ax: str, text_color: str):
+        super().__init__(canvas, dark_fig, dark_ax, text_color)
+        self._wedges = []
+        self._legend = None
+        self._center = None
+        self._axes_background = None
+
+    def show(self, labels: list[str], values: list[float], center_text: str):
+        if self._alive() and len(values) == len(self._wedges):
+            self._set_angles(values)
+            self._center.set_text(center_text)
+            texts = self._legend.get_texts()
+            if [t.get_text() for t in texts] == list(labels):
+                self._blit_axes()   # legend pixels (outside the axes) are still right
+                return
+            for text, label in zip(texts, labels):
+                text.set_text(label)
+            self._blit()
+            return
+        self.clear()
+        self._wedges, _ = self.ax.pie(
+            values,
+            labels=None,  # legend instead
+            startangle=90,
+            wedgeprops=dict(width=DONUT_RING_WIDTH, edgecolor=self.dark_fig)
+        )
+        self._center = self.ax.text(0, 0, center_text, ha='center', va='center', color=self.text_color,
+                                    fontsize=12, fontweight='bold')
+        self.ax.axis('equal')
+        self._legend = self.ax.legend(self._wedges, labels, loc='center left', bbox_to_anchor=(1.0, 0.5),
+                                      facecolor=self.dark_ax, labelcolor=self.text_color, framealpha=0.0)
+        self._adopt(list(self._wedges) + [self._center, self._legend])
+        self.canvas.draw()
+
+    def _capture(self):
+        super()._capture()
+        self._axes_background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+    def _draw_animated(self, fast: bool = False):
+        if not fast:
+            super()._draw_animated()
+            return
+        # Packing the legend is most of its cost, so a blit redraws its swatches and texts
+        # where the last full draw placed them (texts are left-aligned; the next full draw repacks)
+        figure = self.canvas.figure
+        for a in self._wedges:
+            figure.draw_artist(a)
+        figure.draw_artist(self._center)
+        for a in list(self._legend.legend_handles) + self._legend.get_texts():
+            figure.draw_artist(a)
+
+    def _blit_axes(self):
+        """Redraw only the ring and the center text inside the axes box."""
+        if self._background is None or self._axes_background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._axes_background)
+        figure = self.canvas.figure
+        for a in self._wedges:
+            figure.draw_artist(a)
+        figure.draw_artist(self._center)
+        self.canvas.blit(self.ax.bbox)
+
+    def _set_angles(self, values):
+        # Same geometry as Axes.pie(startangle=90, counterclock=True)
+        total = float(sum(values)) or 1.0
+        start = 90.0
+        for wedge, value in zip(self._wedges, values):
+            end = start + 360.0 * float(value) / total
+            wedge.set_theta1(start)
+            wedge.set_theta2(end)
+            start = end
+
+
+class PairedBarChart(_BlitChart):
+    """Side-by-side bar series over category labels (e.g. income vs expenses per month)."""
+
+    def __init__(self, canvas, dark_fig: str, dark_ax: str, text_color: str, grid_color: str,
+                 bar_width: float = 0.38):
+        super().__init__(canvas, dark_fig, dark_ax, text_color)
+        self.grid_color = grid_color
+        self.bar_width = bar_width
+        self._series = []      # [(label, [Rectangle])]
+        self._labels = []
+        self._style = None     # (ylabel, rotate, colors, formatted) the artists were built with
+        self._legend = None
+
+    def show(self, labels: list[str], series: list[tuple], ylabel: str | None = None,
+             yformatter=None, rotate: bool = True):
+        """
+        labels: x tick labels; series: [(legend label, values, color or None)].
+        Same labels/series/y range: heights move and the bars are blitted.
+        Same shape only: artists are reused with one figure draw. Otherwise rebuild.
+        """
+        top = self._top(series)
+        style = (ylabel, rotate, tuple(s[2] for s in series), yformatter is not None)
+        shape_same = (self._alive() and style == self._style and len(labels) == len(self._labels)
+                      and [len(s[1]) for s in series] == [len(rects) for _, rects in self._series])
+        if shape_same:
+            for (_, rects), (_, values, _) in zip(self._series, series):
+                for rect, value in zip(rects, values):
+                    rect.set_height(float(value))
+            current_top = self.ax.get_ylim()[1]
+            same_text = (labels == self._labels
+                         and [s[0] for s in series] == [name for name, _ in self._series])
+            if same_text and current_top * 0.5 < top <= current_top:
+                self._blit()
+                return
+            if labels != self._labels:
+                self.ax.set_xticks(list(range(len(labels))))
+                self.ax.set_xticklabels(labels, rotation=45 if rotate else 0, ha='right' if rotate else 'center',
+                                        color=self.text_color)
+                self._labels = list(labels)
+            for text, (name, _, _) in zip(self._legend.get_texts(), series):
+                text.set_text(name)
+            self._series = [(name, rects) for (_, rects), (name, _, _) in zip(self._series, series)]
+            self.ax.set_ylim(0, top)
+            self.canvas.draw()
+            return
+
+        self.clear()
+        n = len(series)
+        x = list(range(len(labels)))
+        containers = []
+        for k, (name, values, color) in enumerate(series):
+            offset = (k - (n - 1) / 2) * self.bar_width
+            kwargs = {"label": name}
+            if color:
+                kwargs["color"] = color
+            containers.append((name, list(self.ax.bar([i + offset for i in x], list(values), self.bar_width,
+                                                       **kwargs))))
+        self._series = containers
+        self._labels = list(labels)
+        self._style = style
+        self.ax.set_xticks(x)
+        self.ax.set_xticklabels(labels, rotation=45 if rotate else 0, ha='right' if rotate else 'center',
+                                color=self.text_color)
+        self._legend = self.ax.legend(facecolor=self.dark_ax, labelcolor=self.text_color, framealpha=0.0)
+        if ylabel:
+            self.ax.set_ylabel(ylabel, color=self.text_color)
+        if yformatter is not None:
+            self.ax.yaxis.set_major_formatter(yformatter)
+        self.ax.grid(axis='y', color=self.grid_color, alpha=0.5)
+        self.ax.set_ylim(0, top)
+        self._adopt([rect for _, rects in containers for rect in rects])
+        self.canvas.draw()
+
+    @staticmethod
+    def _top(series) -> float:
+        peak = max((float(v) for _, values, _ in series for v in values), default=0.0)
+        return peak * 1.08 if peak > 0 else 1.0
+
+
+class LineChart(_BlitChart):
+    """
+    Line series over dates or positions (net worth, forecast, trailing totals).
+    The x range changes with almost every refresh, so this one always redraws.
+    """
+
+    def __init__(self, canvas, dark_fig: str, dark_ax: str, text_color: str, grid_color: str):
+        super().__init__(canvas, dark_fig, dark_ax, text_color)
+        self.grid_color = grid_color
+
+    def show(self, x: list, series: list[tuple], yformatter=None, xticklabels: list[str] | None = None,
+             fill: bool = False, zero_line: bool = False, legend: dict | None = None):
+        """
+        x: dates (tick labels are formatted as dates) or positions with xticklabels.
+        series: [(legend label, values, style)] where style holds Matplotlib line kwargs
+        (color, linewidth, linestyle, alpha). fill shades under the first series;
+        legend is None for no legend, else extra Axes.legend kwargs (e.g. loc, fontsize).
+        """
+        self.clear()
+        ax = self.ax
+        for name, values, style in series:
+            ax.plot(x, values, label=name, **style)
+        if fill and series:
+            _, values, style = series[0]
+            ax.fill_between(x, values, min(values), color=style.get("color"), alpha=0.15)
+        if zero_line:
+            ax.axhline(0, color=self.grid_color, linewidth=1.0)
+        ax.grid(axis='y', color=self.grid_color, alpha=0.5)
+        if yformatter is not None:
+            ax.yaxis.set_major_formatter(yformatter)
+        if xticklabels is not None:
+            step = max(1, len(x) // 12)
+            ax.set_xticks(list(x)[::step])
+            ax.set_xticklabels(list(xticklabels)[::step], rotation=45, ha='right', color=self.text_color)
+        else:
+            self.canvas.figure.autofmt_xdate()
+        if legend is not None:
+            ax.legend(facecolor=self.dark_ax, labelcolor=self.text_color, framealpha=0.0, **legend)
+        self.canvas.draw()
@@ -0,0 +1,136 @@
+# dashboard_data.py
+"""
+Dashboard aggregates, computed as one snapshot off the GUI thread.
+
+FinanceApp builds an input dict (the TransactionSnapshot of the current data
+version, copies of budgets and balances, the range and "today") and hands it
+to DashboardWorker, which runs compute_snapshot() on a background
+thread. The finished snapshot is delivered back to the GUI thread through a
+Qt signal carrying the request's generation number; a snapshot whose
+generation is no longer the latest (the range changed or data was saved while
+it was computing) is dropped instead of applied.
+
+Shared intermediates are computed once per snapshot: the in-range rows
+without transfers feed both the recent list and the spend by account, and one
+per-category lookup feeds both the category table and the donut. The parsed
+ledger view lives on the TransactionSnapshot and the spend index is returned
+with the result, so later requests on the same data version reuse both.
+"""
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import pandas as pd
+from PySide6.QtCore import QObject, Signal
+
+import budget_engine
+import perf
+
+RECENT_ROWS = 10
+DONUT_SLICES = 10
+
+
+def donut_slices(spent_by_cat: dict[str, float], slices: int = DONUT_SLICES) -> tuple[list[str], list[float], float]:
+    """(labels, sizes, total): the largest categories, the rest folded into "Other"."""
+    pairs = sorted(((k, v) for k, v in spent_by_cat.items() if v > 0), key=lambda x: -x[1])
+    labels = [k for k, _ in pairs[:slices]]
+    sizes = [v for _, v in pairs[:slices]]
+    if len(pairs) > slices:
+        labels.append("Other")
+        sizes.append(sum(v for _, v in pairs[slices:]))
+    return labels, sizes, sum(sizes)
+
+
+@perf.timed("dashboard_snapshot", rows=lambda inputs, _: len(inputs["transactions"]))
+def compute_snapshot(inputs: dict) -> dict:
+    """
+    inputs: transactions (TransactionSnapshot), spend_index (or None), spend_base
+    (per-day spend of the months not loaded, see month_store), data_version, start,
+    end, today, budgets, balances.
+    """
+    start, end, today = inputs["start"], inputs["end"], inputs["today"]
+    transactions = inputs["transactions"]
+    index = inputs.get("spend_index")
+    if index is None:
+        index = budget_engine.SpendIndex.from_frame(transactions.frame(), inputs.get("spend_base"))
+
+    # Budgets: spent in range against the monthly equivalent
+    budget_rows = []
+    for cat in sorted(inputs["budgets"], key=lambda x: x.lower()):
+        bdata = inputs["budgets"][cat]
+        meq = budget_engine.monthly_equivalent(bdata.get("amount", 0.0), bdata.get("period", "monthly"), today)
+        spent = index.spent(cat, start, end)
+        budget_rows.append({"category": cat, "spent": spent, "budget_meq": meq, "remaining": meq - spent})
+
+    # In-range rows without transfers: recent list + spend by account
+    in_range = transactions.parsed()[transactions.in_range(start, end) & ~transactions.is_transfer()]
+    recent = in_range.sort_values("Date", ascending=False, kind="stable").head(RECENT_ROWS)
+    recent_rows = [(d.strftime("%Y-%m-%d") if pd.notna(d) else "", str(v), a, str(c))
+                   for d, v, a, c in zip(recent["Date"], recent["Vendor"], recent["Amount"], recent["Category"])]
+    spend_by_account = {}
+    if not in_range.empty:
+        expenses = in_range["Amount"].where(in_range["Amount"] < 0, 0.0)
+        spend_by_account = expenses.groupby(in_range["Account"].fillna("Unassigned")).sum().abs().to_dict()
+
+    # Spend by category: one lookup for the table and the donut
+    spent_by_cat = index.spent_by_category(start, end)
+
+    return {
+        "data_version": inputs["data_version"],
+        "start": start,
+        "end": end,
+        "today": today,
+        "total_balance": sum(inputs["balances"]),
+        "budget_rows": budget_rows,
+        "recent": recent_rows,
+        "spend_by_account": spend_by_account,
+        "spend_by_category": sorted(spent_by_cat.items(), key=lambda x: (-x[1], x[0])),
+        "donut": donut_slices(spent_by_cat),
+        "spend_index": index,
+    }
+
+
+class DashboardWorker(QObject):
+    """
+    Runs compute_snapshot on one background thread. finished(snapshot) / failed(generation, message)
+    are emitted from that thread and delivered queued to receivers on the GUI thread.
+    """
+    finished = Signal(object)
+    failed = Signal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dashboard")
+        self._pending = None
+        self.generation = 0
+
+    def submit(self, inputs: dict) -> int:
+        """Queue a snapshot; a request still waiting to start is cancelled (it is already stale)."""
+        self.generation += 1
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending = self._pool.submit(self._run, self.generation, inputs)
+        return self.generation
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    def wait(self):
+        """Block until the latest request has finished (its signal is then waiting in the event queue)."""
+        pending = self._pending
+        if pending is None:
+            return
+        try:
+            pending.result()
+        except CancelledError:
+            pass
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, generation: int, inputs: dict):
+        try:
+            snapshot = compute_snapshot(inputs)
+        except Exception as e:
+            self.failed.emit(generation, f"{type(e).__name__}: {e}")
+            return
+        snapshot["generation"] = generation
+        self.finished.emit(snapshot)
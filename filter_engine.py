@@ -0,0 +1,121 @@
+# filter_engine.py
+"""
+Multi-column filters for the Transactions tab.
+
+A filter spec is a plain dict (see empty_spec): value sets for Account,
+Category, Type and CategorySource, an Amount range and a transfer mode. It is
+compiled into predicates, hashable keys such as ("in", "Account",
+frozenset({"Visa"})) or ("amount", -100.0, None), and each predicate becomes a
+boolean row mask over the current TransactionSnapshot:
+
+- value sets test the snapshot's factorized codes (one lookup table over the
+  distinct values, then one numpy take), so no strings are compared per row;
+- the Amount range and the date window compare the snapshot's parsed columns;
+- transfer status reuses the snapshot's transfer flag.
+
+Masks are cached per predicate for the snapshot they were built from, so
+changing one filter only builds that predicate's mask and the result is an
+AND of cached arrays. A new data version (a new snapshot) drops the cache.
+"""
+import numpy as np
+import pandas as pd
+
+# spec key -> ledger column, for the value-set filters
+VALUE_FILTERS = {"accounts": "Account", "categories": "Category", "types": "Type", "sources": "CategorySource"}
+TRANSFER_MODES = ["Include transfers", "Exclude transfers", "Only transfers"]
+MAX_CACHED_MASKS = 32
+
+
+def empty_spec() -> dict:
+    """No filtering: None for a value set means "any value"."""
+    spec = {key: None for key in VALUE_FILTERS}
+    spec.update({"amount_min": None, "amount_max": None, "transfers": TRANSFER_MODES[0]})
+    return spec
+
+
+def active_count(spec: dict) -> int:
+    """How many filters the spec sets (for the "Filters (n)" button)."""
+    return len(predicates(spec))
+
+
+def predicates(spec: dict) -> list[tuple]:
+    """The spec as hashable predicate keys; an empty list means every row passes."""
+    preds = []
+    for key, column in VALUE_FILTERS.items():
+        values = spec.get(key)
+        if values is not None:
+            preds.append(("in", column, frozenset(str(v) for v in values)))
+    lo, hi = spec.get("amount_min"), spec.get("amount_max")
+    if lo is not None or hi is not None:
+        preds.append(("amount", lo, hi))
+    mode = spec.get("transfers", TRANSFER_MODES[0])
+    if mode != TRANSFER_MODES[0]:
+        preds.append(("transfer", mode == TRANSFER_MODES[2]))
+    return preds
+
+
+class FilterEngine:
+    """Per-predicate mask cache for one snapshot at a time."""
+
+    def __init__(self):
+        self._snapshot = None
+        self._masks = {}
+
+    def mask(self, snapshot, spec: dict, start=None, end=None) -> np.ndarray:
+        """Rows of snapshot passing every filter in spec, and dated start..end when both are given."""
+        if snapshot is not self._snapshot:
+            self._snapshot = snapshot
+            self._masks = {}
+        preds = predicates(spec)
+        if start is not None and end is not None:
+            preds.insert(0, ("date", pd.Timestamp(start), pd.Timestamp(end)))
+        out = np.ones(len(snapshot), dtype=bool)
+        for pred in preds:
+            out &= self._predicate_mask(snapshot, pred)
+        return out
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def nbytes(self) -> int:
+        """Bytes of the cached masks."""
+        return sum(int(m.nbytes) for m in self._masks.values())
+
+    def _predicate_mask(self, snapshot, pred: tuple) -> np.ndarray:
+        hit = self._masks.get(pred)
+        if hit is None:
+            hit = self._build(snapshot, pred)
+            if len(self._masks) >= MAX_CACHED_MASKS:
+                self._masks.clear()
+            self._masks[pred] = hit
+        return hit
+
+    @staticmethod
+    def _build(snapshot, pred: tuple) -> np.ndarray:
+        kind = pred[0]
+        if kind == "in":
+            _, column, values = pred
+            factorized = snapshot.factorized(column)
+            if not factorized:
+                # Missing column reads as blank everywhere
+                return np.full(len(snapshot), "" in values, dtype=bool)
+            codes, uniques = factorized
+            # Trailing entry for code -1 (missing): matches when blank is selected
+            table = np.append(uniques.isin(values), "" in values)
+            return table[codes]
+        if kind == "amount":
+            _, lo, hi = pred
+            amounts = snapshot.parsed()["Amount"].to_numpy(dtype=float, na_value=np.nan)
+            out = ~np.isnan(amounts)
+            if lo is not None:
+                out &= amounts >= lo
+            if hi is not None:
+                out &= amounts <= hi
+            return out
+        if kind == "transfer":
+            transfer = snapshot.is_transfer().to_numpy(dtype=bool)
+            return transfer if pred[1] else ~transfer
+        if kind == "date":
+            _, start, end = pred
+            return snapshot.in_range(start, end).to_numpy(dtype=bool)
+        raise ValueError(f"Unknown filter predicate: {pred!r}")
@@ -0,0 +1,222 @@
+# forecast.py
+"""
+Cash-flow forecasting.
+
+Projects each account's balance day by day for the next N months from three
+inputs:
+- the current stored balances
+- scheduled money: pending (not yet applied) transactions and the future
+  occurrences of active recurring series (recurring.detect_recurring)
+- budgets: each month's budget (budget_engine.monthly_equivalent) minus the
+  recurring charges already expected in that category, spread evenly over the
+  month's remaining days; the current month also subtracts what was spent so far
+  (pending rows count once, as scheduled charges)
+
+Every flow is scattered into one (days x accounts) array and the balances are
+a single cumulative sum, so a re-forecast after an edit costs milliseconds.
+"""
+import calendar
+import datetime
+
+import numpy as np
+import pandas as pd
+
+import budget_engine
+import recurring
+
+DEFAULT_MONTHS = 3
+HORIZONS = (1, 3, 6, 12)
+CATEGORY_LOOKBACK_DAYS = 180
+
+EVENT_COLUMNS = ["Date", "Account", "Category", "Amount", "Source", "Label"]
+
+
+def _as_date(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+def horizon_end(today: datetime.date, months: int) -> datetime.date:
+    """Same day N months later (clamped to month end)."""
+    return (pd.Timestamp(today) + pd.DateOffset(months=int(months))).date()
+
+
+def category_accounts(df: pd.DataFrame, today: datetime.date,
+                      lookback_days: int = CATEGORY_LOOKBACK_DAYS) -> dict[str, str]:
+    """{category: account that paid most of its expenses over the lookback window}."""
+    if df is None or df.empty or not {"Date", "Amount", "Category", "Account"}.issubset(df.columns):
+        return {}
+    amount = pd.to_numeric(df["Amount"], errors="coerce")
+    dates = pd.to_datetime(df["Date"], errors="coerce")
+    since = pd.Timestamp(today - datetime.timedelta(days=lookback_days))
+    mask = (amount < 0) & (dates >= since) & (dates <= pd.Timestamp(today))
+    if not mask.any():
+        return {}
+    spend = pd.DataFrame({
+        "Category": df.loc[mask, "Category"].astype(str),
+        "Account": df.loc[mask, "Account"].astype(str),
+        "Spent": -amount[mask],
+    })
+    totals = spend.groupby(["Category", "Account"], sort=False)["Spent"].sum()
+    return {cat: acct for cat, acct in totals.groupby(level=0).idxmax().map(lambda k: k[1]).items()}
+
+
+def recurring_events(rec: pd.DataFrame, start: datetime.date, end: datetime.date) -> pd.DataFrame:
+    """
+    Future occurrences (start <= date <= end) of the active series in rec
+    (recurring.RESULT_COLUMNS). An overdue charge is expected on start.
+    """
+    if rec is None or rec.empty:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    rec = rec[rec["Active"]]
+    if rec.empty:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    lo, hi = pd.Timestamp(start), pd.Timestamp(end)
+    nxt = pd.to_datetime(rec["NextDate"], errors="coerce")
+    frames = []
+    for name, nominal, _tol, _per_year in recurring.CADENCES:
+        sel = (rec["Cadence"] == name).to_numpy() & nxt.notna().to_numpy()
+        if not sel.any():
+            continue
+        first = pd.DatetimeIndex(nxt[sel])
+        months = recurring._CALENDAR_MONTHS.get(name)
+        steps = int((hi - min(first.min(), lo)).days / nominal) + 2
+        for k in range(steps):
+            if months:
+                dates = first + pd.DateOffset(months=k * months)
+            else:
+                dates = first + pd.Timedelta(days=round(nominal) * k)
+            if k == 0:
+                dates = dates.where(dates >= lo, lo)   # overdue: expected any day now
+            keep = (dates >= lo) & (dates <= hi)
+            if not keep.any():
+                continue
+            part = rec[sel][keep]
+            frames.append(pd.DataFrame({
+                "Date": dates[keep],
+                "Account": part["Account"].to_numpy(),
+                "Category": part["Category"].to_numpy(),
+                "Amount": part["Amount"].to_numpy(dtype="float64"),
+                "Source": "recurring",
+                "Label": part["Vendor"].to_numpy(),
+            }))
+    if not frames:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    return pd.concat(frames, ignore_index=True).sort_values("Date", kind="stable").reset_index(drop=True)
+
+
+def pending_events(pending: pd.DataFrame, start: datetime.date, end: datetime.date) -> pd.DataFrame:
+    """Not-yet-applied transactions: on their own date, or on start when already due."""
+    if pending is None or pending.empty:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    dates = pd.to_datetime(pending["Date"], errors="coerce")
+    amount = pd.to_numeric(pending["Amount"], errors="coerce")
+    ok = dates.notna() & amount.notna() & (dates <= pd.Timestamp(end))
+    if not ok.any():
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    return pd.DataFrame({
+        "Date": dates[ok].clip(lower=pd.Timestamp(start)).to_numpy(),
+        "Account": pending.loc[ok, "Account"].astype(str).to_numpy(),
+        "Category": pending.loc[ok, "Category"].astype(str).to_numpy() if "Category" in pending.columns else "",
+        "Amount": amount[ok].to_numpy(dtype="float64"),
+        "Source": "pending",
+        "Label": pending.loc[ok, "Vendor"].astype(str).to_numpy() if "Vendor" in pending.columns else "",
+    })
+
+
+def budget_daily_spend(budgets: dict, days: pd.DatetimeIndex, today: datetime.date,
+                       scheduled: pd.DataFrame, spent_to_date: dict | None = None) -> dict[str, np.ndarray]:
+    """
+    {category: expected discretionary spend per forecast day (positive numbers)}.
+    Each month's budget, less the category's scheduled charges that month (and,
+    for the current month, less what was already spent), is spread over that
+    month's days from max(month start, first forecast day) to month end.
+    """
+    if not budgets or len(days) == 0:
+        return {}
+    spent_to_date = spent_to_date or {}
+    month_code = days.year.to_numpy() * 12 + days.month.to_numpy() - 1
+    months, first_pos = np.unique(month_code, return_index=True)
+    month_first = [days[i].date() for i in first_pos]
+    # days from the first forecast day of each month to that month's end (the spreading denominator)
+    span = np.array([calendar.monthrange(d.year, d.month)[1] - d.day + 1 for d in month_first], dtype="float64")
+    current = today.year * 12 + today.month - 1
+
+    charges = {}
+    if scheduled is not None and not scheduled.empty:
+        sched = scheduled[scheduled["Amount"] < 0]
+        if not sched.empty:
+            sched_dates = pd.DatetimeIndex(sched["Date"])
+            code = sched_dates.year.to_numpy() * 12 + sched_dates.month.to_numpy() - 1
+            charges = (pd.Series(-sched["Amount"].to_numpy(), index=[sched["Category"].to_numpy(), code])
+                       .groupby(level=[0, 1]).sum().to_dict())
+
+    out = {}
+    for cat, raw in budgets.items():
+        budget = budget_engine.normalize_budget(raw)
+        if budget["amount"] <= 0:
+            continue
+        planned = np.array([budget_engine.monthly_equivalent(budget["amount"], budget["period"], d)
+                            for d in month_first])
+        planned -= np.array([charges.get((cat, m), 0.0) for m in months])
+        planned[months == current] -= float(spent_to_date.get(cat, 0.0))
+        rate = np.clip(planned, 0.0, None) / span
+        out[cat] = rate[np.searchsorted(months, month_code)]
+    return out
+
+
+def project(balances: dict[str, float], days: pd.DatetimeIndex, events: pd.DataFrame,
+            daily_spend: dict[str, np.ndarray] | None = None,
+            category_accounts: dict[str, str] | None = None) -> pd.DataFrame:
+    """
+    End-of-day balance per account (columns) for each day (index).
+    Events on unknown accounts, and budgets without a paying account, go to the first account.
+    """
+    accounts = list(balances)
+    if not accounts or len(days) == 0:
+        return pd.DataFrame(index=days, columns=accounts, dtype="float64")
+    pos = {a: i for i, a in enumerate(accounts)}
+    flows = np.zeros((len(days), len(accounts)))
+
+    if events is not None and not events.empty:
+        day_idx = days.get_indexer(pd.DatetimeIndex(events["Date"]).normalize())
+        acct_idx = np.array([pos.get(a, 0) for a in events["Account"].astype(str)], dtype="int64")
+        ok = day_idx >= 0
+        np.add.at(flows, (day_idx[ok], acct_idx[ok]), events["Amount"].to_numpy(dtype="float64")[ok])
+
+    category_accounts = category_accounts or {}
+    for cat, per_day in (daily_spend or {}).items():
+        flows[:, pos.get(category_accounts.get(cat), 0)] -= per_day
+
+    start = np.array([float(balances[a]) for a in accounts])
+    return pd.DataFrame(np.round(start + np.cumsum(flows, axis=0), 2), index=days, columns=accounts)
+
+
+def forecast(balances: dict[str, float], today, months: int = DEFAULT_MONTHS,
+             recurring_df: pd.DataFrame | None = None, budgets: dict | None = None,
+             pending: pd.DataFrame | None = None, category_accounts: dict[str, str] | None = None,
+             spent_to_date: dict | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    (balances, events): projected end-of-day balance per account from tomorrow
+    through today + months, and the dated scheduled flows behind it (EVENT_COLUMNS).
+    spent_to_date is each category's spend this month through today over every recorded
+    row (a SpendIndex over the ledger); pending rows are taken back out of it, since they
+    are already charged as events.
+    """
+    today = _as_date(today)
+    start = today + datetime.timedelta(days=1)
+    end = horizon_end(today, months)
+    days = pd.date_range(start, end, freq="D")
+    if spent_to_date and pending is not None and not pending.empty:
+        month_start = today.replace(day=1)
+        in_pending = budget_engine.SpendIndex.from_frame(pending)
+        spent_to_date = {cat: value - in_pending.spent(cat, month_start, today)
+                         for cat, value in spent_to_date.items()}
+    parts = [e for e in (pending_events(pending, start, end), recurring_events(recurring_df, start, end))
+             if not e.empty]
+    events = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=EVENT_COLUMNS)
+    daily = budget_daily_spend(budgets, days, today, events, spent_to_date)
+    return project(balances, days, events, daily, category_accounts), events
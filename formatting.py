@@ -0,0 +1,14 @@
+# formatting.py
+"""
+Display formatting shared by the main window and the Qt table models.
+"""
+
+
+def fmt_money(value) -> str:
+    """$1,234.56 for a number; "" for None/blank; anything unparseable as it is."""
+    if value is None or value == "":
+        return ""
+    try:
+        return f"${float(value):,.2f}"
+    except Exception:
+        return str(value)
@@ -0,0 +1,336 @@
+# history.py
+"""
+Undo/redo log for the app's edits.
+
+A step records what one user action changed, as a diff rather than a copy:
+
+- transactions: the rows the action removed and added (with their positions,
+  so undo puts them back in place) and, for rows present before and after,
+  the old and new values of only the columns that changed, keyed by Id;
+- JSON documents (accounts, budgets, categories, autocategorize memory): the
+  keys that changed for dicts, the old and new value for anything else.
+
+Undo applies a step backwards and redo forwards, touching only the rows and
+keys in the step. A step holds what the action changed: an edit keeps two
+one-row frames, an import keeps the imported rows, "Clear All" keeps the rows
+it cleared.
+
+Taking the "before" state is cheap: with Copy-on-Write the frame is a shallow
+copy, and the documents are small. Diffing a frame only compares the columns
+whose data the action actually replaced (unchanged columns still share
+memory with the before copy).
+
+FinanceApp actions are wrapped with @undoable(label); nested wrapped calls
+make a single step (the outermost one). Rows the app reads in from storage
+while a step is open (a month that was not loaded, see month_store.py) are
+added to the step's "before" frame with note_loaded(), so they are not
+recorded as rows the action inserted.
+"""
+import copy
+import functools
+
+import numpy as np
+import pandas as pd
+
+MAX_STEPS = 100   # oldest steps are dropped beyond this
+
+
+class _Missing:
+    """Marks a key absent on one side of a document diff (survives deepcopy as itself)."""
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+MISSING = _Missing()
+
+
+# ---------- frames
+def _keys(frame: pd.DataFrame, key: str) -> np.ndarray:
+    return frame[key].astype(str).to_numpy()
+
+
+def _complement(n: int, positions: np.ndarray) -> np.ndarray:
+    """0..n-1 without positions, ascending."""
+    keep = np.ones(n, dtype=bool)
+    keep[positions] = False
+    return np.flatnonzero(keep)
+
+
+def _same(before: np.ndarray, after: np.ndarray) -> np.ndarray:
+    """Elementwise equality of two column arrays, missing == missing."""
+    if before.dtype != object and before.dtype == after.dtype and before.dtype.kind != "f":
+        return before == after
+    eq = np.asarray(before == after, dtype=bool) if len(before) else np.ones(0, dtype=bool)
+    ne = np.flatnonzero(~eq)
+    if ne.size:
+        eq[ne[pd.isna(before[ne]) & pd.isna(after[ne])]] = True
+    return eq
+
+
+def _same_buffer(a: np.ndarray, b: np.ndarray) -> bool:
+    """a and b are the same elements of the same memory (Copy-on-Write left the column untouched)."""
+    return (a.shape == b.shape and a.strides == b.strides and a.dtype == b.dtype
+            and a.__array_interface__["data"][0] == b.__array_interface__["data"][0])
+
+
+def _alignment(before: pd.DataFrame, after: pd.DataFrame, key: str):
+    """
+    How rows of before map onto rows of after: ([(before rows, after rows)], removed, added) where
+    the row selectors are slices for the usual shapes (same rows, rows appended, one block removed),
+    index arrays otherwise. None when keys are not unique or the kept rows changed order.
+    """
+    b_raw, a_raw = before[key].to_numpy(), after[key].to_numpy()
+    nb, na = len(b_raw), len(a_raw)
+    none = np.empty(0, dtype=np.int64)
+    m = min(nb, na)
+    if _same_buffer(b_raw, a_raw):
+        return [(slice(0, m), slice(0, m))], none, none
+    mismatch = np.flatnonzero(b_raw[:m] != a_raw[:m])
+    i = int(mismatch[0]) if mismatch.size else m
+    if i == m:
+        # Same rows, or rows only appended / only cut from the end
+        return [(slice(0, m), slice(0, m))], np.arange(m, nb), np.arange(m, na)
+    if nb > na and np.array_equal(b_raw[i + nb - na:], a_raw[i:]):
+        k = nb - na
+        return [(slice(0, i), slice(0, i)), (slice(i + k, nb), slice(i, na))], np.arange(i, i + k), none
+
+    b_keys, a_keys = pd.Index(_keys(before, key)), pd.Index(_keys(after, key))
+    if not b_keys.is_unique or not a_keys.is_unique:
+        return None
+    where = b_keys.get_indexer(a_keys)
+    common_a = np.flatnonzero(where >= 0)
+    common_b = where[common_a]
+    if (np.diff(common_b) <= 0).any():
+        return None
+    return [(common_b, common_a)], _complement(nb, common_b), np.flatnonzero(where < 0)
+
+
+def _positions(selector) -> np.ndarray:
+    return np.arange(selector.start, selector.stop) if isinstance(selector, slice) else selector
+
+
+def frame_changes(before: pd.DataFrame, after: pd.DataFrame, key: str = "Id") -> dict | None:
+    """
+    Row-level diff from before to after (None when they hold the same rows and values).
+    Rows are matched on key; when keys are missing or not unique, or the rows that are kept
+    were reordered, the step falls back to holding both frames.
+    """
+    if key not in before.columns or key not in after.columns:
+        return None if before.equals(after) else {"replace": (before, after)}
+    aligned = _alignment(before, after, key)
+    if aligned is None:
+        return {"replace": (before, after)}
+    pairs, removed, added = aligned
+
+    changed = [np.zeros(len(_positions(a_sel)), dtype=bool) for _, a_sel in pairs]
+    same_rows = len(pairs) == 1 and isinstance(pairs[0][0], slice) and pairs[0][0] == pairs[0][1]
+    changed_cols = []
+    for c in after.columns:
+        if c not in before.columns or c == key:
+            continue
+        b, a = before[c].to_numpy(), after[c].to_numpy()
+        if same_rows and _same_buffer(b, a):
+            continue   # untouched column (still the before copy's data)
+        hit = False
+        for (b_sel, a_sel), mask in zip(pairs, changed):
+            diff = ~_same(b[b_sel], a[a_sel])
+            if diff.any():
+                mask |= diff
+                hit = True
+        if hit:
+            changed_cols.append(c)
+
+    if not (len(removed) or len(added) or changed_cols or list(before.columns) != list(after.columns)):
+        return None
+    old_pos = np.concatenate([_positions(b_sel)[mask] for (b_sel, _), mask in zip(pairs, changed)])
+    new_pos = np.concatenate([_positions(a_sel)[mask] for (_, a_sel), mask in zip(pairs, changed)])
+    old_rows, new_rows = before.iloc[old_pos], after.iloc[new_pos]
+    return {
+        "key": key,
+        "columns": (list(before.columns), list(after.columns)),
+        "old": before.iloc[removed].set_axis(removed),   # index = position in before
+        "new": after.iloc[added].set_axis(added),        # index = position in after
+        "old_values": old_rows[changed_cols].set_axis(_keys(old_rows, key)),   # index = key
+        "new_values": new_rows[changed_cols].set_axis(_keys(new_rows, key)),
+    }
+
+
+def touched_keys(changes: dict) -> set[str]:
+    """Keys of every row a frame step adds, removes or changes (empty for a full replace)."""
+    if "replace" in changes:
+        return set()
+    key = changes["key"]
+    return (set(changes["old"][key].astype(str)) | set(changes["new"][key].astype(str))
+            | set(changes["old_values"].index))
+
+
+def apply_frame_changes(df: pd.DataFrame, changes: dict, undo: bool = False) -> pd.DataFrame:
+    """df with a step applied forwards (redo) or backwards (undo); rows are located by key."""
+    if "replace" in changes:
+        return changes["replace"][0 if undo else 1].copy(deep=False)
+    key = changes["key"]
+    drop, insert = (changes["new"], changes["old"]) if undo else (changes["old"], changes["new"])
+    values = changes["old_values" if undo else "new_values"]
+    columns = changes["columns"][0 if undo else 1]
+
+    out = df
+    if len(drop):
+        out = out[~pd.Index(_keys(out, key)).isin(_keys(drop, key))]
+    out = out.reset_index(drop=True)
+    if len(values):
+        where = pd.Index(_keys(out, key)).get_indexer(values.index)
+        hit = where >= 0
+        for c in values.columns:
+            new = values[c].to_numpy()[hit]
+            col = out[c].to_numpy() if c in out.columns else np.full(len(out), "", dtype=object)
+            col = col.copy() if col.dtype == new.dtype else col.astype(object)
+            col[where[hit]] = new
+            out[c] = col
+    for c in columns:
+        if c not in out.columns:
+            out[c] = ""
+    out = out[columns + [c for c in out.columns if c not in columns]]
+    if len(insert):
+        rows = insert.reindex(columns=out.columns, fill_value="")
+        n = len(out) + len(rows)
+        at = rows.index.to_numpy()
+        if at.max() >= n or len(np.unique(at)) != len(at):
+            at = np.arange(len(out), n)   # positions no longer fit (rows changed outside the log): append
+        if out.empty:
+            out = rows.reset_index(drop=True)
+        else:
+            out = out.set_axis(_complement(n, at))
+            out = pd.concat([out, rows.set_axis(at)]).sort_index().reset_index(drop=True)
+    return out
+
+
+# ---------- documents
+def doc_changes(before, after) -> dict | None:
+    """Diff of a JSON-like document (before must be a private copy; after is copied here)."""
+    if before == after:
+        return None
+    if isinstance(before, dict) and isinstance(after, dict):
+        keys = {}
+        for k in before.keys() | after.keys():
+            old, new = before.get(k, MISSING), after.get(k, MISSING)
+            if old != new:
+                keys[k] = (old, copy.deepcopy(new))
+        return {"keys": keys}
+    return {"whole": (before, copy.deepcopy(after))}
+
+
+def apply_doc_changes(doc, changes: dict, undo: bool = False):
+    """doc with a step applied; dicts are updated in place, key by key."""
+    side = 0 if undo else 1
+    if "whole" in changes:
+        return copy.deepcopy(changes["whole"][side])
+    doc = doc if isinstance(doc, dict) else {}
+    for k, pair in changes["keys"].items():
+        value = pair[side]
+        if value is MISSING:
+            doc.pop(k, None)
+        else:
+            doc[k] = copy.deepcopy(value)
+    return doc
+
+
+# ---------- log
+class CommandLog:
+    """Undo and redo stacks of steps: {"label", "rows": frame_changes or None, "docs": {name: doc_changes}}."""
+
+    def __init__(self, limit: int = MAX_STEPS):
+        self.limit = limit
+        self._undo = []
+        self._redo = []
+        self._open = None
+        self._depth = 0
+
+    def __len__(self) -> int:
+        return len(self._undo) + len(self._redo)
+
+    def begin(self, label: str, frame: pd.DataFrame, docs: dict):
+        """Start a step: remember frame and docs as they are now (nested begins join the open step)."""
+        self._depth += 1
+        if self._depth == 1:
+            self._open = (label, frame.copy(deep=False), copy.deepcopy(docs))
+
+    @property
+    def recording(self) -> bool:
+        """A step is open (between begin and its matching end)."""
+        return self._depth > 0
+
+    def note_loaded(self, rows: pd.DataFrame):
+        """rows were appended to the frame from storage during the open step: they were there before it too."""
+        if self._open is None or rows.empty:
+            return
+        label, before, docs = self._open
+        before = pd.concat([before, rows], ignore_index=True) if not before.empty else rows.reset_index(drop=True)
+        self._open = (label, before, docs)
+
+    def end(self, frame: pd.DataFrame, docs: dict) -> dict | None:
+        """Close the step and push it if anything changed; returns the step."""
+        self._depth = max(0, self._depth - 1)
+        if self._depth or self._open is None:
+            return None
+        label, before, before_docs = self._open
+        self._open = None
+        rows = frame_changes(before, frame)
+        doc_steps = {}
+        for name, doc in docs.items():
+            changes = doc_changes(before_docs.get(name), doc)
+            if changes is not None:
+                doc_steps[name] = changes
+        if rows is None and not doc_steps:
+            return None
+        step = {"label": label, "rows": rows, "docs": doc_steps}
+        self._undo.append(step)
+        del self._undo[:-self.limit]
+        self._redo.clear()
+        return step
+
+    def undo_label(self) -> str | None:
+        return self._undo[-1]["label"] if self._undo else None
+
+    def redo_label(self) -> str | None:
+        return self._redo[-1]["label"] if self._redo else None
+
+    def undo(self) -> dict | None:
+        """The step to apply backwards (moved to the redo stack)."""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._redo.append(step)
+        return step
+
+    def redo(self) -> dict | None:
+        """The step to apply forwards (moved back to the undo stack)."""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        return step
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+
+
+def undoable(label: str):
+    """
+    Decorator for FinanceApp actions: everything the call changes becomes one undo step
+    (the app provides begin_undo_step(label) / end_undo_step()).
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            self.begin_undo_step(label)
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                self.end_undo_step()
+        return wrapper
+    return deco
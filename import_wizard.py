@@ -1,5 +1,5 @@
 # import_wizard.py
-import os, json, shutil, datetime
+import os, json
 import pandas as pd
 from datetime import datetime as dt
 
@@ -14,6 +14,8 @@ from PySide6.QtWidgets import (
 
 from PySide6.QtCore import Qt
 
+from perf import timed
+
 IMPORT_PROFILES_FILE = "import_profiles.json"
 
 DATE_FORMAT_CHOICES = [
@@ -149,6 +151,40 @@ def dup_key(row):
     acct = row.get("Account") or ""
     return f"{date}|{vendor}|{amount}|{acct}"
 
+def existing_dup_keys(df) -> set:
+    """dup_key() of every row already in the ledger."""
+    keys = set()
+    if df is None or df.empty:
+        return keys
+    for _, ex in df.iterrows():
+        ex_row = {
+            "Date": ex.get("Date", ""),
+            "Vendor": (ex.get("Vendor") or ""),
+            "Amount": ex.get("Amount", 0.0),
+            "Account": ex.get("Account", ""),
+            "ExternalId": (ex.get("ExternalId") or ""),
+        }
+        keys.add(dup_key(ex_row))
+    return keys
+
+def normalize_import_row(row, mapping, opts, account):
+    """Map one raw file row to a ledger row dict using the wizard mapping + cleaning options."""
+    date_val = parse_date_value(row.get(mapping["date"]), mapping["date_format"])
+    vendor = clean_vendor(row.get(mapping["vendor"]))
+    if mapping["amount_mode"] == "single_amount":
+        amount = parse_amount_value(row.get(mapping["amount"]), **opts)
+    else:
+        amount = compute_amount_from_dc(row.get(mapping["debit"]), row.get(mapping["credit"]), **opts)
+
+    return {
+        "Date": date_val.strftime("%Y-%m-%d") if date_val else "",
+        "Vendor": vendor,
+        "Amount": amount if amount is not None else "",
+        "Memo": (row.get(mapping["memo"]) if mapping["memo"] else "") or "",
+        "ExternalId": (row.get(mapping["external_id"]) if mapping["external_id"] else "") or "",
+        "Account": account or "Unassigned"
+    }
+
 class ImportWizard(QDialog):
     def __init__(self, parent_app):
         super().__init__(parent_app)
@@ -559,6 +595,7 @@ class ImportWizard(QDialog):
         return True
 
     # ---------- Step 3
+    @timed("build_preview", rows=lambda self, _: len(self.preview_rows))
     def build_preview(self):
         # collect mapping
         self.mapping["date"] = self.map_date.currentText().strip()
@@ -579,17 +616,6 @@ class ImportWizard(QDialog):
         self.mapping["invert_amount"] = self.chk_invert.isChecked()
 
         df = self.raw_df.copy()
-        existing_keys = set()
-        if not self.app.df.empty:
-            for _, ex in self.app.df.iterrows():
-                ex_row = {
-                    "Date": ex.get("Date", ""),
-                    "Vendor": (ex.get("Vendor") or ""),
-                    "Amount": ex.get("Amount", 0.0),
-                    "Account": ex.get("Account", ""),
-                    "ExternalId": (ex.get("ExternalId") or ""),
-                }
-                existing_keys.add(dup_key(ex_row))
 
         self.preview_rows = []; self.preview_flags = []; seen = set()
         flip_quick = bool(getattr(self, "chk_flip_signs", None) and self.chk_flip_signs.isChecked())
@@ -602,24 +628,14 @@ class ImportWizard(QDialog):
             invert=invert_effective
         )
 
+        norms = [normalize_import_row(row, self.mapping, opts, self.account_choice) for _, row in df.iterrows()]
+        # Duplicates are looked up among the ledger rows of the months the file covers (read in if needed)
+        dates = sorted(n["Date"] for n in norms if n["Date"])
+        if dates:
+            self.app.load_date_range(dt.strptime(dates[0], "%Y-%m-%d").date(), dt.strptime(dates[-1], "%Y-%m-%d").date())
+        existing_keys = existing_dup_keys(self.app.df)
 
-        for _, row in df.iterrows():
-            date_val = parse_date_value(row.get(self.mapping["date"]), self.mapping["date_format"])
-            vendor = clean_vendor(row.get(self.mapping["vendor"]))
-            if self.mapping["amount_mode"] == "single_amount":
-                amount = parse_amount_value(row.get(self.mapping["amount"]), **opts)
-            else:
-                amount = compute_amount_from_dc(row.get(self.mapping["debit"]), row.get(self.mapping["credit"]), **opts)
-
-            norm = {
-                "Date": date_val.strftime("%Y-%m-%d") if date_val else "",
-                "Vendor": vendor,
-                "Amount": amount if amount is not None else "",
-                "Memo": (row.get(self.mapping["memo"]) if self.mapping["memo"] else "") or "",
-                "ExternalId": (row.get(self.mapping["external_id"]) if self.mapping["external_id"] else "") or "",
-                "Account": self.account_choice or "Unassigned"
-            }
-
+        for norm in norms:
             valid = True; err = ""
             if not norm["Date"]: valid = False; err = "Bad date"
             if norm["Amount"] in ["", None]:
@@ -689,6 +705,7 @@ class ImportWizard(QDialog):
             self.build_preview()
 
     # ---------- Commit
+    @timed("on_commit", rows=lambda self, _: len(self.preview_rows))
     def on_commit(self):
         if not self.preview_rows:
             QMessageBox.information(self, "Import", "No rows to import.")
@@ -704,12 +721,11 @@ class ImportWizard(QDialog):
             QMessageBox.information(self, "Import", "All rows are invalid or duplicates. Nothing to import.")
             return
 
-        # Backup transactions csv before write (best effort)
+        # Backup transactions csv before write (best effort): incremental, only changed chunks are stored
         try:
             tx_path = "sample_transactions.csv"
             if os.path.exists(tx_path):
-                stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-                shutil.copy(tx_path, f"sample_transactions.backup-{stamp}.csv")
+                self.app.backup_transactions("Before import")
         except Exception as e:
             QMessageBox.warning(self, "Backup", f"Backup failed (continuing):\n{e}")
 
@@ -0,0 +1,315 @@
+# ledger.py
+"""
+Running account balances with delta bookkeeping.
+
+The ledger remembers each transaction's contribution (account, amount in cents,
+applied flag) by Id, so an insert / edit / delete / applied-flag flip moves the
+per-account sums in O(1) instead of regrouping the whole frame.
+Amounts are kept in integer cents so repeated edits cannot drift.
+
+It also keeps a per-account balance history: applied amounts summed per day and
+stored as two compact arrays (sorted day ordinals + cumulative cents), so
+"balance of account X on date D" is a binary search.
+
+A full recompute from the DataFrame (rebuild / verify) is only needed at load
+time and as a consistency check. Rows the app does not keep in memory (months
+that are not loaded, see month_store.py) come in as a base of applied cents per
+account per day (daily_applied of those rows): they count in the totals and
+the history, but have no per-row entry to edit.
+"""
+import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+import pandas as pd
+
+
+def _cents(amount) -> int:
+    try:
+        value = float(amount)
+    except (TypeError, ValueError):
+        return 0
+    if value != value:   # NaN
+        return 0
+    return int(round(value * 100))
+
+
+def _day(value) -> int | None:
+    """Date-like value -> proleptic ordinal (None when unparseable)."""
+    if isinstance(value, datetime.datetime):
+        return value.date().toordinal()
+    if isinstance(value, datetime.date):
+        return value.toordinal()
+    text = str(value).strip()
+    try:
+        return datetime.date.fromisoformat(text[:10]).toordinal()
+    except ValueError:
+        ts = pd.to_datetime(text, errors="coerce")
+        return None if pd.isna(ts) else ts.date().toordinal()
+
+
+def _is_applied(flag) -> bool:
+    # AppliedToBalance is bool in memory, but the import wizard appends "True"/"False" strings
+    if isinstance(flag, str):
+        return flag.strip().lower() in ("true", "1", "yes")
+    return bool(flag)
+
+
+def daily_applied(df) -> dict[str, dict[int, int]]:
+    """{account: {day ordinal: applied cents}} over df's dated rows: what rebuild() puts in the history."""
+    if df is None or df.empty or not {"Date", "Account", "Amount", "AppliedToBalance"}.issubset(df.columns):
+        return {}
+    dates = pd.to_datetime(df["Date"], errors="coerce")
+    ok = (df["AppliedToBalance"].map(_is_applied).astype(bool) & dates.notna()).to_numpy()
+    if not ok.any():
+        return {}
+    daily = pd.DataFrame({
+        "Account": [str(a) for a in df["Account"].to_numpy()[ok]],
+        "Day": [d.toordinal() for d in dates[ok].dt.date],
+        "Cents": [_cents(a) for a in df["Amount"].to_numpy()[ok]],
+    }).groupby(["Account", "Day"], sort=True)["Cents"].sum()
+    out = defaultdict(dict)
+    for (account, day), cents in zip(daily.index.tolist(), daily.tolist()):
+        out[account][day] = cents
+    return dict(out)
+
+
+class BalanceLedger:
+    """Per-account sums of applied and pending (not yet applied) transaction amounts."""
+
+    def __init__(self):
+        self._rows: dict[str, tuple] = {}      # Id -> (account, cents, applied, day ordinal | None)
+        self._applied = defaultdict(int)        # account -> cents
+        self._pending = defaultdict(int)        # account -> cents
+        self._pending_ids = defaultdict(set)    # account -> {Id}
+        self._hist_days: dict[str, array] = {}  # account -> sorted day ordinals with applied activity
+        self._hist_cum: dict[str, array] = {}   # account -> cumulative applied cents up to that day
+        self._bulk = False                      # rebuild() fills the history in one pass at the end
+        self._base: dict[str, dict] = {}        # account -> {day: applied cents} of rows not in the frame
+
+    @classmethod
+    def from_frame(cls, df, base=None) -> "BalanceLedger":
+        ledger = cls()
+        ledger.rebuild(df, base)
+        return ledger
+
+    # ---------- bulk
+    def rebuild(self, df, base=None):
+        """
+        Forget everything and re-read every row of df (O(n); load/reload only).
+        base: daily_applied() of the rows kept out of df, added to the totals and history.
+        """
+        self._rows.clear()
+        self._applied.clear()
+        self._pending.clear()
+        self._pending_ids.clear()
+        self._hist_days.clear()
+        self._hist_cum.clear()
+        self._base = base or {}
+        per_account = defaultdict(lambda: defaultdict(int))
+        for account, by_day in self._base.items():
+            self._applied[account] += sum(by_day.values())
+            for day, cents in by_day.items():
+                per_account[account][day] += cents
+        if (df is not None and not df.empty
+                and {"Id", "Account", "Amount", "AppliedToBalance"}.issubset(df.columns)):
+            self._read_rows(df)
+        for account, cents, applied, day in self._rows.values():
+            if applied and day is not None:
+                per_account[account][day] += cents
+        for account, by_day in per_account.items():
+            self._merge_days(account, by_day)
+
+    def _read_rows(self, df):
+        """Per-row entries and totals for every row of df (rebuild() fills the history afterwards)."""
+        if "Date" in df.columns:
+            dates = pd.to_datetime(df["Date"], errors="coerce")
+            days = [None if pd.isna(d) else d.toordinal() for d in dates.dt.date.tolist()]
+        else:
+            days = [None] * len(df)
+        self._bulk = True
+        try:
+            for tx_id, account, amount, applied, day in zip(df["Id"].tolist(), df["Account"].tolist(),
+                                                            df["Amount"].tolist(), df["AppliedToBalance"].tolist(), days):
+                self._add(str(tx_id), (str(account), _cents(amount), _is_applied(applied), day))
+        finally:
+            self._bulk = False
+
+    def verify(self, df) -> list[tuple[str, float, float]]:
+        """
+        Compare the running sums against a full recompute from df.
+        Returns [(account, running applied total, recomputed applied total)] for accounts
+        whose applied or pending totals disagree; empty when the ledger is consistent.
+        """
+        fresh = BalanceLedger.from_frame(df, self._base)
+        issues = []
+        for account in sorted(set(self._applied) | set(fresh._applied) | set(self._pending) | set(fresh._pending)):
+            if (self._applied.get(account, 0) != fresh._applied.get(account, 0)
+                    or self._pending.get(account, 0) != fresh._pending.get(account, 0)):
+                issues.append((account, self.applied_total(account), fresh.applied_total(account)))
+        return issues
+
+    # ---------- per-row changes
+    def set_row(self, tx_id, account, amount, applied, date=None) -> dict[str, float]:
+        """
+        Insert or update one transaction (date feeds the balance history).
+        Returns {account: change in applied total} — what the stored account balances must move by.
+        """
+        tx_id = str(tx_id)
+        new = (str(account), _cents(amount), _is_applied(applied), None if date is None else _day(date))
+        old = self._rows.get(tx_id)
+        if old == new:
+            return {}
+        deltas = defaultdict(int)
+        if old is not None:
+            self._remove(tx_id, old)
+            if old[2]:
+                deltas[old[0]] -= old[1]
+        self._add(tx_id, new)
+        if new[2]:
+            deltas[new[0]] += new[1]
+        return {a: c / 100.0 for a, c in deltas.items() if c}
+
+    def remove_row(self, tx_id) -> dict[str, float]:
+        """Forget one transaction. Returns the applied-total change, as set_row does."""
+        tx_id = str(tx_id)
+        old = self._rows.get(tx_id)
+        if old is None:
+            return {}
+        self._remove(tx_id, old)
+        return {old[0]: -old[1] / 100.0} if (old[2] and old[1]) else {}
+
+    def pending_ids(self, accounts) -> set[str]:
+        """Ids of not-yet-applied transactions on the given accounts."""
+        out = set()
+        for account in accounts:
+            out |= self._pending_ids.get(account, set())
+        return out
+
+    def apply_pending(self, accounts) -> dict[str, float]:
+        """Flip every pending transaction on the given accounts to applied; returns the deltas."""
+        deltas = {}
+        for account in accounts:
+            ids = self._pending_ids.pop(account, set())
+            if not ids:
+                continue
+            by_day = defaultdict(int)
+            for tx_id in ids:
+                acct, cents, _, day = self._rows[tx_id]
+                self._rows[tx_id] = (acct, cents, True, day)
+                if day is not None:
+                    by_day[day] += cents
+            self._merge_days(account, by_day)
+            moved = self._pending.pop(account, 0)
+            self._applied[account] += moved
+            if moved:
+                deltas[account] = moved / 100.0
+        return deltas
+
+    # ---------- queries
+    def applied_total(self, account: str) -> float:
+        return self._applied.get(account, 0) / 100.0
+
+    def pending_total(self, account: str) -> float:
+        return self._pending.get(account, 0) / 100.0
+
+    def pending_count(self, account: str) -> int:
+        return len(self._pending_ids.get(account, ()))
+
+    def base_total(self, account: str) -> float:
+        """Applied total of the account's rows that are not in the frame (the rebuild base)."""
+        return sum(self._base.get(account, {}).values()) / 100.0
+
+    def __len__(self):
+        return len(self._rows)
+
+    # ---------- history
+    def applied_through(self, account: str, date) -> float:
+        """Sum of applied amounts on account dated on or before date."""
+        days = self._hist_days.get(account)
+        if not days:
+            return 0.0
+        i = bisect_right(days, _day(date)) - 1
+        return self._hist_cum[account][i] / 100.0 if i >= 0 else 0.0
+
+    def balance_on(self, account: str, date, starting: float = 0.0) -> float:
+        """Balance of account at the end of date, given its balance before any transaction."""
+        return float(starting) + self.applied_through(account, date)
+
+    def net_worth_series(self, starting: dict[str, float], dates) -> list[float]:
+        """Summed balance_on over the given accounts ({name: starting balance}) for each date."""
+        ordinals = [_day(d) for d in dates]
+        totals = [float(sum(starting.values()))] * len(ordinals)
+        for account in starting:
+            days = self._hist_days.get(account)
+            if not days:
+                continue
+            cum = self._hist_cum[account]
+            for k, day in enumerate(ordinals):
+                i = bisect_right(days, day) - 1
+                if i >= 0:
+                    totals[k] += cum[i] / 100.0
+        return totals
+
+    def first_day(self) -> datetime.date | None:
+        """Earliest date with applied activity on any account."""
+        firsts = [days[0] for days in self._hist_days.values() if days]
+        return datetime.date.fromordinal(min(firsts)) if firsts else None
+
+    # ---------- internals
+    def _add(self, tx_id: str, entry: tuple[str, int, bool]):
+        if tx_id in self._rows:   # duplicate Id: last row wins
+            self._remove(tx_id, self._rows[tx_id])
+        account, cents, applied, day = entry
+        self._rows[tx_id] = entry
+        if applied:
+            self._applied[account] += cents
+            if day is not None and not self._bulk:
+                self._shift(account, day, cents)
+        else:
+            self._pending[account] += cents
+            self._pending_ids[account].add(tx_id)
+
+    def _remove(self, tx_id: str, entry: tuple[str, int, bool]):
+        account, cents, applied, day = entry
+        del self._rows[tx_id]
+        if applied:
+            self._applied[account] -= cents
+            if day is not None and not self._bulk:
+                self._shift(account, day, -cents)
+        else:
+            self._pending[account] -= cents
+            self._pending_ids[account].discard(tx_id)
+
+    def _shift(self, account: str, day: int, cents: int):
+        """Add cents to the history from day onward (O(days with activity) for that account)."""
+        days = self._hist_days.setdefault(account, array("l"))
+        cum = self._hist_cum.setdefault(account, array("q"))
+        i = bisect_left(days, day)
+        if i == len(days) or days[i] != day:
+            days.insert(i, day)
+            cum.insert(i, cum[i - 1] if i else 0)
+        for j in range(i, len(cum)):
+            cum[j] += cents
+
+    def _merge_days(self, account: str, by_day: dict[int, int]):
+        """Fold many {day: cents} changes into an account's history in one pass."""
+        if not by_day:
+            return
+        days = self._hist_days.get(account, array("l"))
+        cum = self._hist_cum.get(account, array("q"))
+        merged = defaultdict(int)
+        prev = 0
+        for day, total in zip(days, cum):
+            merged[day] += total - prev
+            prev = total
+        for day, cents in by_day.items():
+            merged[day] += cents
+        new_days, new_cum, running = array("l"), array("q"), 0
+        for day in sorted(merged):
+            running += merged[day]
+            new_days.append(day)
+            new_cum.append(running)
+        self._hist_days[account] = new_days
+        self._hist_cum[account] = new_cum
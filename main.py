@@ -1,42 +1,128 @@
 import sys
+import perf
+
+# Startup profiling (only when launched as the app, not when imported).
+# --startup-report prints the phase breakdown; --startup-trace-alloc adds Python allocation tracing.
+STARTUP = perf.StartupProfiler(
+    enabled=__name__ == "__main__",
+    trace_alloc="--startup-trace-alloc" in sys.argv,
+)
+
 import os
+import gc
 import json
+import time
+import calendar
 import datetime
-import pandas as pd
 from datetime import datetime as dt
 
-from PySide6.QtWidgets import (
-    QApplication, QWidget, QTableWidget, QTableWidgetItem, QVBoxLayout, QLabel, QPushButton,
-    QDialog, QFormLayout, QLineEdit, QDialogButtonBox, QMessageBox, QMenu,QMenuBar, QMessageBox,
-    QTabWidget, QHBoxLayout, QComboBox, QDateEdit, QGroupBox, QGridLayout,
-    QProgressBar, QCheckBox
-)
-from PySide6.QtCore import Qt, QDate
+with STARTUP.phase("import:pandas"):
+    import numpy as np
+    import pandas as pd
+    pd.set_option("mode.copy_on_write", True)
+
+with STARTUP.phase("import:qt"):
+    from PySide6.QtWidgets import (
+        QApplication, QWidget, QTableWidget, QTableWidgetItem, QVBoxLayout, QLabel, QPushButton,
+        QDialog, QFormLayout, QLineEdit, QDialogButtonBox, QMessageBox, QMenu,QMenuBar, QMessageBox,
+        QTabWidget, QHBoxLayout, QComboBox, QDateEdit, QGroupBox, QGridLayout,
+        QCheckBox, QFileDialog, QSpinBox
+    )
+    from PySide6.QtCore import Qt, QDate, QTimer
+    from PySide6.QtGui import QKeySequence
+
+    from PySide6.QtWidgets import QListWidget, QListWidgetItem
+    from PySide6.QtWidgets import QAbstractItemView, QTableView
+    from PySide6.QtWidgets import QHBoxLayout
+
+# Project modules come after the library phases: they import pandas/Qt themselves,
+# which would otherwise be charged to whichever line imported them first.
+with STARTUP.phase("import:app"):
+    from ledger import BalanceLedger
+    import transfers
+    import budget_engine
+    import recurring
+    import forecast
+    import charts
+    from formatting import fmt_money
+    import native_charts
+    from budget_table import BudgetSummaryModel, BudgetProgressDelegate, PROGRESS_COLUMN
+    import dashboard_data
+    from rollups import MonthlyRollup, month_code
+    from snapshot import TransactionSnapshot, sort_column_ranks, sort_permutation
+    from search_index import TokenIndex, SEARCH_COLUMNS
+    import filter_engine
+    from transactions_model import TransactionsTableModel
+    import memory_report
+    from history import CommandLog, undoable, apply_frame_changes, apply_doc_changes, touched_keys
+    from backup_store import BackupStore, DEFAULT_RETENTION
+    from month_store import MonthStore, DATELESS, row_months, months_between
 
-from PySide6.QtWidgets import QListWidget, QListWidgetItem
-from PySide6.QtWidgets import QAbstractItemView
-from PySide6.QtWidgets import QHBoxLayout
-
-
-# Matplotlib (for Reports & Dashboard charts)
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
 # ----------------------------
 # File paths / constants
 # ----------------------------
 TRANSACTIONS_FILE = "sample_transactions.csv"
+TRANSACTIONS_INDEX_FILE = "transactions_index.json"   # per-month byte ranges + aggregates of the file (month_store.py)
+TRANSACTION_COLUMNS = ['Id', 'Date', 'Vendor', 'Amount', 'Type', 'Category', 'Account',
+                       'AppliedToBalance', 'ExternalId', 'TransferGroup', 'CategorySource']
+RESIDENT_MONTHS = 12   # recent months kept in memory besides what the views show (Settings → Memory)
 AUTOCAT_FILE = "autocategorize.json"   # Sprint 12: vendor→category memory
 UNCATEGORIZED = "Uncategorized"        # used throughout (normalize blank categories)
 BUDGET_FILE = "budgets.json"
 ACCOUNTS_FILE = "accounts.json"
 SETTINGS_FILE = "settings.json"
 CATEGORIES_FILE = "categories.json"
+ROLLUPS_FILE = "rollups.json"           # month-level Reports totals, valid while the transactions file is unchanged
+BACKUP_DIR = "backups"                  # incremental backups of the transactions file (see backup_store.py)
+# Edit → Undo/Redo: app attribute -> file of the JSON documents an undo step can restore (see history.py)
+UNDO_DOCUMENTS = {"accounts": ACCOUNTS_FILE, "budgets": BUDGET_FILE, "categories": CATEGORIES_FILE,
+                  "autocat": AUTOCAT_FILE}
 UNCATEGORIZED = "Uncategorized"
 NEW_CATEGORY_OPTION = "➕ New category…"
 
 SYSTEM_CATEGORIES = {"Transfer"}
 
+# Budgets tab (statuses come from budget_engine.BudgetEngine)
+BUDGET_TABLE_HEADERS = ["Category", "Period", "Mode", "Entered Amount", "Monthly Equivalent",
+                        "Current Period", "Spent", "Remaining"]
+BUDGET_MODE_LABELS = {"fixed": "Fixed", "rolling": "Rolling", "carryover": "Carry-over"}
+
+# Reports: views of the monthly rollups in the month chart
+REPORT_MONTH_VIEWS = ["Income vs Expenses", "Year over Year", "Trailing 12 Months"]
+
+# Reports: recurring charges table (rows come from recurring.detect_recurring)
+RECURRING_TABLE_HEADERS = ["Vendor", "Category", "Account", "Cadence", "Typical Amount", "Per Month",
+                           "Last", "Next Expected", "Status"]
+
+# Transactions tab sort modes (see sort_transactions_df)
+TXN_SORT_MODES = [
+    "Date: Newest→Oldest",
+    "Date: Oldest→Newest",
+    "Amount: High→Low",
+    "Amount: Low→High",
+    "Category: A→Z",
+    "Category: Z→A",
+    "Vendor: A→Z",
+    "Vendor: Z→A",
+    "Account: A→Z",
+    "Account: Z→A"
+]
+# sort mode -> (column, descending); missing values sort last either way
+TXN_SORT_KEYS = {
+    "Date: Newest→Oldest": ("Date", True),
+    "Date: Oldest→Newest": ("Date", False),
+    "Amount: High→Low": ("Amount", True),
+    "Amount: Low→High": ("Amount", False),
+    "Category: A→Z": ("Category", False),
+    "Category: Z→A": ("Category", True),
+    "Vendor: A→Z": ("Vendor", False),
+    "Vendor: Z→A": ("Vendor", True),
+    "Account: A→Z": ("Account", False),
+    "Account: Z→A": ("Account", True),
+}
+TXN_SEARCH_DELAY_MS = 150   # as-you-type search waits for a pause this long before refiltering
+
 def is_system_category(name: str) -> bool:
     return str(name or "").strip().lower() in {n.lower() for n in SYSTEM_CATEGORIES}
 
@@ -49,7 +135,7 @@ GRID_COLOR = "#2a2a2a"
 
 
 # ----------------------------
-# Helper functions (dates/currency)
+# Helper functions (dates; money is formatting.fmt_money)
 # ----------------------------
 def start_of_month(date: datetime.date) -> datetime.date:
     return date.replace(day=1)
@@ -58,14 +144,6 @@ def end_of_month(date: datetime.date) -> datetime.date:
     next_month = date.replace(day=28) + datetime.timedelta(days=4)
     return next_month - datetime.timedelta(days=next_month.day)
 
-def fmt_money(value) -> str:
-    if value is None or value == "":
-        return ""
-    try:
-        return f"${float(value):,.2f}"
-    except Exception:
-        return str(value)
-
 # --- Sprint 12: Auto-categorize helpers (must be defined BEFORE FinanceApp) ---
 import re
 from difflib import SequenceMatcher
@@ -90,6 +168,11 @@ def _vendor_stem(s: str, n: int = 2) -> str:
     toks = _vendor_tokens(s)
     return " ".join(toks[:n]) if toks else ""
 
+def _vendor_root(s: str, n: int = 2) -> str:
+    """_vendor_stem ignoring store/reference numbers; ex: 'SPOTIFY #0412 TORONTO' -> 'spotify toronto'."""
+    toks = [t for t in _vendor_tokens(s) if not t.isdigit()]
+    return " ".join(toks[:n]) if toks else ""
+
 def _token_overlap(a: str, b: str) -> int:
     at = set(_vendor_tokens(a))
     bt = set(_vendor_tokens(b))
@@ -103,25 +186,79 @@ def _sim(a: str, b: str) -> float:
 # ----------------------------
 # Matplotlib canvas (dark theme)
 # ----------------------------
-class MplCanvas(FigureCanvas):
-    def __init__(self, width=4, height=3, dpi=100):
-        fig = Figure(figsize=(width, height), dpi=dpi, tight_layout=True)
-        fig.set_facecolor(DARK_FIG)
-        self.ax = fig.add_subplot(111)
-        self.ax.set_facecolor(DARK_AX)
-        self.ax.tick_params(colors=LIGHT_TEXT)
-        self.ax.xaxis.label.set_color(LIGHT_TEXT)
-        self.ax.yaxis.label.set_color(LIGHT_TEXT)
-        self.ax.title.set_color(LIGHT_TEXT)
-        super().__init__(fig)
-
-    def set_dark(self):
-        self.figure.set_facecolor(DARK_FIG)
-        self.ax.set_facecolor(DARK_AX)
-        self.ax.tick_params(colors=LIGHT_TEXT)
-        self.ax.xaxis.label.set_color(LIGHT_TEXT)
-        self.ax.yaxis.label.set_color(LIGHT_TEXT)
-        self.ax.title.set_color(LIGHT_TEXT)
+# Matplotlib is heavy to import, so it is loaded on first chart use
+# (Dashboard/Reports tabs) instead of at startup.
+_MPL_CANVAS_CLASS = None
+
+def _mpl_canvas_class():
+    global _MPL_CANVAS_CLASS
+    if _MPL_CANVAS_CLASS is not None:
+        return _MPL_CANVAS_CLASS
+
+    from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+    from matplotlib.figure import Figure
+
+    class _MplCanvas(FigureCanvas):
+        def __init__(self, width=4, height=3, dpi=100):
+            fig = Figure(figsize=(width, height), dpi=dpi, tight_layout=True)
+            fig.set_facecolor(DARK_FIG)
+            self.ax = fig.add_subplot(111)
+            self.ax.set_facecolor(DARK_AX)
+            self.ax.tick_params(colors=LIGHT_TEXT)
+            self.ax.xaxis.label.set_color(LIGHT_TEXT)
+            self.ax.yaxis.label.set_color(LIGHT_TEXT)
+            self.ax.title.set_color(LIGHT_TEXT)
+            super().__init__(fig)
+            self.render_key = None   # inputs of what the figure currently shows (see needs_render)
+
+        def needs_render(self, key) -> bool:
+            """
+            False when the figure already shows these inputs, so the caller can skip Matplotlib
+            entirely. Otherwise remembers key and returns True. The widget size is not part of
+            the key: on resize the canvas re-renders its existing artists by itself.
+            """
+            if key == self.render_key:
+                return False
+            self.render_key = key
+            return True
+
+        def set_dark(self):
+            self.figure.set_facecolor(DARK_FIG)
+            self.ax.set_facecolor(DARK_AX)
+            self.ax.tick_params(colors=LIGHT_TEXT)
+            self.ax.xaxis.label.set_color(LIGHT_TEXT)
+            self.ax.yaxis.label.set_color(LIGHT_TEXT)
+            self.ax.title.set_color(LIGHT_TEXT)
+
+    _MPL_CANVAS_CLASS = _MplCanvas
+    return _MPL_CANVAS_CLASS
+
+def MplCanvas(width=4, height=3, dpi=100):
+    """Create a dark-themed Matplotlib canvas (imports Matplotlib on first call)."""
+    return _mpl_canvas_class()(width=width, height=height, dpi=dpi)
+
+
+# ----------------------------
+# Chart backends (Settings > Chart renderer)
+# ----------------------------
+# matplotlib: Agg-rendered figures (charts.py); native: QPainter widgets (native_charts.py), never imports Matplotlib
+CHART_BACKENDS = {"matplotlib": "Matplotlib", "native": "Native (Qt)"}
+DEFAULT_CHART_BACKEND = "matplotlib"
+
+def ChartCanvas(backend: str, width=4, height=3, dpi=100):
+    """Dark chart canvas for the given backend."""
+    if backend == "native":
+        return native_charts.NativeCanvas(width=width, height=height, dpi=dpi, background=DARK_FIG)
+    return MplCanvas(width=width, height=height, dpi=dpi)
+
+def make_chart(canvas, kind: str):
+    """Chart object ("donut", "bars" or "lines") drawing on canvas, from the canvas's backend."""
+    module = native_charts if isinstance(canvas, native_charts.NativeCanvas) else charts
+    if kind == "donut":
+        return module.DonutChart(canvas, DARK_FIG, DARK_AX, LIGHT_TEXT)
+    if kind == "bars":
+        return module.PairedBarChart(canvas, DARK_FIG, DARK_AX, LIGHT_TEXT, GRID_COLOR)
+    return module.LineChart(canvas, DARK_FIG, DARK_AX, LIGHT_TEXT, GRID_COLOR)
 
 
 # ----------------------------
@@ -325,12 +462,13 @@ class BudgetDialog(QDialog):
     """
     Add/Edit a budget for a category.
     Period: Monthly/Weekly/Daily
+    Mode: Fixed/Rolling/Carry-over
     Only Expense categories are shown.
     """
     def __init__(self, categories_expense, budgets, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Set/Edit Budget")
-        self.budgets = budgets  # {cat: {"amount": float, "period": "daily|weekly|monthly"}}
+        self.budgets = budgets  # {cat: {"amount": float, "period": "daily|weekly|monthly", "mode": "fixed|rolling|carryover"}}
         self.layout = QFormLayout(self)
 
         self.category_dropdown = QComboBox(self)
@@ -340,7 +478,7 @@ class BudgetDialog(QDialog):
         if UNCATEGORIZED not in cats:
             cats = [UNCATEGORIZED] + list(cats)
         self.category_dropdown.addItems(sorted(cats))
-
+        self.layout.addRow("Category:", self.category_dropdown)
 
         self.amount_input = QLineEdit(self)
         self.layout.addRow("Amount:", self.amount_input)
@@ -349,6 +487,12 @@ class BudgetDialog(QDialog):
         self.period_dropdown.addItems(["Monthly", "Weekly", "Daily"])
         self.layout.addRow("Period:", self.period_dropdown)
 
+        # Fixed: calendar period; Rolling: trailing window; Carry-over: leftovers roll into the next period
+        self.mode_dropdown = QComboBox(self)
+        for code, label in BUDGET_MODE_LABELS.items():
+            self.mode_dropdown.addItem(label, code)
+        self.layout.addRow("Mode:", self.mode_dropdown)
+
         self.category_dropdown.currentTextChanged.connect(self.on_category_changed)
         self.on_category_changed(self.category_dropdown.currentText())
 
@@ -366,15 +510,19 @@ class BudgetDialog(QDialog):
             idx = self.period_dropdown.findText(period)
             if idx >= 0:
                 self.period_dropdown.setCurrentIndex(idx)
+            idx = self.mode_dropdown.findData(data.get("mode") or "fixed")
+            self.mode_dropdown.setCurrentIndex(max(idx, 0))
         else:
             self.amount_input.setText("")
             self.period_dropdown.setCurrentIndex(self.period_dropdown.findText("Monthly"))
+            self.mode_dropdown.setCurrentIndex(0)
 
     def getData(self):
         return {
             "Category": self.category_dropdown.currentText().strip(),
             "Amount": self.amount_input.text(),
-            "Period": self.period_dropdown.currentText().lower()
+            "Period": self.period_dropdown.currentText().lower(),
+            "Mode": self.mode_dropdown.currentData() or "fixed"
         }
 
 
@@ -407,6 +555,186 @@ class AccountDialog(QDialog):
         }
 
 
+class TransferMatchDialog(QDialog):
+    """
+    Review automatically detected transfer pairs and pick which ones to link.
+    Matching itself lives in transfers.find_transfer_pairs.
+    """
+    HEADERS = ["Link", "Out Date", "From Account", "Out Vendor", "In Date", "To Account", "In Vendor", "Amount", "Days"]
+
+    def __init__(self, df, max_days=transfers.DEFAULT_MAX_DAYS, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Find Transfers")
+        self.resize(1000, 560)
+        self.df = df
+        self.suggestions = transfers.find_transfer_pairs(df.iloc[0:0])
+
+        layout = QVBoxLayout(self)
+        top = QHBoxLayout()
+        top.addWidget(QLabel("Max days apart:"))
+        self.days_spin = QSpinBox(self)
+        self.days_spin.setRange(0, 30)
+        self.days_spin.setValue(int(max_days))
+        top.addWidget(self.days_spin)
+        self.btn_search = QPushButton("Search")
+        top.addWidget(self.btn_search)
+        top.addStretch()
+        self.count_label = QLabel()
+        top.addWidget(self.count_label)
+        layout.addLayout(top)
+
+        self.table = QTableWidget(self)
+        self.table.setColumnCount(len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        layout.addWidget(self.table)
+
+        bottom = QHBoxLayout()
+        self.btn_all = QPushButton("Select All")
+        self.btn_none = QPushButton("Select None")
+        bottom.addWidget(self.btn_all)
+        bottom.addWidget(self.btn_none)
+        bottom.addStretch()
+        self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+        self.buttons.button(QDialogButtonBox.Ok).setText("Link Selected")
+        bottom.addWidget(self.buttons)
+        layout.addLayout(bottom)
+
+        self.btn_search.clicked.connect(self.search)
+        self.btn_all.clicked.connect(lambda: self._check_all(True))
+        self.btn_none.clicked.connect(lambda: self._check_all(False))
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+
+        self.search()
+
+    def search(self):
+        self.suggestions = transfers.find_transfer_pairs(self.df, self.days_spin.value())
+        sug = self.suggestions
+        self.table.setRowCount(len(sug))
+        for r, row in enumerate(sug.itertuples(index=False)):
+            chk = QTableWidgetItem()
+            chk.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
+            chk.setCheckState(Qt.Checked)
+            self.table.setItem(r, 0, chk)
+            values = [row.OutDate, row.OutAccount, row.OutVendor, row.InDate, row.InAccount, row.InVendor]
+            for c, val in enumerate(values, start=1):
+                self.table.setItem(r, c, QTableWidgetItem(str(val)))
+            amt_item = QTableWidgetItem(fmt_money(row.Amount))
+            amt_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self.table.setItem(r, 7, amt_item)
+            self.table.setItem(r, 8, QTableWidgetItem(str(row.DaysApart)))
+        self.table.resizeColumnsToContents()
+        self.count_label.setText(f"{len(sug)} possible transfer(s)")
+
+    def _check_all(self, checked: bool):
+        state = Qt.Checked if checked else Qt.Unchecked
+        for r in range(self.table.rowCount()):
+            self.table.item(r, 0).setCheckState(state)
+
+    def selected_pairs(self) -> list[tuple[str, str]]:
+        """(out Id, in Id) for every checked suggestion."""
+        out_ids = self.suggestions["OutId"].tolist()
+        in_ids = self.suggestions["InId"].tolist()
+        return [(out_ids[r], in_ids[r]) for r in range(self.table.rowCount())
+                if self.table.item(r, 0).checkState() == Qt.Checked]
+
+
+class TransactionFilterDialog(QDialog):
+    """
+    Pick the Transactions filters: values per column (all checked = no filter), an amount range
+    and transfer handling. getSpec() returns a filter_engine spec.
+    """
+    BLANK = "(blank)"
+    LABELS = {"accounts": "Account", "categories": "Category", "types": "Type", "sources": "Category Source"}
+
+    def __init__(self, values: dict, spec: dict, parent=None):
+        """values: spec key -> distinct values present in the ledger (see filter_engine.VALUE_FILTERS)."""
+        super().__init__(parent)
+        self.setWindowTitle("Filter Transactions")
+        self.resize(620, 480)
+
+        layout = QVBoxLayout(self)
+        grid = QGridLayout()
+        self.lists = {}
+        for col, key in enumerate(filter_engine.VALUE_FILTERS):
+            selected = spec.get(key)
+            names = sorted(set(values.get(key, [])) | set(selected or []), key=lambda x: str(x).lower())
+            lst = QListWidget(self)
+            for name in names:
+                item = QListWidgetItem(str(name) or self.BLANK)
+                item.setData(Qt.UserRole, str(name))
+                item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
+                item.setCheckState(Qt.Checked if selected is None or name in selected else Qt.Unchecked)
+                lst.addItem(item)
+            grid.addWidget(QLabel(self.LABELS[key] + ":"), 0, col)
+            grid.addWidget(lst, 1, col)
+            self.lists[key] = lst
+        layout.addLayout(grid)
+
+        form = QFormLayout()
+        self.amount_min_input = QLineEdit(self)
+        self.amount_max_input = QLineEdit(self)
+        self.amount_min_input.setPlaceholderText("any (expenses are negative)")
+        self.amount_max_input.setPlaceholderText("any")
+        for edit, value in ((self.amount_min_input, spec.get("amount_min")), (self.amount_max_input, spec.get("amount_max"))):
+            if value is not None:
+                edit.setText(repr(float(value)))   # exact round trip through _amount
+        self.transfers_dropdown = QComboBox(self)
+        self.transfers_dropdown.addItems(filter_engine.TRANSFER_MODES)
+        self.transfers_dropdown.setCurrentText(spec.get("transfers", filter_engine.TRANSFER_MODES[0]))
+        form.addRow("Amount from:", self.amount_min_input)
+        form.addRow("Amount to:", self.amount_max_input)
+        form.addRow("Transfers:", self.transfers_dropdown)
+        layout.addLayout(form)
+
+        bottom = QHBoxLayout()
+        self.btn_reset = QPushButton("Reset")
+        bottom.addWidget(self.btn_reset)
+        bottom.addStretch()
+        self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+        bottom.addWidget(self.buttons)
+        layout.addLayout(bottom)
+
+        self.btn_reset.clicked.connect(self.reset)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+
+    def reset(self):
+        for lst in self.lists.values():
+            for r in range(lst.count()):
+                lst.item(r).setCheckState(Qt.Checked)
+        self.amount_min_input.clear()
+        self.amount_max_input.clear()
+        self.transfers_dropdown.setCurrentIndex(0)
+
+    def _amount(self, edit: QLineEdit):
+        text = edit.text().strip().replace("$", "").replace(",", "")
+        return float(text) if text else None
+
+    def accept(self):
+        try:
+            lo, hi = self._amount(self.amount_min_input), self._amount(self.amount_max_input)
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Amount", "Amount from/to must be numbers (or left blank).")
+            return
+        if lo is not None and hi is not None and lo > hi:
+            QMessageBox.warning(self, "Invalid Amount", "Amount from must be less than or equal to Amount to.")
+            return
+        super().accept()
+
+    def getSpec(self) -> dict:
+        spec = filter_engine.empty_spec()
+        for key, lst in self.lists.items():
+            items = [lst.item(r) for r in range(lst.count())]
+            checked = [i.data(Qt.UserRole) for i in items if i.checkState() == Qt.Checked]
+            spec[key] = None if len(checked) == len(items) else checked
+        spec["amount_min"] = self._amount(self.amount_min_input)
+        spec["amount_max"] = self._amount(self.amount_max_input)
+        spec["transfers"] = self.transfers_dropdown.currentText()
+        return spec
+
+
 # ----------------------------
 # Main App
 # ----------------------------
@@ -456,6 +784,76 @@ def _merge_seed_autocat_from_file(existing: dict, seed_path: str) -> dict:
             out[k] = v  # seed as string; runtime upgrades to counters after confirmations
     return out
 
+def normalize_transactions(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Raw transactions (read_csv with dtype=str) in the app's shape: the 11 columns, numeric Amount,
+    bool AppliedToBalance, defaults for blank Type/Account/Category. Each row is normalized on its
+    own, so a month read by itself comes out the same as in a full load.
+    """
+    cols = TRANSACTION_COLUMNS
+
+    # Ensure columns exist
+    for c in cols:
+        if c not in df.columns:
+            if c == 'Id':
+                continue
+            if c == 'AppliedToBalance':
+                df[c] = "False"
+            elif c == 'Amount':
+                df[c] = "0"
+            else:
+                df[c] = ""
+    # Id column
+    if "Id" not in df.columns or df["Id"].isna().all():
+        df["Id"] = ""
+        next_id = 1
+        for i in df.index:
+            df.at[i, "Id"] = str(next_id)
+            next_id += 1
+
+
+
+    # Dtypes and defaults
+    if not df.empty:
+        df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce').fillna(0.0)
+        # Type inference where missing
+        if "Type" in df.columns:
+            df['Type'] = df['Type'].replace("", pd.NA)
+        if "Type" not in df.columns:
+            df['Type'] = pd.NA
+        missing = df['Type'].isna()
+        if missing.any():
+            df.loc[missing, 'Type'] = df.loc[missing, 'Amount'].apply(lambda x: "Expense" if float(x) < 0 else "Income")
+        # Account default
+        if "Account" in df.columns:
+            df['Account'] = df['Account'].replace("", "Unassigned")
+        else:
+            df['Account'] = "Unassigned"
+        # Category default
+        if "Category" in df.columns:
+            df['Category'] = df['Category'].replace("", UNCATEGORIZED)
+        else:
+            df['Category'] = UNCATEGORIZED
+        # AppliedToBalance -> bool
+        df['AppliedToBalance'] = df['AppliedToBalance'].astype(str).str.strip().str.lower().isin(["true", "1", "yes"])
+    else:
+        df = pd.DataFrame(columns=cols)
+    
+    # Default empty categories to 'Uncategorized'
+    if "Category" in df.columns:
+        df['Category'] = df['Category'].fillna("").replace("", UNCATEGORIZED)
+    else:
+        df['Category'] = UNCATEGORIZED
+
+    # Ensure CategorySource exists
+    if "CategorySource" not in df.columns:
+        df["CategorySource"] = ""
+
+    df = df[['Id', 'Date', 'Vendor', 'Amount', 'Type', 'Category', 'Account',
+     'AppliedToBalance', 'ExternalId', 'TransferGroup', 'CategorySource']]
+
+    return df
+
 def _project_path(*parts: str) -> str:
     base = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(base, *parts)
@@ -471,15 +869,55 @@ class FinanceApp(QWidget):
         # Root layout for the whole window (QWidget doesn't have .menuBar())
         self.layout = QVBoxLayout(self)
 
+        # Bumped whenever self.df is saved or reloaded; derived indexes rebuild when it changes
+        self.data_version = 0
+        self._spend_index = None
+        self._spend_index_version = -1
+        self._recurring = None
+        self._recurring_key = None
+        self._recurring_table_key = None
+        self._forecast = None
+        self._forecast_key = None
+        self._rollups_version = -1
+        self._chart_slots = []   # charts built so far, see _add_chart
+        # Dashboard aggregates are computed by a background worker (see update_dashboard_tab)
+        self.dashboard_worker = dashboard_data.DashboardWorker(self)
+        self.dashboard_worker.finished.connect(self._apply_dashboard_snapshot)
+        self.dashboard_worker.failed.connect(self._on_dashboard_snapshot_failed)
+        self._snapshot = None   # TransactionSnapshot of self.df at data_version, see snapshot()
+        self.search_index = TokenIndex(_vendor_tokens)   # Transactions search box, see search_columns()
+        self._search_columns = []
+        self._search_snapshot = None
+        self.txn_filters = filter_engine.empty_spec()   # Transactions "Filters…" dialog, see get_filtered_transactions
+        self.filter_engine = filter_engine.FilterEngine()
+        self.history = CommandLog()   # Edit → Undo/Redo steps, recorded by @undoable actions
+        self.backup_store = BackupStore(BACKUP_DIR)
+        # Only some months of the transactions file are in self.df (see month_store.py, _sync_months)
+        self.store = MonthStore(TRANSACTIONS_FILE, TRANSACTIONS_INDEX_FILE, TRANSACTION_COLUMNS,
+                                normalize_transactions)
+        self._loaded = set()   # month codes whose rows are all in self.df
+        self._views = {}       # view name -> months it shows, kept loaded
+        self._page_base = self.store.base(self._loaded)   # aggregates of the months not loaded
+
         # ------- Load Data -------
-        self.df = self.load_transactions()
-        self.repair_transaction_ids(save=True)
-        self.budgets = self.migrate_budgets(self.load_json(BUDGET_FILE, default={}))
-        self.accounts = self.ensure_accounts_fields(self.load_json(ACCOUNTS_FILE, default=[]))
-        self.settings = self.load_json(SETTINGS_FILE, default={"today_override": None})
+        with STARTUP.phase("load_json:settings"):
+            self.settings = self.load_json(SETTINGS_FILE, default={"today_override": None})
+        with STARTUP.phase("load_transactions"):
+            self.df = self.load_transactions()
+        with STARTUP.phase("repair_transaction_ids"):
+            self.repair_transaction_ids(save=True)
+        with STARTUP.phase("ledger"):
+            self.ledger = BalanceLedger.from_frame(self.df, self._page_base["ledger"])
+        with STARTUP.phase("rollups"):
+            self.rollups = self.load_rollups()
+        with STARTUP.phase("load_json:budgets"):
+            self.budgets = self.migrate_budgets(self.load_json(BUDGET_FILE, default={}))
+        with STARTUP.phase("load_json:accounts"):
+            self.accounts = self.ensure_accounts_fields(self.load_json(ACCOUNTS_FILE, default=[]))
         
         # Sprint 12: load vendor→category memory and defaults
-        self.autocat = self.load_json(AUTOCAT_FILE, default={})
+        with STARTUP.phase("load_json:autocat"):
+            self.autocat = self.load_json(AUTOCAT_FILE, default={})
         # Default settings for auto-categorization
         if "auto_categorize_enabled" not in self.settings:
             self.settings["auto_categorize_enabled"] = True
@@ -487,27 +925,31 @@ class FinanceApp(QWidget):
             self.settings["auto_categorize_threshold"] = 0.70
         # persist defaults if we added them
         self.save_json(SETTINGS_FILE, self.settings)
+        perf.TIMERS.enabled = bool(self.settings.get("perf_timers_enabled", False))
 
-        self.categories = self.ensure_categories(self.load_json(CATEGORIES_FILE, default=[]))
+        with STARTUP.phase("load_json:categories"):
+            self.categories = self.ensure_categories(self.load_json(CATEGORIES_FILE, default=[]))
         # Seed/merge categories from seeds/categories_seed.json (idempotent)
-        try:
-            seed_path = _project_path("seeds", "categories_seed.json")
-            merged = _merge_seed_categories_from_file(self.categories, seed_path)
-            if merged != self.categories:
-                self.categories = merged
-                self.save_json(CATEGORIES_FILE, self.categories)
-        except Exception:
-            pass
+        with STARTUP.phase("seed_merge:categories"):
+            try:
+                seed_path = _project_path("seeds", "categories_seed.json")
+                merged = _merge_seed_categories_from_file(self.categories, seed_path)
+                if merged != self.categories:
+                    self.categories = merged
+                    self.save_json(CATEGORIES_FILE, self.categories)
+            except Exception:
+                pass
 
         # Seed/merge Ontario/SW-ON vendor map from seeds/autocategorize_seed_on_ca.json (idempotent)
-        try:
-            seed_path = _project_path("seeds", "autocategorize_seed_on_ca.json")
-            merged = _merge_seed_autocat_from_file(self.autocat, seed_path)
-            if merged != self.autocat:
-                self.autocat = merged
-                self.save_json(AUTOCAT_FILE, self.autocat)
-        except Exception:
-            pass
+        with STARTUP.phase("seed_merge:autocat"):
+            try:
+                seed_path = _project_path("seeds", "autocategorize_seed_on_ca.json")
+                merged = _merge_seed_autocat_from_file(self.autocat, seed_path)
+                if merged != self.autocat:
+                    self.autocat = merged
+                    self.save_json(AUTOCAT_FILE, self.autocat)
+            except Exception:
+                pass
 
 
 
@@ -516,6 +958,7 @@ class FinanceApp(QWidget):
         self.dashboard_from_date = None
         self.dashboard_to_date = None
 
+        STARTUP.start("build_window")
         # === Menu Bar for QWidget ===
         self.menubar = QMenuBar(self)
         file_menu = self.menubar.addMenu("&File")
@@ -528,47 +971,52 @@ class FinanceApp(QWidget):
         act_exit = file_menu.addAction("Exit")
         act_exit.triggered.connect(self.close)
 
+        edit_menu = self.menubar.addMenu("&Edit")
+        self.act_undo = edit_menu.addAction("Undo")
+        self.act_undo.setShortcut(QKeySequence.StandardKey.Undo)
+        self.act_undo.triggered.connect(self.undo)
+        self.act_redo = edit_menu.addAction("Redo")
+        self.act_redo.setShortcut(QKeySequence.StandardKey.Redo)
+        self.act_redo.triggered.connect(self.redo)
+        self._update_undo_actions()
+
         # Attach the menubar to the top of the QWidget via its layout
         self.layout.setMenuBar(self.menubar)
 
         # ------- Tabs (Dashboard first) -------
+        # Tab pages are created empty; their contents are built the first time
+        # they are shown (see _ensure_tab_built). Only Transactions is built up front.
         self.tabs = QTabWidget()
-        
-        # Dashboard first
+
         self.dashboard_tab = QWidget()
         self.tabs.addTab(self.dashboard_tab, "Dashboard")
-        self.init_dashboard_tab()
-
-        # Transactions
         self.trans_tab = QWidget()
         self.tabs.addTab(self.trans_tab, "Transactions")
-        self.init_transactions_tab()
-
-        # Budgets
         self.budget_tab = QWidget()
         self.tabs.addTab(self.budget_tab, "Budgets")
-        self.init_budgets_tab()
-
-        # Accounts
         self.accounts_tab = QWidget()
         self.tabs.addTab(self.accounts_tab, "Accounts")
-        self.init_accounts_tab()
-
-        # Categories
         self.categories_tab = QWidget()
         self.tabs.addTab(self.categories_tab, "Categories")
-        self.init_categories_tab()
-
-        # Reports
         self.reports_tab = QWidget()
         self.tabs.addTab(self.reports_tab, "Reports")
-        self.init_reports_tab()
-
-        # Settings
         self.settings_tab = QWidget()
         self.tabs.addTab(self.settings_tab, "Settings")
-        self.init_settings_tab()
-        
+
+        self._built_tabs = set()
+        self._tab_builders = {
+            "Dashboard": self.init_dashboard_tab,
+            "Transactions": self.init_transactions_tab,
+            "Budgets": self.init_budgets_tab,
+            "Accounts": self.init_accounts_tab,
+            "Categories": self.init_categories_tab,
+            "Reports": self.init_reports_tab,
+            "Settings": self.init_settings_tab,
+        }
+        STARTUP.stop()
+        self._ensure_tab_built("Transactions")
+
+        STARTUP.start("build_sidebar")
         # --- Faux sidebar with horizontal labels (build AFTER all tabs exist) ---
         self.sidebar = QListWidget()
         self.sidebar.setSelectionMode(QAbstractItemView.SingleSelection)
@@ -608,10 +1056,9 @@ class FinanceApp(QWidget):
         _center_layout.addWidget(self.sidebar)
         _center_layout.addWidget(self.tabs, 1)
 
-        # Ensure something is selected
-        if self.tabs.count() > 0:
-            self.tabs.setCurrentIndex(0)
-            self.sidebar.setCurrentRow(0)
+        # Open on Transactions so the window paints without building charts
+        self.tabs.setCurrentWidget(self.trans_tab)
+        self.sidebar.setCurrentRow(self.tabs.currentIndex())
 
         self.sidebar.setStyleSheet("""
         QListWidget {
@@ -637,8 +1084,63 @@ class FinanceApp(QWidget):
         self.layout.addWidget(self._center_container)
 
         self.tabs.currentChanged.connect(self.on_tab_change)
+        STARTUP.stop()
+
+    # ---------------- Deferred tab construction ----------------
+    def _ensure_tab_built(self, name: str) -> bool:
+        """Build a tab's widgets on first use. Returns True if it was built just now."""
+        builder = self._tab_builders.pop(name, None)
+        if builder is None:
+            return False
+        # Mark ready first: init_* ends with its own update_* call
+        self._built_tabs.add(name)
+        with STARTUP.phase(f"init_tab:{name}"):
+            builder()
+        return True
+
+    def _tab_ready(self, name: str) -> bool:
+        return name in self._built_tabs
+
+    # ---------------- Chart widgets ----------------
+    def chart_backend(self) -> str:
+        backend = self.settings.get("chart_backend", DEFAULT_CHART_BACKEND)
+        return backend if backend in CHART_BACKENDS else DEFAULT_CHART_BACKEND
+
+    def _add_chart(self, layout, canvas_attr: str, width, height, **chart_attrs):
+        """
+        Add a chart canvas of the selected backend to layout as self.<canvas_attr>, plus
+        self.<name> = make_chart(canvas, kind) for each name=kind. The slot is remembered
+        so a backend change can swap the widget in place.
+        """
+        slot = (layout, canvas_attr, width, height, chart_attrs)
+        self._chart_slots.append(slot)
+        layout.addWidget(self._create_chart(slot))
+
+    def _create_chart(self, slot):
+        _layout, canvas_attr, width, height, chart_attrs = slot
+        canvas = ChartCanvas(self.chart_backend(), width=width, height=height, dpi=100)
+        setattr(self, canvas_attr, canvas)
+        for attr, kind in chart_attrs.items():
+            setattr(self, attr, make_chart(canvas, kind))
+        return canvas
+
+    def on_chart_backend_changed(self, *_):
+        backend = self.chart_backend_dropdown.currentData()
+        if backend == self.chart_backend():
+            return
+        self.settings["chart_backend"] = backend
+        self.save_json(SETTINGS_FILE, self.settings)
+        # New canvases have no render key, so the refresh below draws them all
+        for slot in self._chart_slots:
+            layout, canvas_attr = slot[0], slot[1]
+            old = getattr(self, canvas_attr)
+            layout.replaceWidget(old, self._create_chart(slot))
+            old.deleteLater()
+        self.update_dashboard_tab()
+        self.refresh_reports()
 
     # Import wizard call
+    @undoable("Import transactions")
     def open_import_wizard(self):
         try:
             from import_wizard import ImportWizard
@@ -649,10 +1151,13 @@ class FinanceApp(QWidget):
         dlg = ImportWizard(self)
         dlg.exec()  # Import wizard appends to CSV on "Commit"
 
-        # After dialog closes, reload from disk, repair Ids, and refresh UI
+        # After dialog closes, reload from disk (the months loaded now, rows in their current order),
+        # repair Ids, and refresh UI
         try:
-            self.df = self.load_transactions()
+            self.df = self._in_memory_order(self.load_transactions(keep=self._loaded))
             self.repair_transaction_ids(save=True)
+            self.data_version += 1         # reloaded from disk: derived indexes must rebuild
+            self.ledger.rebuild(self.df, self._page_base["ledger"])   # the wizard already set any initialized account balances
             self.update_table()
             self.update_summary()
             self.update_budgets_table()
@@ -721,19 +1226,12 @@ class FinanceApp(QWidget):
         return True
 
     def migrate_budgets(self, raw):
-        """Normalize budgets to dict with amount+period."""
+        """Normalize budgets to dict with amount+period+mode; drop budgets on system categories."""
         migrated = {}
         for cat, val in (raw or {}).items():
-            if isinstance(val, dict):
-                amt = float(val.get("amount", 0))
-                period = (val.get("period") or "monthly").lower()
-            else:
-                try:
-                    amt = float(val)
-                except Exception:
-                    amt = 0.0
-                period = "monthly"
-            migrated[cat] = {"amount": amt, "period": period}
+            if is_system_category(cat):
+                continue
+            migrated[cat] = budget_engine.normalize_budget(val)
         if migrated != raw:
             self.save_json(BUDGET_FILE, migrated)
         return migrated
@@ -765,75 +1263,121 @@ class FinanceApp(QWidget):
             self.save_json(ACCOUNTS_FILE, raw)
         return raw
 
-    def load_transactions(self) -> pd.DataFrame:
-        cols = ['Id', 'Date', 'Vendor', 'Amount', 'Type', 'Category', 'Account',
-            'AppliedToBalance', 'ExternalId', 'TransferGroup', 'CategorySource']
+    def load_transactions(self, keep=()) -> pd.DataFrame:
+        """
+        The months to keep in memory (see _wanted_months) plus keep (None: every month) when the
+        file can be paged by month, else the whole file. Sets the loaded months and the aggregates
+        standing in for the rest.
+        """
+        if self.store.open():
+            self._loaded = self._wanted_months() | (set(self.store.months) if keep is None else set(keep))
+            df = self.store.read_months(self._loaded)
+        else:
+            df = self._read_transactions_file()
+            self._loaded = set(row_months(df).tolist()) | self._wanted_months()
+        self._page_base = self.store.base(self._loaded)
+        return df
 
+    def _read_transactions_file(self) -> pd.DataFrame:
+        """Every row of the transactions file."""
         try:
             df = pd.read_csv(TRANSACTIONS_FILE, dtype=str)
 
         except FileNotFoundError:
-            df = pd.DataFrame(columns=cols)
-
-        # Ensure columns exist
-        for c in cols:
-            if c not in df.columns:
-                if c == 'Id':
-                    continue
-                if c == 'AppliedToBalance':
-                    df[c] = "False"
-                elif c == 'Amount':
-                    df[c] = "0"
-                else:
-                    df[c] = ""
-        # Id column
-        if "Id" not in df.columns or df["Id"].isna().all():
-            df["Id"] = ""
-            next_id = 1
-            for i in df.index:
-                df.at[i, "Id"] = str(next_id)
-                next_id += 1
+            df = pd.DataFrame(columns=TRANSACTION_COLUMNS)
+        return normalize_transactions(df)
 
+    def _in_memory_order(self, df: pd.DataFrame) -> pd.DataFrame:
+        """df read back from disk, rows self.df already holds in self.df's order and new rows after them."""
+        old = pd.Index(self.df["Id"].astype(str)) if "Id" in self.df.columns else pd.Index([])
+        if df.empty or old.empty or not old.is_unique:
+            return df
+        pos = old.get_indexer(df["Id"].astype(str))
+        pos = np.where(pos < 0, len(old) + np.arange(len(df)), pos)
+        return df.take(np.argsort(pos, kind="stable")).reset_index(drop=True)
 
+    # ---------------- Loaded months ----------------
+    def _wanted_months(self) -> set[int]:
+        """
+        Months self.df should hold: the most recent ones (Settings → Memory), the ranges the views
+        show, months with pending rows, and future-dated or dateless rows.
+        """
+        current = month_code(self.get_today())
+        keep = max(1, int(self.settings.get("resident_months", RESIDENT_MONTHS)))
+        wanted = set(range(current - keep + 1, current + 1)) | {DATELESS}
+        wanted |= {m for m in self.store.months if m > current}
+        wanted |= self.store.pending_months()
+        for months in self._views.values():
+            wanted |= months
+        return wanted
+
+    def _load_months(self, months) -> bool:
+        """Read the given months into self.df if they are not loaded yet. True when self.df changed."""
+        missing = set(months) - self._loaded
+        if not missing:
+            return False
+        self._loaded |= missing
+        on_disk = missing & set(self.store.months)
+        if not on_disk:
+            return False
+        rows = self.store.read_months(on_disk)
+        if not self.df.empty:
+            # A row already in memory (moved here by an edit, or put back by undo) keeps that version
+            rows = rows[~rows["Id"].astype(str).isin(self.df["Id"].astype(str))]
+        if not rows.empty:
+            self.df = pd.concat([self.df, rows], ignore_index=True) if not self.df.empty else rows.reset_index(drop=True)
+            self.history.note_loaded(rows)
+        self._paging_changed()
+        return True
 
-        # Dtypes and defaults
-        if not df.empty:
-            df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce').fillna(0.0)
-            # Type inference if missing
-            if "Type" in df.columns:
-                df['Type'] = df['Type'].replace("", pd.NA)
-            if "Type" not in df.columns or df['Type'].isna().any():
-                df['Type'] = df['Amount'].apply(lambda x: "Expense" if float(x) < 0 else "Income")
-            # Account default
-            if "Account" in df.columns:
-                df['Account'] = df['Account'].replace("", "Unassigned")
-            else:
-                df['Account'] = "Unassigned"
-            # Category default
-            if "Category" in df.columns:
-                df['Category'] = df['Category'].replace("", UNCATEGORIZED)
-            else:
-                df['Category'] = UNCATEGORIZED
-            # AppliedToBalance -> bool
-            df['AppliedToBalance'] = df['AppliedToBalance'].astype(str).str.strip().str.lower().isin(["true", "1", "yes"])
-        else:
-            df = pd.DataFrame(columns=cols)
-        
-        # Default empty categories to 'Uncategorized'
-        if "Category" in df.columns:
-            df['Category'] = df['Category'].fillna("").replace("", UNCATEGORIZED)
-        else:
-            df['Category'] = UNCATEGORIZED
+    def _load_all_months(self):
+        """Every month in self.df: for edits that rewrite the whole history (the undo step holds it all)."""
+        self._load_months(set(self.store.months))
 
-        # Ensure CategorySource exists
-        if "CategorySource" not in df.columns:
-            df["CategorySource"] = ""
+    def _paging_changed(self):
+        """self.df gained or lost whole months: new aggregates for the rest, and a new data version."""
+        self._page_base = self.store.base(self._loaded)
+        self.data_version += 1
+        self.ledger.rebuild(self.df, self._page_base["ledger"])
 
-        df = df[['Id', 'Date', 'Vendor', 'Amount', 'Type', 'Category', 'Account',
-         'AppliedToBalance', 'ExternalId', 'TransferGroup']]
+    def _sync_months(self):
+        """Load the months _wanted_months asks for and, outside an undo step, drop the ones no longer needed."""
+        if not self.store.paged:
+            return
+        wanted = self._wanted_months()
+        dropped = False
+        if not self.history.recording:
+            codes = row_months(self.df)
+            # Rows of months the file does not have yet are kept: they exist nowhere else
+            drop = self._loaded - wanted - (set(codes.tolist()) - set(self.store.months))
+            if drop:
+                self.df = self.df[~np.isin(codes, list(drop))].reset_index(drop=True)
+                self._loaded -= drop
+                dropped = True
+        if not self._load_months(wanted) and dropped:
+            self._paging_changed()
+
+    def show_months(self, view: str, months):
+        """Keep the given months loaded while view shows them (replacing what it showed before)."""
+        months = set(months)
+        if self._views.get(view) == months and self._loaded <= self._wanted_months():
+            return   # nothing to load, and nothing read in for a one-off lookup to drop
+        self._views[view] = months
+        self._sync_months()
+
+    def _load_window(self, mode: str | None):
+        """Months of a Transactions date window: the view's own when mode is None (kept loaded), else read once."""
+        start, end = self.compute_date_window(mode or self.txn_filter_dropdown.currentText())
+        if mode is None:
+            self.show_months("transactions", months_between(start, end))
+        else:
+            self._load_months(months_between(start, end))
 
-        return df
+    def load_date_range(self, start: datetime.date, end: datetime.date):
+        """Read the months from start to end into self.df (lookups outside the views, e.g. import duplicates)."""
+        self._load_months(months_between(start, end))
 
+    @perf.timed("save_transactions", rows=lambda self, _: len(self.df))
     def save_transactions(self):
         cols = ['Id', 'Date', 'Vendor', 'Amount', 'Type', 'Category', 'Account',
             'AppliedToBalance', 'ExternalId', 'TransferGroup', 'CategorySource']
@@ -841,12 +1385,16 @@ class FinanceApp(QWidget):
         for c in cols:
             if c not in self.df.columns:
                 self.df[c] = ""
+        # The file is written month by month: a month a row was added or moved to is read in first
+        self._load_months(set(row_months(self.df).tolist()))
         # Cast AppliedToBalance to string for CSV
-        df_out = self.df.copy()
+        df_out = self.df.copy(deep=False)   # copy-on-write: only the replaced column is new
         df_out['AppliedToBalance'] = df_out['AppliedToBalance'].map(lambda x: "True" if bool(x) else "False")
-        df_out[cols].to_csv(TRANSACTIONS_FILE, index=False)
+        self.store.write(df_out[cols], self._loaded)
+        self.data_version += 1
 
         # -------- Sprint 12: Auto-categorize engine --------
+    @perf.timed("_autocat_suggest", rows=lambda *_: 1)
     def _autocat_suggest(self, raw_vendor: str) -> str | None:
         if not raw_vendor or not self.settings.get("auto_categorize_enabled", True):
             return None
@@ -954,6 +1502,7 @@ class FinanceApp(QWidget):
             pass
 
 
+    @perf.timed("_autocat_apply_to_uncategorized", rows=lambda self, _: len(self.df))
     def _autocat_apply_to_uncategorized(self) -> int:
         """
         Auto-categorize all rows where Category is empty/Uncategorized.
@@ -1039,9 +1588,9 @@ class FinanceApp(QWidget):
 
         ids = self.df["Id"].astype(str).fillna("").str.strip()
 
-        # Find next numeric seed
+        # Find next numeric seed (above the Ids of months that are not loaded, too)
         numeric_ids = pd.to_numeric(ids, errors="coerce").dropna()
-        next_id = (int(numeric_ids.max()) + 1) if not numeric_ids.empty else 1
+        next_id = max(int(numeric_ids.max()) if not numeric_ids.empty else 0, self.store.max_id() or 0) + 1
 
         # Track seen Ids to avoid duplicates
         seen = set()
@@ -1055,9 +1604,11 @@ class FinanceApp(QWidget):
                 new_ids.append(raw)
                 seen.add(raw)
 
+        changed = new_ids != self.df["Id"].tolist()
         self.df["Id"] = new_ids
 
-        if save:
+        # Only rewrite the file when an Id was actually assigned (keeps startup from touching the CSV)
+        if save and changed:
             self.save_transactions()
 
 
@@ -1072,16 +1623,67 @@ class FinanceApp(QWidget):
 
     # ---------------- Budget math ----------------
     def monthly_equivalent(self, amount: float, period: str, today: datetime.date) -> float:
-        period = (period or "monthly").lower()
-        dim = (end_of_month(today) - start_of_month(today)).days + 1
-        if period == "monthly":
-            return float(amount)
-        elif period == "weekly":
-            return float(amount) * (dim / 7.0)
-        elif period == "daily":
-            return float(amount) * dim
-        else:
-            return float(amount)
+        return budget_engine.monthly_equivalent(amount, period, today)
+
+    def snapshot(self) -> TransactionSnapshot:
+        """Immutable view of self.df at the current data version, shared by every reader until the next save."""
+        snap = self._snapshot
+        if snap is None or snap.version != self.data_version or snap.source is not self.df:
+            snap = self._snapshot = TransactionSnapshot(self.df, self.data_version)
+        return snap
+
+    def search_columns(self) -> list[tuple]:
+        """(codes, value ids) of the searched columns in the current snapshot; new values are indexed here."""
+        snap = self.snapshot()
+        if self._search_snapshot is not snap:
+            self._search_columns = [(codes, self.search_index.value_ids(values))
+                                    for codes, values in (snap.factorized(c) for c in SEARCH_COLUMNS if c in snap.columns)]
+            self._search_snapshot = snap
+        return self._search_columns
+
+    def spend_index(self) -> budget_engine.SpendIndex:
+        """Per-category spend index over self.df, rebuilt only when the data version changes."""
+        if self._spend_index is None or self._spend_index_version != self.data_version:
+            self._spend_index = budget_engine.SpendIndex.from_frame(self.df, self._page_base["spend"])
+            self._spend_index_version = self.data_version
+        return self._spend_index
+
+    def budget_engine(self) -> budget_engine.BudgetEngine:
+        return budget_engine.BudgetEngine(self.budgets, self.spend_index())
+
+    # ---------------- Monthly rollups ----------------
+    def _transactions_fingerprint(self):
+        try:
+            st = os.stat(TRANSACTIONS_FILE)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def load_rollups(self) -> MonthlyRollup:
+        """Saved month tables when they match the transactions file on disk, else an empty rollup to sync."""
+        saved = self.load_json(ROLLUPS_FILE, default={})
+        fp = self._transactions_fingerprint()
+        if fp is not None and saved.get("source") == fp:
+            try:
+                rollup = MonthlyRollup.from_json(saved.get("tables", {}))
+                self._rollups_version = self.data_version
+                return rollup
+            except Exception:
+                pass
+        return MonthlyRollup()
+
+    def monthly_rollups(self, need_rows: bool = False) -> MonthlyRollup:
+        """
+        Month-level income/expense tables, synced with self.df when the data version changed.
+        need_rows: a query will touch a partial month, so per-row state must be loaded too.
+        """
+        if self._rollups_version != self.data_version or (need_rows and not self.rollups.has_rows):
+            self.rollups.sync(self.df, self._page_base["tables"])
+            self._rollups_version = self.data_version
+            fp = self._transactions_fingerprint()
+            if fp is not None:
+                self.save_json(ROLLUPS_FILE, {"source": fp, "tables": self.rollups.to_json()})
+        return self.rollups
 
     # ---------------- Transactions Tab ----------------
     def init_transactions_tab(self):
@@ -1117,28 +1719,34 @@ class FinanceApp(QWidget):
         self.txn_filter_from_picker.hide()
         self.txn_filter_to_picker.hide()
 
+        filter_bar.addSpacing(20)
+        filter_bar.addWidget(QLabel("Search:"))
+        self.txn_search_input = QLineEdit()
+        self.txn_search_input.setPlaceholderText("Vendor, category or account")
+        self.txn_search_input.setClearButtonEnabled(True)
+        filter_bar.addWidget(self.txn_search_input)
+        self.txn_filters_button = QPushButton("Filters…")
+        filter_bar.addWidget(self.txn_filters_button)
+        # Refilter once typing pauses, not on every keystroke
+        self.txn_search_timer = QTimer(self)
+        self.txn_search_timer.setSingleShot(True)
+        self.txn_search_timer.setInterval(TXN_SEARCH_DELAY_MS)
+
         filter_bar.addSpacing(20)
         filter_bar.addWidget(QLabel("Sort by:"))
         self.txn_sort_dropdown = QComboBox()
-        self.txn_sort_dropdown.addItems([
-            "Date: Newest→Oldest",
-            "Date: Oldest→Newest",
-            "Amount: High→Low",
-            "Amount: Low→High",
-            "Category: A→Z",
-            "Category: Z→A",
-            "Vendor: A→Z",
-            "Vendor: Z→A",
-            "Account: A→Z",
-            "Account: Z→A"
-        ])
+        self.txn_sort_dropdown.addItems(TXN_SORT_MODES)
         self.txn_sort_dropdown.setCurrentText(self.txn_sort_mode)
         filter_bar.addWidget(self.txn_sort_dropdown)
 
         layout.addLayout(filter_bar)
 
-        # ---- Table
-        self.table = QTableWidget()
+        # ---- Table (rows paged in from the snapshot as you scroll, see transactions_model)
+        self.table = QTableView()
+        self.txn_model = TransactionsTableModel(self.table)
+        self.table.setModel(self.txn_model)
+        # Size columns from a sample of rows: measuring every loaded cell dominates a refresh
+        self.table.horizontalHeader().setResizeContentsPrecision(100)
         # Make selection operate on full rows (so Edit/Delete can find the right Id)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
@@ -1152,6 +1760,7 @@ class FinanceApp(QWidget):
         self.delete_button = QPushButton("Delete")
         self.clear_tx_button = QPushButton("Clear All")  # NEW Sprint 6
         self.mark_transfer_button = QPushButton("Mark Transfer") # Sprint 10
+        self.find_transfers_button = QPushButton("Find Transfers…")
         self.run_autocat_button = QPushButton("Auto-Categorize Now")  # Sprint 12 test button
         # respect settings default visibility
         try:
@@ -1170,6 +1779,7 @@ class FinanceApp(QWidget):
         btn_row.addWidget(self.clear_tx_button)  # NEW
         btn_row.addSpacing(8)
         btn_row.addWidget(self.mark_transfer_button)  # NEW sprint 10
+        btn_row.addWidget(self.find_transfers_button)
         btn_row.addStretch()
         btn_row.addWidget(self.run_autocat_button)  # Sprint 12 test button
 
@@ -1184,6 +1794,9 @@ class FinanceApp(QWidget):
         self.txn_filter_from_picker.dateChanged.connect(self.on_txn_filter_changed)
         self.txn_filter_to_picker.dateChanged.connect(self.on_txn_filter_changed)
         self.txn_sort_dropdown.currentTextChanged.connect(self.on_txn_sort_changed)
+        self.txn_search_input.textChanged.connect(self.txn_search_timer.start)
+        self.txn_search_timer.timeout.connect(self.on_txn_search_changed)
+        self.txn_filters_button.clicked.connect(self.open_txn_filters)
 
         self.import_button.clicked.connect(self.open_import_wizard)      # Sprint 14
         self.add_button.clicked.connect(self.add_transaction)
@@ -1191,6 +1804,7 @@ class FinanceApp(QWidget):
         self.delete_button.clicked.connect(self._delete_selected_transaction)
         self.clear_tx_button.clicked.connect(self.clear_all_transactions)
         self.mark_transfer_button.clicked.connect(self._mark_selected_as_transfer) # Sprint 10
+        self.find_transfers_button.clicked.connect(self.find_transfers)
         self.run_autocat_button.clicked.connect(self._run_autocat_now) # Sprint 12
 
 
@@ -1222,6 +1836,25 @@ class FinanceApp(QWidget):
         self.update_table()
         self.update_summary()
 
+    def on_txn_search_changed(self):
+        self.update_table()
+        self.update_summary()
+
+    def open_txn_filters(self):
+        snap = self.snapshot()
+        values = {}
+        for key, column in filter_engine.VALUE_FILTERS.items():
+            factorized = snap.factorized(column)
+            values[key] = list(factorized[1]) if factorized else []
+        dlg = TransactionFilterDialog(values, self.txn_filters, self)
+        if dlg.exec() != QDialog.Accepted:
+            return
+        self.txn_filters = dlg.getSpec()
+        n = filter_engine.active_count(self.txn_filters)
+        self.txn_filters_button.setText(f"Filters ({n})…" if n else "Filters…")
+        self.update_table()
+        self.update_summary()
+
     def on_txn_sort_changed(self, *_):
         self.txn_sort_mode = self.txn_sort_dropdown.currentText()
         self.update_table()
@@ -1250,96 +1883,94 @@ class FinanceApp(QWidget):
             start = self.txn_filter_from_picker.date().toPython()
             end = self.txn_filter_to_picker.date().toPython()
         else:
-            # default: full span
-            if self.df.empty:
-                start = today
-                end = today
-            else:
+            # default: full span, months that are not loaded included
+            days = []
+            if not self.df.empty:
                 dts = pd.to_datetime(self.df['Date'], errors='coerce').dropna()
-                start = dts.min().date()
-                end = dts.max().date()
+                if not dts.empty:
+                    days += [dts.min().date(), dts.max().date()]
+            span = self.store.span()
+            if span is not None:
+                first, last = (datetime.date(m // 12, m % 12 + 1, 1) for m in span)
+                days += [first, end_of_month(last)]
+            start, end = (min(days), max(days)) if days else (today, today)
         return start, end
 
-    def get_filtered_transactions(self) -> pd.DataFrame:
-        if self.df.empty:
-            return self.df.copy()
-        df = self.df.copy()
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        mode = self.txn_filter_dropdown.currentText()
+    def get_filtered_transactions(self, mode: str | None = None, query: str | None = None,
+                                  filters: dict | None = None) -> pd.DataFrame:
+        """
+        Rows in the date window of mode that pass the filters spec (see filter_engine) and match the
+        search query. Each defaults to the Transactions tab's current control.
+        """
+        self._load_window(mode)
+        snap = self.snapshot()
+        if snap.empty:
+            return snap.frame()
+        mask = self._transactions_mask(snap, mode, query, filters)
+        return snap.parsed().loc[mask].reset_index(drop=True)
+
+    def get_sorted_transactions(self, mode: str | None = None, query: str | None = None,
+                                filters: dict | None = None) -> pd.DataFrame:
+        """
+        get_filtered_transactions in the current sort mode: the snapshot's presorted permutation
+        for the mode, narrowed to the rows passing the filters (same order as sort_transactions_df).
+        """
+        self._load_window(mode)
+        snap = self.snapshot()
+        if snap.empty:
+            return snap.frame()
+        return snap.parsed().take(self._sorted_positions(snap, mode, query, filters)).reset_index(drop=True)
+
+    def _sorted_positions(self, snap: TransactionSnapshot, mode=None, query=None, filters=None) -> np.ndarray:
+        """Positions in snap of the filtered rows, in the current sort mode."""
+        mask = self._transactions_mask(snap, mode, query, filters)
+        column, descending = TXN_SORT_KEYS.get(self.txn_sort_mode, (None, False))
+        if column is None or column not in snap.columns:
+            return np.flatnonzero(mask)
+        order = snap.sort_order(column, descending)
+        return order[mask[order]]
+
+    def _transactions_mask(self, snap: TransactionSnapshot, mode, query, filters) -> np.ndarray:
+        if mode is None:
+            mode = self.txn_filter_dropdown.currentText()
+        if query is None:
+            query = self.txn_search_input.text()
+        if filters is None:
+            filters = self.txn_filters
         start, end = self.compute_date_window(mode)
-        mask = (df['Date'] >= pd.Timestamp(start)) & (df['Date'] <= pd.Timestamp(end))
-        return df.loc[mask].reset_index(drop=True)
+        mask = self.filter_engine.mask(snap, filters, start, end)
+        if self.search_index.terms(query):
+            matches = self.search_index.mask(query, self.search_columns())
+            if matches is not None:
+                mask = mask & matches
+        return mask
 
     def sort_transactions_df(self, df: pd.DataFrame) -> pd.DataFrame:
         if df.empty:
             return df
-        mode = self.txn_sort_mode
-        df = df.copy()
+        df = df.copy(deep=False)
         df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
         df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
-        key_lower = lambda s: s.astype(str).str.lower()
-
-        if mode == "Date: Newest→Oldest":
-            return df.sort_values('Date', ascending=False, na_position='last')
-        if mode == "Date: Oldest→Newest":
-            return df.sort_values('Date', ascending=True, na_position='last')
-        if mode == "Amount: High→Low":
-            return df.sort_values('Amount', ascending=False, na_position='last')
-        if mode == "Amount: Low→High":
-            return df.sort_values('Amount', ascending=True, na_position='last')
-        if mode == "Category: A→Z":
-            return df.sort_values('Category', ascending=True, na_position='last', key=key_lower)
-        if mode == "Category: Z→A":
-            return df.sort_values('Category', ascending=False, na_position='last', key=key_lower)
-        if mode == "Vendor: A→Z":
-            return df.sort_values('Vendor', ascending=True, na_position='last', key=key_lower)
-        if mode == "Vendor: Z→A":
-            return df.sort_values('Vendor', ascending=False, na_position='last', key=key_lower)
-        if mode == "Account: A→Z":
-            return df.sort_values('Account', ascending=True, na_position='last', key=key_lower)
-        if mode == "Account: Z→A":
-            return df.sort_values('Account', ascending=False, na_position='last', key=key_lower)
-        return df
+        column, descending = TXN_SORT_KEYS.get(self.txn_sort_mode, (None, False))
+        if column is None or column not in df.columns:
+            return df
+        # Same ranks/stable order as the snapshot permutations behind get_sorted_transactions
+        return df.take(sort_permutation(sort_column_ranks(df, column), descending))
 
+    @perf.timed("update_table", rows=lambda self, _: self.txn_model.total_rows())
     def update_table(self):
-        filtered_df = self.get_filtered_transactions()
-        sorted_df = self.sort_transactions_df(filtered_df)
-
-        display_df = sorted_df.copy()
-        if not display_df.empty:
-            display_df['Date'] = pd.to_datetime(display_df['Date'], errors='coerce').dt.strftime('%Y-%m-%d')
-
-        self.table.setRowCount(display_df.shape[0])
-        self.table.setColumnCount(display_df.shape[1])
-        self.table.setHorizontalHeaderLabels(display_df.columns)
-
-        for r in range(display_df.shape[0]):
-            for c in range(display_df.shape[1]):
-                col = display_df.columns[c]
-                val = display_df.iloc[r, c]
-                if col == "Amount" and pd.notna(val):
-                    item = QTableWidgetItem(fmt_money(val))
-                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                else:
-                    item = QTableWidgetItem(str(val))
-                    # Sprint 12: if this is the Category column and source is Auto, italicize + tooltip
-                    if col == "Category":
-                        try:
-                            # Use the underlying sorted_df to read CategorySource for this row
-                            src = str(sorted_df.iloc[r].get("CategorySource", "") or "")
-                            if src.lower() == "auto":
-                                font = item.font()
-                                font.setItalic(True)
-                                item.setFont(font)
-                                item.setToolTip("Auto-categorized")
-                        except Exception:
-                            pass
-                self.table.setItem(r, c, item)
+        # The model only keeps row positions into the snapshot; cells are formatted as they are painted
+        self._load_window(None)
+        snap = self.snapshot()
+        if snap.empty:
+            self.txn_model.set_rows(snap.frame(), np.empty(0, dtype=np.int64))
+        else:
+            self.txn_model.set_rows(snap.parsed(), self._sorted_positions(snap))
+        columns = self.txn_model.columns()
 
         # Hide Id column
-        if "Id" in display_df.columns:
-            id_col = list(display_df.columns).index("Id")
-            self.table.setColumnHidden(id_col, True)
+        if "Id" in columns:
+            self.table.setColumnHidden(columns.index("Id"), True)
 
         self.table.resizeColumnsToContents()
         # Sprint 11: hide advanced columns unless turned on in Settings
@@ -1353,14 +1984,7 @@ class FinanceApp(QWidget):
         except Exception:
             pass
 
-        # Map header -> index from the live table
-        header_to_idx = {}
-        try:
-            for c in range(self.table.columnCount()):
-                header = self.table.horizontalHeaderItem(c).text()
-                header_to_idx[header] = c
-        except Exception:
-            return
+        header_to_idx = {name: c for c, name in enumerate(self.txn_model.columns())}
 
         for name in ["AppliedToBalance", "ExternalId", "TransferGroup", "CategorySource"]:
             if name in header_to_idx:
@@ -1383,15 +2007,19 @@ class FinanceApp(QWidget):
         self.summary_label.setText("\n".join(lines))
 
     def _next_tx_id(self):
-        if self.df.empty or "Id" not in self.df.columns:
-            return 1
-        ids = pd.to_numeric(self.df["Id"], errors="coerce").dropna()
-        return int(ids.max()) + 1 if not ids.empty else 1
+        # Months that are not loaded count too: the month index keeps each month's largest Id
+        top = self.store.max_id() or 0
+        if not self.df.empty and "Id" in self.df.columns:
+            ids = pd.to_numeric(self.df["Id"], errors="coerce").dropna()
+            if not ids.empty:
+                top = max(top, int(ids.max()))
+        return top + 1
 
 
     def _account_names(self):
         return [a["name"] for a in self.accounts] if self.accounts else ["Unassigned"]
 
+    @undoable("Add transaction")
     def add_transaction(self):
         dialog = AddTransactionDialog(
             self,
@@ -1438,6 +2066,7 @@ class FinanceApp(QWidget):
         }
 
         self.df.loc[len(self.df)] = new_row
+        self._ledger_sync_row(len(self.df) - 1)
         self.save_and_refresh()
     
     def refresh_all(self):
@@ -1467,21 +2096,17 @@ class FinanceApp(QWidget):
         First, try to read the hidden 'Id' column directly; if not found, fall back to
         mapping the selected row index back to the filtered+sorted DataFrame.
         """
-        row = self.table.currentRow()
+        row = self.table.currentIndex().row()
         if row < 0:
             return None
 
         # Preferred: read hidden Id column directly
-        for c in range(self.table.columnCount()):
-            header_item = self.table.horizontalHeaderItem(c)
-            if header_item and header_item.text() == "Id":
-                item = self.table.item(row, c)
-                if item and item.text():
-                    return item.text()
-                break
+        row_id = self._table_row_id(row)
+        if row_id:
+            return row_id
 
         # Fallback: map row -> filtered+sorted df and read its Id
-        filtered_df = self.sort_transactions_df(self.get_filtered_transactions())
+        filtered_df = self.get_sorted_transactions()
         if 0 <= row < len(filtered_df) and "Id" in filtered_df.columns:
             return str(filtered_df.iloc[row]["Id"])
 
@@ -1519,6 +2144,7 @@ class FinanceApp(QWidget):
         elif action == a_tx:
             self._mark_selected_as_transfer()  # NEW sprint 10
 
+    @undoable("Auto-categorize")
     def _run_autocat_now(self):
         """Manually trigger auto-categorization/backfill over uncategorized rows."""
         try:
@@ -1536,31 +2162,32 @@ class FinanceApp(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Auto-Categorize", f"Could not complete auto-categorization:\n{e}")
 
+    @undoable("Mark as transfer")
     def _mark_selected_as_transfer(self):
         # Gather exactly two selected rows
-        rows = sorted({idx.row() for idx in self.table.selectedIndexes()})
+        rows = sorted({idx.row() for idx in self.table.selectionModel().selectedIndexes()})
         if len(rows) != 2:
             QMessageBox.warning(self, "Mark Transfer", "Please select exactly two rows to mark as a transfer.")
             return
 
-        # Helper: read a display row into fields by column name
-        display_df = self.sort_transactions_df(self.get_filtered_transactions())
-        def row_to_obj(r):
-            # Map visible row -> original Id (your table shows all columns, so we can map by position)
-            row_id = str(display_df.iloc[r]["Id"])
-            amt = float(display_df.iloc[r]["Amount"])
+        # Map table rows -> df rows through the hidden Id column (no need to rebuild the display frame)
+        ids = [self._table_row_id(r) for r in rows]
+        positions = pd.Index(self.df["Id"].astype(str)).get_indexer(ids) if None not in ids else [-1]
+        if min(positions) < 0:
+            QMessageBox.warning(self, "Mark Transfer", "Could not locate the selected transactions.")
+            return
+
+        def row_to_obj(pos):
+            rec = self.df.iloc[pos]
             return {
-                "Id": row_id,
-                "Date": str(display_df.iloc[r]["Date"]),
-                "Vendor": str(display_df.iloc[r]["Vendor"]),
-                "Amount": amt,
-                "Type": str(display_df.iloc[r]["Type"]),
-                "Category": str(display_df.iloc[r]["Category"]),
-                "Account": str(display_df.iloc[r]["Account"]),
+                "Id": str(rec["Id"]),
+                "Date": str(rec["Date"]),
+                "Amount": float(rec["Amount"]),
+                "Account": str(rec["Account"]),
             }
 
-        a = row_to_obj(rows[0])
-        b = row_to_obj(rows[1])
+        a = row_to_obj(positions[0])
+        b = row_to_obj(positions[1])
 
         # Must be different accounts
         if a["Account"] == b["Account"]:
@@ -1586,19 +2213,7 @@ class FinanceApp(QWidget):
             pass
 
         # Link via a shared TransferGroup id
-        import uuid
-        tg = str(uuid.uuid4())
-
-        # Update backing df by Id
-        for row_id in (a["Id"], b["Id"]):
-            idx = self.df.index[self.df["Id"].astype(str) == str(row_id)]
-            if len(idx) == 1:
-                i = idx[0]
-                self.df.at[i, "Type"] = "Transfer"
-                self.df.at[i, "Category"] = "Transfer"
-                if "TransferGroup" not in self.df.columns:
-                    self.df["TransferGroup"] = ""
-                self.df.at[i, "TransferGroup"] = tg
+        transfers.link_transfer_pairs(self.df, [(a["Id"], b["Id"])])
 
         # Persist & refresh
         self.save_transactions()
@@ -1606,13 +2221,38 @@ class FinanceApp(QWidget):
         self.update_summary()
         QMessageBox.information(self, "Transfer", "The two rows have been linked as a transfer.")
     
+    def _table_row_id(self, row: int) -> str | None:
+        """Id of a Transactions table row (the hidden Id column)."""
+        return self.txn_model.row_id(row)
+
+    @undoable("Link transfers")
+    def find_transfers(self):
+        """Detect likely transfer pairs across all transactions and bulk-link the ones the user keeps."""
+        if self.df.empty:
+            QMessageBox.information(self, "Find Transfers", "There are no transactions to search.")
+            return
+        max_days = int(self.settings.get("transfer_match_days", transfers.DEFAULT_MAX_DAYS))
+        dialog = TransferMatchDialog(self.df, max_days=max_days, parent=self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        if dialog.days_spin.value() != max_days:
+            self.settings["transfer_match_days"] = dialog.days_spin.value()
+            self.save_json(SETTINGS_FILE, self.settings)
+        linked = transfers.link_transfer_pairs(self.df, dialog.selected_pairs())
+        if not linked:
+            QMessageBox.information(self, "Find Transfers", "No transfers were linked.")
+            return
+        self.save_and_refresh()
+        QMessageBox.information(self, "Find Transfers", f"Linked {linked} transfer pair(s).")
+
+    @undoable("Clear all transactions")
     def clear_all_transactions(self):
         if self.df.empty:
             QMessageBox.information(self, "Clear Transactions", "There are no transactions to clear.")
             return
         reply = QMessageBox.question(
             self, "Clear ALL Transactions",
-            "This will delete ALL transactions and cannot be undone.\n\nProceed?",
+            "This will delete ALL transactions (Edit → Undo restores them).\n\nProceed?",
             QMessageBox.Yes | QMessageBox.No
         )
         if reply != QMessageBox.Yes:
@@ -1622,10 +2262,13 @@ class FinanceApp(QWidget):
         cols = ['Id', 'Date', 'Vendor', 'Amount', 'Type', 'Category', 'Account',
             'AppliedToBalance', 'ExternalId', 'TransferGroup', 'CategorySource']
 
+        self._load_all_months()   # the undo step must hold the rows of every month
         self.df = pd.DataFrame(columns=cols)
+        self.ledger.rebuild(self.df, self._page_base["ledger"])   # account balances are left as they are
         self.save_and_refresh()
         QMessageBox.information(self, "Transactions", "All transactions cleared.")
 
+    @undoable("Edit transaction")
     def _edit_transaction_by_id(self, row_id: str):
         matches = self.df.index[self.df['Id'].astype(str) == str(row_id)]
         if len(matches) == 0:
@@ -1666,7 +2309,9 @@ class FinanceApp(QWidget):
         self.df.at[i, 'Type'] = t
         self.df.at[i, 'Category'] = new['Category']
         self.df.at[i, 'Account'] = new['Account']
-       
+        # An edited applied row moves its account balance(s) by the difference
+        self._ledger_sync_row(i)
+
         # Mark provenance for manual edit
         if "CategorySource" not in self.df.columns:
             self.df["CategorySource"] = ""
@@ -1691,6 +2336,7 @@ class FinanceApp(QWidget):
         # Keep AppliedToBalance as-is for edited row
         self.save_and_refresh()
 
+    @undoable("Delete transaction")
     def _delete_transaction_by_id(self, row_id: str):
         matches = self.df.index[self.df['Id'].astype(str) == str(row_id)]
         if len(matches) == 0:
@@ -1700,6 +2346,7 @@ class FinanceApp(QWidget):
         reply = QMessageBox.question(self, "Delete", "Delete this transaction?", QMessageBox.Yes | QMessageBox.No)
         if reply != QMessageBox.Yes:
             return
+        self._apply_balance_deltas(self.ledger.remove_row(self.df.at[i, 'Id']))
         self.df = self.df.drop(i).reset_index(drop=True)
         self.save_and_refresh()
 
@@ -1721,14 +2368,103 @@ class FinanceApp(QWidget):
         self.update_dashboard_tab()
         self.refresh_reports()
 
+    # ---------------- Undo / Redo ----------------
+    def _undo_documents(self) -> dict:
+        return {name: getattr(self, name) for name in UNDO_DOCUMENTS}
+
+    def begin_undo_step(self, label: str):
+        self.history.begin(label, self.df, self._undo_documents())
+
+    def end_undo_step(self):
+        try:
+            step = self.history.end(self.df, self._undo_documents())
+            if step is not None and step["rows"] is not None:
+                step["months"] = self._step_months(step["rows"])
+        except Exception:
+            # A change the log could not record: undoing past it would restore the wrong rows
+            self.history.clear()
+        self._update_undo_actions()
+        if not self.history.recording:
+            self._sync_months()   # months read in for the step (bulk edits, restore) are dropped again
+
+    def _step_months(self, changes: dict) -> set[int]:
+        """Months of the rows a step touches: undo/redo reads them in first if they were dropped since."""
+        if "replace" in changes:
+            return set()
+        frames = [changes["old"], changes["new"]]
+        old_values = changes["old_values"]
+        if len(old_values):
+            frames.append(self.df[self.df["Id"].astype(str).isin(old_values.index)])
+            frames.append(old_values)
+        return set().union(*(row_months(f).tolist() for f in frames if len(f) and "Date" in f.columns))
+
+    def _update_undo_actions(self):
+        if not hasattr(self, "act_undo"):
+            return
+        undo, redo = self.history.undo_label(), self.history.redo_label()
+        self.act_undo.setText(f"Undo {undo}" if undo else "Undo")
+        self.act_undo.setEnabled(undo is not None)
+        self.act_redo.setText(f"Redo {redo}" if redo else "Redo")
+        self.act_redo.setEnabled(redo is not None)
+
+    def undo(self):
+        self._apply_history_step(self.history.undo(), undo=True)
+
+    def redo(self):
+        self._apply_history_step(self.history.redo(), undo=False)
+
+    def _apply_history_step(self, step: dict | None, undo: bool):
+        """Apply an undo step backwards or forwards, save what it touched and refresh the views."""
+        if step is None:
+            return
+        rows = step["rows"]
+        if rows is not None:
+            self._load_months(step.get("months", ()))
+            self.df = apply_frame_changes(self.df, rows, undo=undo)
+            if "replace" in rows:
+                # A whole frame: its months are loaded, the others are read from the file again
+                self._loaded = set(row_months(self.df).tolist()) | (self._loaded - set(self.store.months))
+                self._page_base = self.store.base(self._loaded)
+            self._ledger_resync(touched_keys(rows))
+            self.save_transactions()
+        for name, changes in step["docs"].items():
+            setattr(self, name, apply_doc_changes(getattr(self, name), changes, undo=undo))
+            self.save_json(UNDO_DOCUMENTS[name], getattr(self, name))
+        self._update_undo_actions()
+        # No save_and_refresh/refresh_all: their auto-categorize pass would edit the restored rows again
+        self.update_table()
+        self.update_summary()
+        self.update_budgets_table()
+        self.update_accounts_table()
+        self.update_categories_table()
+        self.update_dashboard_tab()
+        self.refresh_reports()
+
+    def _ledger_resync(self, ids: set[str]):
+        """
+        Bring the running ledger back in line after undo/redo (ids: rows the step touched; empty means
+        all). Account balances are restored with the accounts document, so ledger deltas are not applied.
+        """
+        if not ids:
+            self.ledger.rebuild(self.df, self._page_base["ledger"])
+            return
+        keys = list(ids)
+        where = pd.Index(self.df["Id"].astype(str)).get_indexer(keys)
+        for tx_id, pos in zip(keys, where):
+            if pos < 0:
+                self.ledger.remove_row(tx_id)
+            else:
+                row = self.df.iloc[pos]
+                self.ledger.set_row(row['Id'], row['Account'], row['Amount'], row['AppliedToBalance'], row['Date'])
+
 
     # ---------------- Budgets Tab ----------------
     def init_budgets_tab(self):
         layout = QVBoxLayout()
 
         self.budget_table = QTableWidget()
-        self.budget_table.setColumnCount(4)
-        self.budget_table.setHorizontalHeaderLabels(["Category", "Period", "Entered Amount", "Monthly Equivalent"])
+        self.budget_table.setColumnCount(len(BUDGET_TABLE_HEADERS))
+        self.budget_table.setHorizontalHeaderLabels(BUDGET_TABLE_HEADERS)
         layout.addWidget(self.budget_table)
 
         row_btns = QHBoxLayout()
@@ -1748,67 +2484,40 @@ class FinanceApp(QWidget):
         self.budget_tab.setLayout(layout)
         self.update_budgets_table()
 
-    def _all_categories_for_budget(self):
-        """
-        Only show categories that actually have a budget > 0 set.
-        (Hides zero/empty budgets and categories without a budget.)
-        """
-        out = []
-        for cat, data in (self.budgets or {}).items():
-            amt = 0.0
-            if isinstance(data, dict):
-                try:
-                    amt = float(data.get("amount", 0) or 0)
-                except Exception:
-                    amt = 0.0
-            # keep only positive budgets
-            if amt > 0:
-                out.append(cat)
-        return sorted(set(out))
-
-
     def update_budgets_table(self):
-        # One-time cleanup: remove budgets for system categories (e.g., Transfer)
-        if any(is_system_category(k) for k in (self.budgets or {}).keys()):
-            self.budgets = {k: v for k, v in self.budgets.items() if not is_system_category(k)}
-            self.save_json(BUDGET_FILE, self.budgets)
+        if not self._tab_ready("Budgets"):
+            return
 
-        all_cats = self._all_categories_for_budget()
         today = self.get_today()
+        statuses = self.budget_engine().statuses(today)
+
+        self.budget_table.setRowCount(len(statuses))
+        for r, st in enumerate(statuses):
+            monthly_eq = self.monthly_equivalent(st["amount"], st["period"], today)
+            window = f"{st['start']:%Y-%m-%d} → {st['end']:%Y-%m-%d}"
+            if st["mode"] == "carryover" and abs(st["carry"]) > 0.005:
+                window += f"  (carry {fmt_money(st['carry'])})"
+            cells = [
+                (st["category"], False),
+                (st["period"].capitalize(), False),
+                (BUDGET_MODE_LABELS.get(st["mode"], st["mode"]), False),
+                (fmt_money(st["amount"]), True),
+                (fmt_money(monthly_eq), True),
+                (window, False),
+                (fmt_money(st["spent"]), True),
+                (fmt_money(st["remaining"]), True),
+            ]
+            for c, (text, right) in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if right:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.budget_table.setItem(r, c, item)
+            if st["remaining"] < 0:
+                self.budget_table.item(r, 7).setForeground(Qt.red)
 
-        self.budget_table.setRowCount(len(all_cats))
-        for r, cat in enumerate(all_cats):
-            self.budget_table.setItem(r, 0, QTableWidgetItem(cat))
-            bdata = self.budgets.get(cat)
-            if isinstance(bdata, dict):
-                try:
-                    amount = float(bdata.get("amount", 0) or 0)
-                except Exception:
-                    amount = 0.0
-                if amount <= 0:
-                    # skip rendering this row defensively
-                    continue
-
-                period_code = (bdata.get("period") or "monthly").lower()
-                period = period_code.capitalize()
-                monthly_eq = self.monthly_equivalent(float(amount), period_code, today)
-
-                self.budget_table.setItem(r, 1, QTableWidgetItem(period))
-                amt_item = QTableWidgetItem(fmt_money(amount))
-                amt_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                self.budget_table.setItem(r, 2, amt_item)
-
-                me_item = QTableWidgetItem(fmt_money(monthly_eq))
-                me_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                self.budget_table.setItem(r, 3, me_item)
-            else:
-                # (Shouldn’t happen with new _all_categories_for_budget, but safe.)
-                self.budget_table.setItem(r, 1, QTableWidgetItem("—"))
-                self.budget_table.setItem(r, 2, QTableWidgetItem("None"))
-                self.budget_table.setItem(r, 3, QTableWidgetItem("—"))
-
-            self.budget_table.resizeColumnsToContents()
+        self.budget_table.resizeColumnsToContents()
 
+    @undoable("Edit budget")
     def add_edit_budget(self):
         cats_expense = self.get_category_names_by_type("Expense")
         dialog = BudgetDialog(cats_expense, self.budgets, self)
@@ -1827,11 +2536,19 @@ class FinanceApp(QWidget):
             QMessageBox.warning(self, "Input Error", "Budget amount must be a number.")
             return
         period = data["Period"].lower()
-        self.budgets[cat] = {"amount": amt, "period": period}
+        mode = data["Mode"]
+        entry = {"amount": amt, "period": period, "mode": mode}
+        if mode == "carryover":
+            # Carry-over counts from the first period it was enabled in (kept across later edits)
+            prev = self.budgets.get(cat) or {}
+            entry["since"] = prev.get("since") if prev.get("mode") == "carryover" and prev.get("since") \
+                else self.get_today().strftime("%Y-%m-%d")
+        self.budgets[cat] = entry
         self.save_json(BUDGET_FILE, self.budgets)
         self.update_budgets_table()
         self.update_dashboard_tab()
 
+    @undoable("Remove budget")
     def remove_budget(self):
         row = self.budget_table.currentRow()
         if row < 0:
@@ -1849,13 +2566,14 @@ class FinanceApp(QWidget):
         self.update_budgets_table()
         self.update_dashboard_tab()
 
+    @undoable("Clear all budgets")
     def clear_all_budgets(self):
         if not self.budgets:
             QMessageBox.information(self, "Clear Budgets", "There are no budgets to clear.")
             return
         reply = QMessageBox.question(
             self, "Clear ALL Budgets",
-            "This will remove ALL budgets and cannot be undone.\n\nProceed?",
+            "This will remove ALL budgets (Edit → Undo restores them).\n\nProceed?",
             QMessageBox.Yes | QMessageBox.No
         )
         if reply != QMessageBox.Yes:
@@ -1906,12 +2624,15 @@ class FinanceApp(QWidget):
         self.update_accounts_table()
 
     def update_accounts_table(self):
+        if not self._tab_ready("Accounts"):
+            return
         self.accounts_table.setRowCount(len(self.accounts))
         for r, acct in enumerate(self.accounts):
             self.accounts_table.setItem(r, 0, QTableWidgetItem(acct["name"]))
             self.accounts_table.setItem(r, 1, QTableWidgetItem(fmt_money(acct["balance"])))
         self.accounts_table.resizeColumnsToContents()
 
+    @undoable("Add account")
     def add_account(self):
         dialog = AccountDialog(parent=self)
         if dialog.exec() != QDialog.Accepted:
@@ -1931,6 +2652,7 @@ class FinanceApp(QWidget):
         self.update_accounts_table()
         self.update_dashboard_tab()
 
+    @undoable("Edit account")
     def edit_account(self):
         row = self.accounts_table.currentRow()
         if row < 0 or row >= len(self.accounts):
@@ -1956,6 +2678,7 @@ class FinanceApp(QWidget):
         self.update_accounts_table()
         self.update_dashboard_tab()
 
+    @undoable("Delete account")
     def delete_account(self):
         row = self.accounts_table.currentRow()
         if row < 0 or row >= len(self.accounts):
@@ -1969,13 +2692,14 @@ class FinanceApp(QWidget):
         self.update_accounts_table()
         self.update_dashboard_tab()
 
+    @undoable("Clear all accounts")
     def clear_all_accounts(self):
         if not self.accounts:
             QMessageBox.information(self, "Clear Accounts", "There are no accounts to clear.")
             return
         reply = QMessageBox.question(
             self, "Clear ALL Accounts",
-            "This will delete ALL accounts and cannot be undone.\n\nProceed?",
+            "This will delete ALL accounts (Edit → Undo restores them).\n\nProceed?",
             QMessageBox.Yes | QMessageBox.No
         )
         if reply != QMessageBox.Yes:
@@ -1988,6 +2712,7 @@ class FinanceApp(QWidget):
 
 
     # ------- Balance Adjuster Logic -------
+    @undoable("Apply transactions to balances")
     def apply_new_transactions_to_balances(self):
         if not self.accounts:
             QMessageBox.information(self, "No Accounts", "No accounts found. Add an account first.")
@@ -1996,29 +2721,19 @@ class FinanceApp(QWidget):
             QMessageBox.information(self, "No Transactions", "There are no transactions to apply.")
             return
 
-        unapplied_mask = ~self.df['AppliedToBalance']
         # Only count rows that match existing accounts (ignore Unassigned)
         ac_names = {a["name"] for a in self.accounts}
-        acct_mask = self.df['Account'].isin(ac_names)
-        mask = unapplied_mask & acct_mask
+        pending = self.ledger.pending_ids(ac_names)
 
-        if not mask.any():
+        if not pending:
             QMessageBox.information(self, "Up to date", "All transactions are already applied to balances.")
             return
 
-        # Sum by account and update balances
-        changed = 0
-        df_to_apply = self.df.loc[mask].copy()
-        if not df_to_apply.empty:
-            sums = df_to_apply.groupby('Account')['Amount'].sum()
-            for i, acct in enumerate(self.accounts):
-                inc = float(sums.get(acct["name"], 0.0))
-                if abs(inc) > 0.000001:
-                    self.accounts[i]["balance"] = float(self.accounts[i]["balance"]) + inc
-            changed = len(df_to_apply)
-
-        # Mark applied
+        # Mark applied; the ledger already holds the per-account pending sums
+        changed = len(pending)
+        mask = self.df['Id'].astype(str).isin(pending)
         self.df.loc[mask, 'AppliedToBalance'] = True
+        self._apply_balance_deltas(self.ledger.apply_pending(ac_names), save=False)
 
         # Persist
         self.save_json(ACCOUNTS_FILE, self.accounts)
@@ -2028,16 +2743,30 @@ class FinanceApp(QWidget):
 
         QMessageBox.information(self, "Balances Updated", f"Balances updated. {changed} transaction(s) applied.")
 
-    def recalculate_balances_from_start(self):
-        if not self.accounts:
-            QMessageBox.information(self, "No Accounts", "No accounts found.")
-            return
+    def _ledger_sync_row(self, i):
+        """Push self.df row i into the running ledger and move account balances if it was applied."""
+        row = self.df.loc[i]
+        self._apply_balance_deltas(self.ledger.set_row(row['Id'], row['Account'], row['Amount'],
+                                                       row['AppliedToBalance'], row['Date']))
 
-        # Reset balances to starting
-        for i, acct in enumerate(self.accounts):
-            self.accounts[i]["balance"] = float(acct.get("starting_balance", acct.get("balance", 0.0)))
+    def _apply_balance_deltas(self, deltas: dict[str, float], save: bool = True) -> bool:
+        """Add {account: amount} to the matching account balances (unknown accounts are ignored)."""
+        changed = False
+        for acct in self.accounts:
+            d = deltas.get(acct["name"])
+            if d:
+                acct["balance"] = round(float(acct["balance"]) + d, 2)
+                changed = True
+        if changed and save:
+            self.save_json(ACCOUNTS_FILE, self.accounts)
+            self.update_accounts_table()
+        return changed
 
-        # Reapply all transactions that were previously applied
+    def balances_from_start(self) -> list[float]:
+        """Balance per account (same order as self.accounts): starting balance + applied transactions."""
+        # Months that are not loaded come in through the ledger's base (their applied sums)
+        balances = [float(a.get("starting_balance", a.get("balance", 0.0))) + self.ledger.base_total(a["name"])
+                    for a in self.accounts]
         if not self.df.empty:
             df_applied = self.df[self.df['AppliedToBalance']]
             if not df_applied.empty:
@@ -2045,7 +2774,42 @@ class FinanceApp(QWidget):
                 for i, acct in enumerate(self.accounts):
                     inc = float(sums.get(acct["name"], 0.0))
                     if abs(inc) > 0.000001:
-                        self.accounts[i]["balance"] = float(self.accounts[i]["balance"]) + inc
+                        balances[i] += inc
+        return balances
+
+    @undoable("Recalculate balances")
+    def recalculate_balances_from_start(self):
+        """
+        Verify stored balances against a full recompute (starting balance + applied transactions).
+        Day-to-day balances come from the running ledger; this is the consistency check.
+        """
+        if not self.accounts:
+            QMessageBox.information(self, "No Accounts", "No accounts found.")
+            return
+
+        # Running sums disagreeing with the frame means a change slipped past the ledger
+        if self.ledger.verify(self.df):
+            self.ledger.rebuild(self.df, self._page_base["ledger"])
+
+        expected = self.balances_from_start()
+        drift = [(i, float(a["balance"]), bal) for i, (a, bal) in enumerate(zip(self.accounts, expected))
+                 if abs(float(a["balance"]) - bal) > 0.005]
+        if not drift:
+            QMessageBox.information(self, "Balances Verified",
+                                    f"All {len(self.accounts)} account balance(s) match starting balance + applied transactions.")
+            return
+
+        lines = [f"{self.accounts[i]['name']}: {fmt_money(cur)} → {fmt_money(bal)}" for i, cur, bal in drift]
+        reply = QMessageBox.question(
+            self, "Recalculate Balances",
+            "These balances differ from starting balance + applied transactions:\n\n"
+            + "\n".join(lines) + "\n\nReset them to the recalculated values?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        for i, _, bal in drift:
+            self.accounts[i]["balance"] = bal
 
         # Save + refresh
         self.save_json(ACCOUNTS_FILE, self.accounts)
@@ -2086,12 +2850,15 @@ class FinanceApp(QWidget):
         self.update_categories_table()
 
     def update_categories_table(self):
+        if not self._tab_ready("Categories"):
+            return
         self.categories_table.setRowCount(len(self.categories))
         for r, c in enumerate(sorted(self.categories, key=lambda x: x["name"].lower())):
             self.categories_table.setItem(r, 0, QTableWidgetItem(c["name"]))
             self.categories_table.setItem(r, 1, QTableWidgetItem(c["type"]))
         self.categories_table.resizeColumnsToContents()
 
+    @undoable("Add category")
     def add_category(self):
         dialog = CategoryDialog(parent=self)
         if dialog.exec() != QDialog.Accepted:
@@ -2108,6 +2875,7 @@ class FinanceApp(QWidget):
         self.save_json(CATEGORIES_FILE, self.categories)
         self.update_categories_table()
 
+    @undoable("Edit category")
     def edit_category(self):
         row = self.categories_table.currentRow()
         if row < 0 or row >= self.categories_table.rowCount():
@@ -2135,7 +2903,8 @@ class FinanceApp(QWidget):
         # Update references if renamed
         old_name = orig["name"]
         if new_name != old_name:
-            # Update transactions
+            # Update transactions (in every month, not only the loaded ones)
+            self._load_all_months()
             if not self.df.empty:
                 self.df.loc[self.df['Category'] == old_name, 'Category'] = new_name
                 self.save_transactions()
@@ -2155,6 +2924,7 @@ class FinanceApp(QWidget):
         self.update_categories_table()
         self.save_and_refresh()
 
+    @undoable("Delete category")
     def delete_category(self):
         row = self.categories_table.currentRow()
         if row < 0 or row >= self.categories_table.rowCount():
@@ -2165,7 +2935,8 @@ class FinanceApp(QWidget):
             QMessageBox.warning(self, "Protected", "You cannot delete the Uncategorized category.")
             return
 
-        # determine if in use
+        # determine if in use (by a row of any month)
+        self._load_all_months()
         used = False
         tx_count = 0
         if not self.df.empty:
@@ -2206,13 +2977,14 @@ class FinanceApp(QWidget):
         self.update_categories_table()
         self.save_and_refresh()
     
+    @undoable("Clear all categories")
     def clear_all_categories(self):
         # Protect against leaving transactions with dangling categories:
         # we reset categories to only 'Uncategorized' and remap all tx to it.
         reply = QMessageBox.question(
             self, "Clear ALL Categories",
             "This will remove ALL categories and set every transaction's Category to 'Uncategorized'.\n"
-            "This cannot be undone.\n\nProceed?",
+            "Edit → Undo restores them.\n\nProceed?",
             QMessageBox.Yes | QMessageBox.No
         )
         if reply != QMessageBox.Yes:
@@ -2223,6 +2995,7 @@ class FinanceApp(QWidget):
         self.save_json(CATEGORIES_FILE, self.categories)
 
         # Remap all transactions to 'Uncategorized'
+        self._load_all_months()
         if not self.df.empty and "Category" in self.df.columns:
             self.df["Category"] = "Uncategorized"
             self.save_transactions()
@@ -2283,9 +3056,12 @@ class FinanceApp(QWidget):
         budgets_layout = QVBoxLayout()
         subtitle = QLabel("<i>Monthly equivalents shown</i>")
         budgets_layout.addWidget(subtitle)
-        self.dashboard_budget_table = QTableWidget()
-        self.dashboard_budget_table.setColumnCount(5)
-        self.dashboard_budget_table.setHorizontalHeaderLabels(["Category", "Spent (in range)", "Budget (Monthly Eq.)", "Remaining", "Progress"])
+        # Model + painted progress column: a refresh swaps the rows, no per-row widgets
+        self.dashboard_budget_model = BudgetSummaryModel(self)
+        self.dashboard_budget_table = QTableView()
+        self.dashboard_budget_table.setModel(self.dashboard_budget_model)
+        self.dashboard_budget_table.setItemDelegateForColumn(PROGRESS_COLUMN, BudgetProgressDelegate(self.dashboard_budget_table))
+        self.dashboard_budget_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         budgets_layout.addWidget(self.dashboard_budget_table)
         budgets_group.setLayout(budgets_layout)
         grid.addWidget(budgets_group, 0, 0, 1, 2)
@@ -2327,11 +3103,38 @@ class FinanceApp(QWidget):
         # Right: donut pie
         pie_group = QGroupBox("Spend by Category (Expenses in range) — Chart")
         pie_layout = QVBoxLayout()
-        self.mtd_category_pie = MplCanvas(width=4.5, height=3.6, dpi=100)
-        pie_layout.addWidget(self.mtd_category_pie)
+        self._add_chart(pie_layout, "mtd_category_pie", 4.5, 3.6, mtd_category_donut="donut")
         pie_group.setLayout(pie_layout)
         grid.addWidget(pie_group, 2, 1)
 
+        # Row 3: Net worth over time (last 12 months, from the ledger's balance history)
+        nw_group = QGroupBox("Net Worth (last 12 months)")
+        nw_layout = QVBoxLayout()
+        self._add_chart(nw_layout, "net_worth_chart", 4.5, 2.6, net_worth_lines="lines")
+        nw_group.setLayout(nw_layout)
+        grid.addWidget(nw_group, 3, 0)
+
+        # Right: Cash-flow forecast (balances projected from pending, recurring and budgets)
+        fc_group = QGroupBox("Cash-Flow Forecast")
+        fc_layout = QVBoxLayout()
+        fc_bar = QHBoxLayout()
+        self.forecast_label = QLabel()
+        self.forecast_label.setWordWrap(True)
+        fc_bar.addWidget(self.forecast_label)
+        fc_bar.addStretch()
+        fc_bar.addWidget(QLabel("Horizon:"))
+        self.forecast_months_dropdown = QComboBox()
+        for months in forecast.HORIZONS:
+            self.forecast_months_dropdown.addItem(f"{months} month{'s' if months > 1 else ''}", months)
+        idx = self.forecast_months_dropdown.findData(int(self.settings.get("forecast_months", forecast.DEFAULT_MONTHS)))
+        self.forecast_months_dropdown.setCurrentIndex(max(idx, 0))
+        self.forecast_months_dropdown.currentIndexChanged.connect(self.on_forecast_horizon_changed)
+        fc_bar.addWidget(self.forecast_months_dropdown)
+        fc_layout.addLayout(fc_bar)
+        self._add_chart(fc_layout, "forecast_chart", 4.5, 2.6, forecast_lines="lines")
+        fc_group.setLayout(fc_layout)
+        grid.addWidget(fc_group, 3, 1)
+
         main_layout.addLayout(grid)
         self.dashboard_tab.setLayout(main_layout)
 
@@ -2359,34 +3162,15 @@ class FinanceApp(QWidget):
 
     # Generic spend aggregations for any range
     def get_spend_by_category_in_range(self, start: datetime.date, end: datetime.date) -> dict[str, float]:
-        if self.df.empty:
-            return {}
-        df = self.df.copy()
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df = df[(df['Date'] >= pd.Timestamp(start)) & (df['Date'] <= pd.Timestamp(end))]
-        
-        # NEW: exclude transfers from dashboard/report spend math Sprint 13
-        if 'Type' in df.columns:
-            df = df[df['Type'].astype(str).str.lower() != 'transfer']
-        if 'Category' in df.columns:
-            df = df[df['Category'].astype(str).str.lower() != 'transfer']
-
-        if df.empty:
-            return {}
-        df['Category'] = df['Category'].astype(str)
-        spent = df.groupby('Category')['Amount'].apply(lambda x: abs(x[x < 0].sum())).to_dict()
-        return spent
+        # Expenses only, transfers excluded (see budget_engine.SpendIndex)
+        return self.spend_index().spent_by_category(start, end)
 
     def get_spend_by_account_in_range(self, start: datetime.date, end: datetime.date) -> dict[str, float]:
-        if self.df.empty:
+        snap = self.snapshot()
+        if snap.empty:
             return {}
-        df = self.df.copy()
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df = df[(df['Date'] >= pd.Timestamp(start)) & (df['Date'] <= pd.Timestamp(end))]
-
-        # NEW: exclude transfers
-        if 'Type' in df.columns:
-            df = df[df['Type'].astype(str).str.lower() != 'transfer']
+        # Exclude transfers
+        df = snap.parsed()[snap.in_range(start, end) & ~snap.is_transfer()]
 
         if df.empty:
             return {}
@@ -2395,59 +3179,30 @@ class FinanceApp(QWidget):
         return spent
 
     def get_recent_transactions_in_range(self, start: datetime.date, end: datetime.date, n=10) -> pd.DataFrame:
-        if self.df.empty:
-            return self.df.copy()
-        df = self.df.copy()
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df = df[(df['Date'] >= pd.Timestamp(start)) & (df['Date'] <= pd.Timestamp(end))]
+        snap = self.snapshot()
+        if snap.empty:
+            return snap.frame()
+        # Exclude transfers from dashboard recent list
+        df = snap.parsed()[snap.in_range(start, end) & ~snap.is_transfer()]
         df = df.sort_values('Date', ascending=False)
-
-        # NEW: exclude transfers from dashboard recent list
-        if 'Type' in df.columns:
-            df = df[df['Type'].astype(str).str.lower() != 'transfer']
-
         return df.head(n).reset_index(drop=True)
 
-    def _draw_donut(self, ax, labels, values, center_text):
-        ax.clear()
-        self.mtd_category_pie.set_dark()
-        wedges, _ = ax.pie(
-            values,
-            labels=None,  # legend instead
-            startangle=90,
-            wedgeprops=dict(width=0.42, edgecolor=DARK_FIG)
-        )
-        ax.text(0, 0, center_text, ha='center', va='center', color=LIGHT_TEXT, fontsize=12, fontweight='bold')
-        ax.axis('equal')
-        ax.legend(wedges, labels, loc='center left', bbox_to_anchor=(1.0, 0.5),
-                  facecolor=DARK_AX, labelcolor=LIGHT_TEXT, framealpha=0.0)
-
-    def _draw_category_donut_for_range(self, start: datetime.date, end: datetime.date):
-        spent_by_cat = self.get_spend_by_category_in_range(start, end)
-        spent_by_cat = {k: v for k, v in spent_by_cat.items() if v > 0}
-        labels = []
-        sizes = []
-        total = 0.0
-        if spent_by_cat:
-            pairs = sorted(spent_by_cat.items(), key=lambda x: -x[1])
-            top = pairs[:10]
-            others = pairs[10:]
-            labels = [k for k, _ in top]
-            sizes = [v for _, v in top]
-            if others:
-                labels.append("Other")
-                sizes.append(sum(v for _, v in others))
-            total = sum(sizes)
-
-        ax = self.mtd_category_pie.ax
+    def _draw_category_donut_for_range(self, start: datetime.date, end: datetime.date, donut=None,
+                                       data_version: int | None = None):
+        """donut: (labels, sizes, total) from a dashboard snapshot of data_version; computed here when not given."""
+        if data_version is None:
+            data_version = self.data_version
+        if not self.mtd_category_pie.needs_render(("donut", data_version, start, end)):
+            return
+        if donut is None:
+            donut = dashboard_data.donut_slices(self.get_spend_by_category_in_range(start, end))
+        labels, sizes, total = donut
+
+        # Same number of slices as on screen: wedges move in place and are blitted
         if sizes:
-            self._draw_donut(ax, labels, sizes, fmt_money(total))
+            self.mtd_category_donut.show(labels, sizes, fmt_money(total))
         else:
-            ax.clear()
-            self.mtd_category_pie.set_dark()
-            ax.text(0.5, 0.5, "No expense data", ha='center', va='center', color=LIGHT_TEXT)
-            ax.axis('off')
-        self.mtd_category_pie.draw()
+            self.mtd_category_donut.message("No expense data")
 
     def on_dashboard_range_changed(self, *_):
         mode = self.dashboard_range_dropdown.currentText()
@@ -2463,95 +3218,70 @@ class FinanceApp(QWidget):
             self.dashboard_to_picker.hide()
         self.update_dashboard_tab()
 
+    @perf.timed("update_dashboard_tab", rows=lambda self, _: len(self.df))
     def update_dashboard_tab(self):
-        # Net worth + today
-        total = sum(float(a["balance"]) for a in self.accounts) if self.accounts else 0.0
-        eff_today = self.get_today().strftime("%Y-%m-%d")
-        self.dashboard_balance_label.setText(
-            f"Total Balance Across All Accounts: <b>{fmt_money(total)}</b> &nbsp;&nbsp; "
-            f"<span style='color:gray;'>[Today: {eff_today}]</span>"
-        )
-
-        # Range
+        """
+        Request a dashboard snapshot for the current range. The aggregates are computed on the
+        worker thread and applied by _apply_dashboard_snapshot; the ledger-backed charts stay here.
+        """
+        if not self._tab_ready("Dashboard"):
+            return
         start, end = self.compute_dashboard_range()
-        # Exclude transfers from dashboard spend/income
-        df = self.df.copy()
-        df = df[df['Type'] != 'Transfer']
+        self.show_months("dashboard", months_between(start, end))
+        self.dashboard_worker.submit({
+            "transactions": self.snapshot(),   # immutable: edits to self.df do not reach the worker
+            "spend_index": self._spend_index if self._spend_index_version == self.data_version else None,
+            "spend_base": self._page_base["spend"],   # months not loaded (replaced, never mutated)
+            "data_version": self.data_version,
+            "start": start,
+            "end": end,
+            "today": self.get_today(),
+            "budgets": {cat: dict(b) for cat, b in self.budgets.items()},
+            "balances": [float(a["balance"]) for a in self.accounts],
+        })
+
+        # Net worth history + forecast
+        self._draw_net_worth_chart()
+        self._draw_forecast_chart()
+
+    def wait_for_dashboard(self):
+        """Apply the pending dashboard snapshot now (benchmarks and scripted refreshes)."""
+        self.dashboard_worker.wait()
+        QApplication.processEvents()
+
+    def _apply_dashboard_snapshot(self, snap: dict):
+        if not self.dashboard_worker.is_current(snap["generation"]) or not self._tab_ready("Dashboard"):
+            return  # superseded by a newer request (range changed or data saved meanwhile)
+        if snap["data_version"] == self.data_version and self._spend_index_version != self.data_version:
+            # Keep the worker's spend index for the next request on this data
+            self._spend_index = snap["spend_index"]
+            self._spend_index_version = self.data_version
 
+        self.dashboard_balance_label.setText(
+            f"Total Balance Across All Accounts: <b>{fmt_money(snap['total_balance'])}</b> &nbsp;&nbsp; "
+            f"<span style='color:gray;'>[Today: {snap['today'].strftime('%Y-%m-%d')}]</span>"
+        )
 
         # Budgets summary: ONLY budgeted categories; spent within range; budget = monthly eq (subtitle explains)
-        today = self.get_today()
-        spent_by_cat = self.get_spend_by_category_in_range(start, end)
-        rows = []
-        for cat in sorted(self.budgets.keys(), key=lambda x: x.lower()):
-            bdata = self.budgets.get(cat)
-            meq = self.monthly_equivalent(bdata.get("amount", 0.0), bdata.get("period", "monthly"), today)
-            spent = spent_by_cat.get(cat, 0.0)
-            remaining = meq - spent
-            rows.append({"category": cat, "spent": spent, "budget_meq": meq, "remaining": remaining})
-
-        self.dashboard_budget_table.setRowCount(len(rows))
-        for r, data in enumerate(rows):
-            self.dashboard_budget_table.setItem(r, 0, QTableWidgetItem(data["category"]))
-
-            spent_item = QTableWidgetItem(fmt_money(data["spent"]))
-            spent_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.dashboard_budget_table.setItem(r, 1, spent_item)
-
-            me_item = QTableWidgetItem(fmt_money(data["budget_meq"]))
-            me_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.dashboard_budget_table.setItem(r, 2, me_item)
-
-            rem_val = data["remaining"]
-            rem_item = QTableWidgetItem(fmt_money(rem_val))
-            rem_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            if rem_val < 0:
-                rem_item.setForeground(Qt.red)
-                rem_item.setText(f"Over by {fmt_money(-rem_val)}")
-            else:
-                rem_item.setForeground(Qt.darkGreen)
-            self.dashboard_budget_table.setItem(r, 3, rem_item)
-
-            # Progress bar: allow >100%
-            bar = QProgressBar()
-            pct = 0
-            if data["budget_meq"] > 0:
-                pct = round((data["spent"] / data["budget_meq"]) * 100)
-            max_val = max(100, int(pct)) if pct > 0 else 100
-            if pct < 0:
-                pct = 0
-            bar.setRange(0, max_val)
-            bar.setValue(int(pct))
-            bar.setFormat(f"{int(pct)}%")
-            if data["remaining"] < 0:
-                bar.setStyleSheet("QProgressBar::chunk { background-color: #c62828; } QProgressBar { color: white; }")
-            else:
-                bar.setStyleSheet("QProgressBar::chunk { background-color: #2e7d32; } QProgressBar { color: white; }")
-            self.dashboard_budget_table.setCellWidget(r, 4, bar)
-
-        self.dashboard_budget_table.resizeColumnsToContents()
+        if self.dashboard_budget_model.set_rows(snap["budget_rows"]):
+            self.dashboard_budget_table.resizeColumnsToContents()
 
         # Recent transactions (within range)
-        recent = self.get_recent_transactions_in_range(start, end, n=10)
-        if not recent.empty:
-            recent_display = recent.copy()
-            recent_display['Date'] = pd.to_datetime(recent_display['Date'], errors='coerce').dt.strftime('%Y-%m-%d')
-        else:
-            recent_display = recent
-        self.dashboard_recent_table.setRowCount(recent_display.shape[0])
+        recent = snap["recent"]
+        self.dashboard_recent_table.setRowCount(len(recent))
         self.dashboard_recent_table.setColumnCount(4)
         self.dashboard_recent_table.setHorizontalHeaderLabels(["Date", "Vendor", "Amount", "Category"])
-        for r in range(recent_display.shape[0]):
-            self.dashboard_recent_table.setItem(r, 0, QTableWidgetItem(str(recent_display.iloc[r]['Date'])))
-            self.dashboard_recent_table.setItem(r, 1, QTableWidgetItem(str(recent_display.iloc[r]['Vendor'])))
-            amt_item = QTableWidgetItem(fmt_money(recent_display.iloc[r]['Amount']))
+        for r, (date, vendor, amount, category) in enumerate(recent):
+            self.dashboard_recent_table.setItem(r, 0, QTableWidgetItem(date))
+            self.dashboard_recent_table.setItem(r, 1, QTableWidgetItem(vendor))
+            amt_item = QTableWidgetItem(fmt_money(amount))
             amt_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.dashboard_recent_table.setItem(r, 2, amt_item)
-            self.dashboard_recent_table.setItem(r, 3, QTableWidgetItem(str(recent_display.iloc[r]['Category'])))
+            self.dashboard_recent_table.setItem(r, 3, QTableWidgetItem(category))
         self.dashboard_recent_table.resizeColumnsToContents()
 
         # Spend by Account (range)
-        spend_acct = self.get_spend_by_account_in_range(start, end)
+        spend_acct = snap["spend_by_account"]
         accts = sorted(spend_acct.keys())
         self.dashboard_spend_by_acct_table.setRowCount(len(accts))
         for r, name in enumerate(accts):
@@ -2562,7 +3292,7 @@ class FinanceApp(QWidget):
         self.dashboard_spend_by_acct_table.resizeColumnsToContents()
 
         # Spend by Category (range) — list
-        spend_cat_pairs = sorted(self.get_spend_by_category_in_range(start, end).items(), key=lambda x: (-x[1], x[0]))
+        spend_cat_pairs = snap["spend_by_category"]
         self.dashboard_spend_by_cat_table.setRowCount(len(spend_cat_pairs))
         for r, (cat, amt) in enumerate(spend_cat_pairs):
             self.dashboard_spend_by_cat_table.setItem(r, 0, QTableWidgetItem(cat))
@@ -2571,8 +3301,109 @@ class FinanceApp(QWidget):
             self.dashboard_spend_by_cat_table.setItem(r, 1, amt_item)
         self.dashboard_spend_by_cat_table.resizeColumnsToContents()
 
-        # Category donut (range)
-        self._draw_category_donut_for_range(start, end)
+        # Category donut (range), from the same per-category lookup
+        self._draw_category_donut_for_range(snap["start"], snap["end"], snap["donut"], snap["data_version"])
+
+    def _on_dashboard_snapshot_failed(self, generation: int, message: str):
+        if self.dashboard_worker.is_current(generation):
+            QMessageBox.warning(self, "Dashboard", f"Could not refresh the dashboard:\n{message}")
+
+    def account_balance_on(self, name: str, date: datetime.date) -> float:
+        """Balance of one account at the end of date (current balance minus applied activity after it)."""
+        acct = next((a for a in self.accounts if a["name"] == name), None)
+        if acct is None:
+            return 0.0
+        opening = float(acct["balance"]) - self.ledger.applied_total(name)
+        return round(self.ledger.balance_on(name, date, opening), 2)
+
+    def net_worth_series(self, dates) -> list[float]:
+        """Total balance across all accounts at the end of each date."""
+        # Anchor on the stored balances so the series ends at the dashboard total
+        opening = {a["name"]: float(a["balance"]) - self.ledger.applied_total(a["name"]) for a in self.accounts}
+        return self.ledger.net_worth_series(opening, dates)
+
+    def _draw_net_worth_chart(self, weeks: int = 52):
+        balances = tuple((a["name"], float(a["balance"])) for a in self.accounts)
+        if not self.net_worth_chart.needs_render(("net_worth", self.data_version, self.get_today(), balances, weeks)):
+            return
+        if not self.accounts:
+            self.net_worth_lines.message("No accounts")
+            return
+
+        today = self.get_today()
+        start = today - datetime.timedelta(weeks=weeks)
+        first = self.ledger.first_day()
+        if first is not None and first > start:
+            start = first
+        dates = [start + datetime.timedelta(weeks=k) for k in range((today - start).days // 7 + 1)]
+        if not dates or dates[-1] != today:
+            dates.append(today)
+        values = self.net_worth_series(dates)
+
+        self.net_worth_lines.show(dates, [("Net worth", values, {"color": "#42a5f5", "linewidth": 1.8})],
+                                  yformatter=lambda v, _: fmt_money(v), fill=True)
+
+    def cash_flow_forecast(self, months: int | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        (projected daily balance per account, scheduled events) for the next N months.
+        Cached until the transactions, budgets, balances, horizon or effective today change.
+        """
+        months = int(months or self.settings.get("forecast_months", forecast.DEFAULT_MONTHS))
+        today = self.get_today()
+        balances = {a["name"]: float(a["balance"]) for a in self.accounts}
+        key = (self.data_version, today, months, json.dumps(self.budgets, sort_keys=True),
+               tuple(balances.items()))
+        if self._forecast is None or self._forecast_key != key:
+            pending_ids = self.ledger.pending_ids(balances)
+            pending = self.df[self.df["Id"].astype(str).isin(pending_ids)] if pending_ids else None
+            month_start = start_of_month(today)
+            index = self.spend_index()
+            self._forecast = forecast.forecast(
+                balances, today, months,
+                recurring_df=self.recurring_transactions(),
+                budgets=self.budgets,
+                pending=pending,
+                category_accounts=forecast.category_accounts(self.df, today),
+                spent_to_date={cat: index.spent(cat, month_start, today) for cat in self.budgets},
+            )
+            self._forecast_key = key
+        return self._forecast
+
+    def on_forecast_horizon_changed(self, *_):
+        self.settings["forecast_months"] = self.forecast_months_dropdown.currentData()
+        self.save_json(SETTINGS_FILE, self.settings)
+        self._draw_forecast_chart()
+
+    def _draw_forecast_chart(self):
+        projected, events = self.cash_flow_forecast()
+        if not self.forecast_chart.needs_render(("forecast", self._forecast_key)):
+            return
+        if not self.accounts:
+            self.forecast_label.setText("")
+            self.forecast_lines.message("No accounts")
+            return
+
+        today = self.get_today()
+        current = {a["name"]: float(a["balance"]) for a in self.accounts}
+        dates = [today] + [d.date() for d in projected.index]
+        series = [(name, [current[name]] + projected[name].tolist(), {"linewidth": 1.0, "alpha": 0.8})
+                  for name in projected.columns]
+        total = [sum(current.values())] + projected.sum(axis=1).tolist()
+        series.append(("Total", total, {"color": LIGHT_TEXT, "linewidth": 1.6, "linestyle": "--"}))
+        self.forecast_lines.show(dates, series, yformatter=lambda v, _: fmt_money(v), zero_line=True,
+                                 legend={"fontsize": 8, "loc": "upper left"})
+
+        if projected.empty:
+            self.forecast_label.setText("")
+            return
+        lows = projected.min()
+        low_acct = lows.idxmin()
+        low_date = projected[low_acct].idxmin().strftime("%Y-%m-%d")
+        self.forecast_label.setText(
+            f"Projected total on {projected.index[-1].strftime('%Y-%m-%d')}: <b>{fmt_money(total[-1])}</b>"
+            f" &nbsp;&nbsp; Lowest: {low_acct} {fmt_money(lows[low_acct])} on {low_date}"
+            f" &nbsp;&nbsp; <span style='color:gray;'>({len(events)} scheduled item(s))</span>"
+        )
 
     # ---------------- Reports Tab ----------------
     def init_reports_tab(self):
@@ -2603,8 +3434,8 @@ class FinanceApp(QWidget):
         self.reports_to_picker.hide()
 
         self.reports_filter_dropdown.currentTextChanged.connect(self.on_reports_filter_changed)
-        self.reports_from_picker.dateChanged.connect(self.refresh_reports)
-        self.reports_to_picker.dateChanged.connect(self.refresh_reports)
+        self.reports_from_picker.dateChanged.connect(lambda *_: self.refresh_reports())
+        self.reports_to_picker.dateChanged.connect(lambda *_: self.refresh_reports())
 
         layout.addLayout(filter_bar)
 
@@ -2613,19 +3444,38 @@ class FinanceApp(QWidget):
         # Pie: Spending by Category (donut, dark)
         self.reports_pie_group = QGroupBox("Spending by Category (Expenses Only)")
         pie_layout = QVBoxLayout()
-        self.reports_pie = MplCanvas(width=5, height=4, dpi=100)
-        pie_layout.addWidget(self.reports_pie)
+        self._add_chart(pie_layout, "reports_pie", 5, 4, reports_pie_chart="donut")
         self.reports_pie_group.setLayout(pie_layout)
         charts_grid.addWidget(self.reports_pie_group, 0, 0)
 
         # Bar: Income vs Expenses by Month (dark)
         self.reports_bar_group = QGroupBox("Income vs Expenses by Month")
         bar_layout = QVBoxLayout()
-        self.reports_bar = MplCanvas(width=6, height=4, dpi=100)
-        bar_layout.addWidget(self.reports_bar)
+        view_bar = QHBoxLayout()
+        view_bar.addWidget(QLabel("View:"))
+        self.reports_month_view_dropdown = QComboBox()
+        self.reports_month_view_dropdown.addItems(REPORT_MONTH_VIEWS)
+        self.reports_month_view_dropdown.currentTextChanged.connect(lambda *_: self.refresh_reports())
+        view_bar.addWidget(self.reports_month_view_dropdown)
+        view_bar.addStretch()
+        bar_layout.addLayout(view_bar)
+        self._add_chart(bar_layout, "reports_bar", 6, 4, reports_month_chart="bars", reports_month_lines="lines")
         self.reports_bar_group.setLayout(bar_layout)
         charts_grid.addWidget(self.reports_bar_group, 0, 1)
 
+        # Recurring charges & subscriptions (whole history, not the range above)
+        self.reports_recurring_group = QGroupBox("Recurring Charges & Subscriptions")
+        rec_layout = QVBoxLayout()
+        self.reports_recurring_label = QLabel()
+        rec_layout.addWidget(self.reports_recurring_label)
+        self.reports_recurring_table = QTableWidget()
+        self.reports_recurring_table.setColumnCount(len(RECURRING_TABLE_HEADERS))
+        self.reports_recurring_table.setHorizontalHeaderLabels(RECURRING_TABLE_HEADERS)
+        self.reports_recurring_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        rec_layout.addWidget(self.reports_recurring_table)
+        self.reports_recurring_group.setLayout(rec_layout)
+        charts_grid.addWidget(self.reports_recurring_group, 1, 0, 1, 2)
+
         layout.addLayout(charts_grid)
         self.reports_tab.setLayout(layout)
 
@@ -2668,35 +3518,40 @@ class FinanceApp(QWidget):
             return self.reports_from_picker.date().toPython(), self.reports_to_picker.date().toPython()
         return start_of_month(today), end_of_month(today)
 
+    @perf.timed("refresh_reports", rows=lambda self, _: len(self.df))
     def refresh_reports(self):
-        ax_p = self.reports_pie.ax
-        ax_b = self.reports_bar.ax
-        self.reports_pie.set_dark()
-        self.reports_bar.set_dark()
+        if not self._tab_ready("Reports"):
+            return
+        self.update_recurring_table()
+        start, end = self.compute_reports_range()
+        # Whole months come straight from the rollup tables; a partial edge month needs its rows
+        partial = {month_code(start)} if start.day != 1 else set()
+        if end != end_of_month(end):
+            partial.add(month_code(end))
+        self.show_months("reports", partial)
+        view = self.reports_month_view_dropdown.currentText()
+        # Redraw a chart only when its inputs changed (tab switches and unrelated saves reuse the figure)
+        draw_pie = self.reports_pie.needs_render(("reports_pie", self.data_version, start, end))
+        draw_bar = self.reports_bar.needs_render(("reports_months", self.data_version, start, end, view))
+        if not (draw_pie or draw_bar):
+            return
 
-        if self.df.empty:
-            ax_p.clear(); ax_b.clear()
-            self.reports_pie.set_dark(); self.reports_bar.set_dark()
-            ax_p.text(0.5, 0.5, "No data", ha='center', va='center', color=LIGHT_TEXT); ax_p.axis('off')
-            ax_b.text(0.5, 0.5, "No data", ha='center', va='center', color=LIGHT_TEXT); ax_b.axis('off')
-            self.reports_pie.draw(); self.reports_bar.draw()
+        if self.df.empty and not self._page_base["tables"]:
+            self.reports_pie_chart.message("No data")
+            self.reports_month_chart.message("No data")
             return
 
-        start, end = self.compute_reports_range()
-        df = self.df.copy()
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df = df[(df['Date'] >= pd.Timestamp(start)) & (df['Date'] <= pd.Timestamp(end))]
+        rollups = self.monthly_rollups(need_rows=bool(partial))
+        months = rollups.monthly_totals(start, end)
 
         # Pie: Spending by Category (expenses only, donut)
-        ax_p.clear(); self.reports_pie.set_dark()
-        if df.empty:
-            ax_p.text(0.5, 0.5, "No data", ha='center', va='center', color=LIGHT_TEXT); ax_p.axis('off')
-        else:
-            exp = df[df['Amount'] < 0].copy()
-            if exp.empty:
-                ax_p.text(0.5, 0.5, "No expense data", ha='center', va='center', color=LIGHT_TEXT); ax_p.axis('off')
+        if draw_pie:
+            sums = rollups.category_totals(start, end, "expense") if not months.empty else None
+            if sums is None:
+                self.reports_pie_chart.message("No data")
+            elif sums.empty:
+                self.reports_pie_chart.message("No expense data")
             else:
-                sums = exp.groupby('Category')['Amount'].sum().abs().sort_values(ascending=False)
                 labels = sums.index.tolist()
                 values = sums.values.tolist()
                 total = sums.sum()
@@ -2705,38 +3560,83 @@ class FinanceApp(QWidget):
                     other_val = sum(values[12:])
                     top_labels.append("Other"); top_values.append(other_val)
                     labels, values = top_labels, top_values
-                wedges, _ = ax_p.pie(
-                    values, labels=None, startangle=90,
-                    wedgeprops=dict(width=0.42, edgecolor=DARK_FIG)
+                self.reports_pie_chart.show(labels, values, fmt_money(total))
+
+        # Month chart: the selected view of the rollups (bars move in place when the shape is unchanged)
+        if draw_bar:
+            if view == "Year over Year":
+                self._draw_year_over_year(rollups, end.year)
+            elif view == "Trailing 12 Months":
+                self._draw_trailing_twelve(rollups, end)
+            elif months.empty:
+                self.reports_bar_group.setTitle("Income vs Expenses by Month")
+                self.reports_month_chart.message("No data")
+            else:
+                self.reports_bar_group.setTitle("Income vs Expenses by Month")
+                self.reports_month_chart.show(
+                    months.index.tolist(),
+                    [("Income", months["Income"].tolist(), None), ("Expenses", months["Expense"].tolist(), None)],
+                    ylabel="Amount",
                 )
-                ax_p.text(0, 0, fmt_money(total), ha='center', va='center', color=LIGHT_TEXT, fontsize=12, fontweight='bold')
-                ax_p.axis('equal')
-                ax_p.legend(wedges, labels, loc='center left', bbox_to_anchor=(1.0, 0.5),
-                            facecolor=DARK_AX, labelcolor=LIGHT_TEXT, framealpha=0.0)
-        self.reports_pie.draw()
 
-        # Bar: Income vs Expenses by Month (dark)
-        ax_b.clear(); self.reports_bar.set_dark()
-        if df.empty:
-            ax_b.text(0.5, 0.5, "No data", ha='center', va='center', color=LIGHT_TEXT); ax_b.axis('off')
-        else:
-            temp = df.copy()
-            temp['YearMonth'] = temp['Date'].dt.to_period('M').astype(str)
-            inc = temp[temp['Amount'] > 0].groupby('YearMonth')['Amount'].sum()
-            exp = temp[temp['Amount'] < 0].groupby('YearMonth')['Amount'].sum().abs()
-            months = sorted(set(inc.index).union(set(exp.index)))
-            inc_vals = [inc.get(m, 0.0) for m in months]
-            exp_vals = [exp.get(m, 0.0) for m in months]
-            x = range(len(months))
-            width = 0.38
-            ax_b.bar([i - width/2 for i in x], inc_vals, width, label="Income")
-            ax_b.bar([i + width/2 for i in x], exp_vals, width, label="Expenses")
-            ax_b.set_xticks(list(x))
-            ax_b.set_xticklabels(months, rotation=45, ha='right', color=LIGHT_TEXT)
-            ax_b.legend(facecolor=DARK_AX, labelcolor=LIGHT_TEXT, framealpha=0.0)
-            ax_b.set_ylabel("Amount", color=LIGHT_TEXT)
-            ax_b.grid(axis='y', color=GRID_COLOR, alpha=0.5)
-        self.reports_bar.draw()
+    def _draw_year_over_year(self, rollups: MonthlyRollup, year: int):
+        """Monthly expenses of year next to the year before (range end decides the year)."""
+        self.reports_bar_group.setTitle(f"Expenses by Month: {year} vs {year - 1}")
+        yoy = rollups.year_over_year(year, "expense")
+        self.reports_month_chart.show(
+            [calendar.month_abbr[m] for m in yoy.index],
+            [(str(year - 1), yoy[str(year - 1)].tolist(), "#757575"), (str(year), yoy[str(year)].tolist(), None)],
+            yformatter=lambda v, _: fmt_money(v), rotate=False,
+        )
+
+    def _draw_trailing_twelve(self, rollups: MonthlyRollup, end: datetime.date, months: int = 24):
+        """Trailing-12-month income and expense totals for each of the last `months` months."""
+        self.reports_bar_group.setTitle("Trailing 12 Months (Income vs Expenses)")
+        t12 = rollups.trailing_twelve(month_code(end), months)
+        self.reports_month_lines.show(
+            list(range(len(t12))),
+            [("Income", t12["Income"].tolist(), {"linewidth": 1.8}),
+             ("Expenses", t12["Expense"].tolist(), {"linewidth": 1.8})],
+            yformatter=lambda v, _: fmt_money(v), xticklabels=t12.index.tolist(), legend={},
+        )
+
+    def recurring_transactions(self) -> pd.DataFrame:
+        """Detected recurring series over the whole ledger (cached per data version and effective today)."""
+        key = (self.data_version, self.get_today())
+        if self._recurring is None or self._recurring_key != key:
+            self._recurring = recurring.detect_recurring(self.df, vendor_key=_vendor_root, today=key[1])
+            self._recurring_key = key
+        return self._recurring
+
+    def update_recurring_table(self):
+        rec = self.recurring_transactions()
+        if self._recurring_table_key == self._recurring_key:
+            return  # table already shows this detection result
+        self._recurring_table_key = self._recurring_key
+        table = self.reports_recurring_table
+        table.setRowCount(len(rec))
+        for r, row in enumerate(rec.itertuples(index=False)):
+            cells = [
+                (row.Vendor, False), (row.Category, False), (row.Account, False),
+                (row.Cadence.capitalize(), False),
+                (fmt_money(row.Amount), True), (fmt_money(row.MonthlyAmount), True),
+                (row.LastDate, False), (row.NextDate if row.Active else "—", False),
+                ("Active" if row.Active else "Stopped?", False),
+            ]
+            for c, (text, right) in enumerate(cells):
+                item = QTableWidgetItem(str(text))
+                if right:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if not row.Active:
+                    item.setForeground(Qt.gray)
+                table.setItem(r, c, item)
+        table.resizeColumnsToContents()
+
+        active = rec[rec["Active"] & (rec["Amount"] < 0)] if not rec.empty else rec
+        monthly = -float(active["MonthlyAmount"].sum()) if not active.empty else 0.0
+        self.reports_recurring_label.setText(
+            f"{len(active)} active recurring charge(s), about <b>{fmt_money(monthly)}</b> per month"
+        )
 
     # ---------------- Settings Tab ----------------
     def init_settings_tab(self):
@@ -2856,6 +3756,371 @@ class FinanceApp(QWidget):
 
         self.chk_show_adv_cols.toggled.connect(_on_toggle_adv_cols)
 
+        # Chart renderer for the Dashboard and Reports charts
+        renderer_row = QHBoxLayout()
+        renderer_row.addWidget(QLabel("Chart renderer:"))
+        self.chart_backend_dropdown = QComboBox()
+        for key, label in CHART_BACKENDS.items():
+            self.chart_backend_dropdown.addItem(label, key)
+        self.chart_backend_dropdown.setCurrentIndex(max(self.chart_backend_dropdown.findData(self.chart_backend()), 0))
+        self.chart_backend_dropdown.currentIndexChanged.connect(self.on_chart_backend_changed)
+        renderer_row.addWidget(self.chart_backend_dropdown)
+        renderer_row.addWidget(QLabel("<span style='color:gray;'>Native draws with Qt directly and skips loading Matplotlib</span>"))
+        renderer_row.addStretch()
+        layout.addLayout(renderer_row)
+
+        self._init_perf_panel(layout)
+        self._init_memory_panel(layout)
+        self._init_backup_panel(layout)
+
+    # --- Hot-path timers panel (Settings) ---
+    def _init_perf_panel(self, layout):
+        group = QGroupBox("Performance (hot-path timers)")
+        g = QVBoxLayout(group)
+
+        self.chk_perf_timers = QCheckBox("Record timings for refresh/save/import operations")
+        self.chk_perf_timers.setChecked(perf.TIMERS.enabled)
+        g.addWidget(self.chk_perf_timers)
+
+        self.perf_table = QTableWidget()
+        self.perf_table.setColumnCount(9)
+        self.perf_table.setHorizontalHeaderLabels(
+            ["Operation", "Calls", "Total ms", "Mean ms", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Rows"])
+        self.perf_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        g.addWidget(self.perf_table)
+
+        btns = QHBoxLayout()
+        btn_refresh = QPushButton("Refresh")
+        btn_reset = QPushButton("Reset")
+        btn_export = QPushButton("Export JSON…")
+        btns.addWidget(btn_refresh)
+        btns.addWidget(btn_reset)
+        btns.addStretch()
+        btns.addWidget(btn_export)
+        g.addLayout(btns)
+        layout.addWidget(group)
+
+        def _on_toggle_perf(checked):
+            perf.TIMERS.enabled = bool(checked)
+            self.settings["perf_timers_enabled"] = bool(checked)
+            self.save_json(SETTINGS_FILE, self.settings)
+
+        def _on_reset():
+            perf.TIMERS.reset()
+            self.update_perf_table()
+
+        self.chk_perf_timers.toggled.connect(_on_toggle_perf)
+        btn_refresh.clicked.connect(self.update_perf_table)
+        btn_reset.clicked.connect(_on_reset)
+        btn_export.clicked.connect(self.export_perf_stats)
+        self.update_perf_table()
+
+    def update_perf_table(self):
+        if not self._tab_ready("Settings"):
+            return
+        stats = perf.TIMERS.snapshot()
+        self.perf_table.setRowCount(len(stats))
+        keys = ["calls", "total_ms", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "rows"]
+        for r, (name, st) in enumerate(stats.items()):
+            self.perf_table.setItem(r, 0, QTableWidgetItem(name))
+            for c, k in enumerate(keys, start=1):
+                val = st[k]
+                item = QTableWidgetItem(f"{val:,}" if isinstance(val, int) else f"{val:,.2f}")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.perf_table.setItem(r, c, item)
+        self.perf_table.resizeColumnsToContents()
+
+    def export_perf_stats(self):
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        path, _ = QFileDialog.getSaveFileName(self, "Export Timings", f"perf_stats-{stamp}.json", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            perf.TIMERS.export_json(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Export Timings", f"Could not export timings:\n{e}")
+            return
+        QMessageBox.information(self, "Export Timings", f"Timings exported to:\n{path}")
+
+    # --- Memory footprint panel (Settings) ---
+    def _init_memory_panel(self, layout):
+        group = QGroupBox("Memory (in-memory ledger)")
+        g = QVBoxLayout(group)
+
+        self.memory_total_label = QLabel("Press Refresh to measure.")
+        g.addWidget(self.memory_total_label)
+
+        # Older months stay on disk until a view shows them (see month_store.py)
+        keep_row = QHBoxLayout()
+        keep_row.addWidget(QLabel("Keep the last"))
+        self.resident_months_spin = QSpinBox()
+        self.resident_months_spin.setRange(1, 600)
+        self.resident_months_spin.setValue(int(self.settings.get("resident_months", RESIDENT_MONTHS)))
+        keep_row.addWidget(self.resident_months_spin)
+        keep_row.addWidget(QLabel("months of transactions in memory (older months are read when a view shows them)"))
+        keep_row.addStretch()
+        g.addLayout(keep_row)
+
+        self.memory_table = QTableWidget()
+        self.memory_table.setColumnCount(5)
+        self.memory_table.setHorizontalHeaderLabels(["Section", "Item", "Kind", "Entries", "Size"])
+        self.memory_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        g.addWidget(self.memory_table)
+
+        btns = QHBoxLayout()
+        btn_refresh = QPushButton("Refresh")
+        btn_compact = QPushButton("Compact")
+        btn_compact.setToolTip("Share repeated strings, restore column types and drop rebuildable caches")
+        btns.addWidget(btn_refresh)
+        btns.addStretch()
+        btns.addWidget(btn_compact)
+        g.addLayout(btns)
+        layout.addWidget(group)
+
+        btn_refresh.clicked.connect(self.update_memory_table)
+        btn_compact.clicked.connect(self.compact_memory)
+        self.resident_months_spin.valueChanged.connect(self.on_resident_months_changed)
+
+    def on_resident_months_changed(self, value: int):
+        self.settings["resident_months"] = int(value)
+        self.save_json(SETTINGS_FILE, self.settings)
+        self._sync_months()
+        self.update_memory_table()
+
+    def memory_report_rows(self) -> list[dict]:
+        """What the app holds in memory: {"section", "item", "kind", "entries", "bytes"} (None when unknown)."""
+        rows = [dict(r, section="Transactions") for r in memory_report.frame_rows(self.df)]
+
+        def add(section, item, kind, entries, nbytes):
+            rows.append({"section": section, "item": item, "kind": kind, "entries": entries, "bytes": nbytes})
+
+        if self._snapshot is not None:
+            add("Caches", "Snapshot derived columns", f"version {self._snapshot.version}",
+                len(self._snapshot), self._snapshot.derived_nbytes())
+        add("Caches", "Search index", "token index", len(self.search_index),
+            memory_report.deep_sizeof(self.search_index) + sum(int(v.nbytes) for _, v in self._search_columns))
+        add("Caches", "Filter masks", "numpy bool", len(self.filter_engine), self.filter_engine.nbytes())
+        add("Caches", "Undo history", "steps", len(self.history), memory_report.deep_sizeof(self.history))
+        add("Caches", "Month index", f"{len(self._loaded & set(self.store.months))} of {len(self.store.months)} months loaded",
+            self.store.rows(), memory_report.deep_sizeof(self.store.months))
+        for item, obj in (("Spend index", self._spend_index), ("Monthly rollups", self.rollups),
+                          ("Balance ledger", self.ledger), ("Recurring charges", self._recurring),
+                          ("Forecast", self._forecast)):
+            if obj is not None:
+                add("Caches", item, type(obj).__name__, memory_report.entries(obj), memory_report.deep_sizeof(obj))
+        for item, obj in (("Autocategorize memory", self.autocat), ("Budgets", self.budgets),
+                          ("Accounts", self.accounts), ("Categories", self.categories), ("Settings", self.settings)):
+            add("Settings data", item, type(obj).__name__, len(obj), memory_report.deep_sizeof(obj))
+        add("Profiles", "Hot-path timers", "samples", sum(st["calls"] for st in perf.TIMERS.snapshot().values()),
+            memory_report.deep_sizeof(perf.TIMERS))
+        for name, widget in vars(self).items():
+            # Cells of the Qt tables live in C++; report how many there are, not their size
+            if isinstance(widget, QTableWidget):
+                add("Qt tables", name, "QTableWidget items", widget.rowCount() * widget.columnCount(), None)
+        add("Qt tables", "table", f"model, {self.txn_model.rowCount():,} of {self.txn_model.total_rows():,} rows loaded",
+            self.txn_model.rowCount() * self.txn_model.columnCount(), self.txn_model.nbytes())
+        return rows
+
+    @perf.timed("memory_report")
+    def update_memory_table(self):
+        if not self._tab_ready("Settings"):
+            return
+        rows = self.memory_report_rows()
+        self.memory_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            cells = [row["section"], row["item"], row["kind"], "" if row["entries"] is None else f"{row['entries']:,}",
+                     "—" if row["bytes"] is None else memory_report.format_bytes(row["bytes"])]
+            for c, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if c >= 3:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.memory_table.setItem(r, c, item)
+        self.memory_table.resizeColumnsToContents()
+        frame = sum(row["bytes"] for row in rows if row["section"] == "Transactions")
+        total = sum(row["bytes"] or 0 for row in rows)
+        rss = perf.rss_bytes()
+        self.memory_total_label.setText(
+            f"Transactions: <b>{memory_report.format_bytes(frame)}</b> for {len(self.df):,} rows"
+            + (f" of {self.store.rows():,} on disk" if self.store.paged else "") + " · "
+            f"measured total: <b>{memory_report.format_bytes(total)}</b>"
+            + (f" · process RSS: {memory_report.format_bytes(rss)}" if rss else ""))
+
+    def compact_memory(self):
+        """Rebuild self.df with shared strings and its load-time dtypes; drop caches the next refresh rebuilds."""
+        before = memory_report.frame_bytes(self.df)
+        try:
+            compacted, changes = memory_report.compact_frame(self.df)
+        except Exception as e:
+            QMessageBox.warning(self, "Compact", f"Could not compact the transactions:\n{e}")
+            return
+        # Same values, so data_version (and what is keyed on it) stays valid; the snapshot rebuilds from the new frame
+        self.df = compacted
+        self._snapshot = None
+        self.search_index = TokenIndex(_vendor_tokens)   # also forgets values no longer in the ledger
+        self._search_columns = []
+        self._search_snapshot = None
+        self.filter_engine = filter_engine.FilterEngine()
+        gc.collect()
+        self.update_table()
+        self.update_memory_table()
+        after = memory_report.frame_bytes(self.df)
+        summary = "\n".join(changes) or "Column types and strings were already compact."
+        QMessageBox.information(
+            self, "Compact",
+            f"Transactions: {memory_report.format_bytes(before)} → {memory_report.format_bytes(after)}\n\n"
+            f"{summary}\n\nSearch, filter and snapshot caches were dropped and rebuild on next use.")
+
+    # --- Backups panel (Settings) ---
+    def _init_backup_panel(self, layout):
+        group = QGroupBox("Backups (transactions file)")
+        g = QVBoxLayout(group)
+
+        self.backup_info_label = QLabel()
+        g.addWidget(self.backup_info_label)
+
+        self.backup_table = QTableWidget()
+        self.backup_table.setColumnCount(4)
+        self.backup_table.setHorizontalHeaderLabels(["Created", "Label", "File size", "Stored"])
+        self.backup_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.backup_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        g.addWidget(self.backup_table)
+
+        keep_row = QHBoxLayout()
+        retention = self.backup_retention()
+        self.backup_keep_spins = {}
+        for key, text in (("keep_last", "Keep last"), ("keep_daily", "daily"), ("keep_weekly", "weekly")):
+            spin = QSpinBox()
+            spin.setRange(1 if key == "keep_last" else 0, 999)
+            spin.setValue(retention[key])
+            keep_row.addWidget(QLabel(text + ":"))
+            keep_row.addWidget(spin)
+            self.backup_keep_spins[key] = spin
+        keep_row.addStretch()
+        g.addLayout(keep_row)
+
+        btns = QHBoxLayout()
+        btn_backup = QPushButton("Back Up Now")
+        btn_restore = QPushButton("Restore Selected…")
+        btn_prune = QPushButton("Prune Now")
+        btns.addWidget(btn_backup)
+        btns.addWidget(btn_restore)
+        btns.addStretch()
+        btns.addWidget(btn_prune)
+        g.addLayout(btns)
+        layout.addWidget(group)
+
+        def _on_retention_changed(_=None):
+            for key, spin in self.backup_keep_spins.items():
+                self.settings[f"backup_{key}"] = spin.value()
+            self.save_json(SETTINGS_FILE, self.settings)
+
+        def _on_backup():
+            try:
+                manifest = self.backup_transactions("Manual")
+            except Exception as e:
+                QMessageBox.warning(self, "Back Up", f"Could not back up the transactions:\n{e}")
+                return
+            if manifest is None:
+                QMessageBox.information(self, "Back Up", "There is no transactions file to back up yet.")
+
+        def _on_prune():
+            deleted, freed = self.backup_store.prune(**self.backup_retention())
+            self.update_backup_table()
+            QMessageBox.information(self, "Prune Backups",
+                                    f"Removed {len(deleted)} backup(s), freed {memory_report.format_bytes(freed)}.")
+
+        for spin in self.backup_keep_spins.values():
+            spin.valueChanged.connect(_on_retention_changed)
+        btn_backup.clicked.connect(_on_backup)
+        btn_restore.clicked.connect(self.restore_selected_backup)
+        btn_prune.clicked.connect(_on_prune)
+        self.update_backup_table()
+
+    def backup_retention(self) -> dict:
+        """Retention policy for BackupStore.prune from settings (always keeps at least the newest backup)."""
+        policy = {key: int(self.settings.get(f"backup_{key}", default)) for key, default in DEFAULT_RETENTION.items()}
+        policy["keep_last"] = max(1, policy["keep_last"])
+        return policy
+
+    @perf.timed("backup_transactions")
+    def backup_transactions(self, label: str = "", prune: bool = True) -> dict | None:
+        """Back up the transactions file (only chunks not already stored are written); None without a file."""
+        if not os.path.exists(TRANSACTIONS_FILE):
+            return None
+        manifest = self.backup_store.backup(TRANSACTIONS_FILE, label)
+        if prune:
+            self.backup_store.prune(**self.backup_retention())
+        self.update_backup_table()
+        return manifest
+
+    def update_backup_table(self):
+        if not self._tab_ready("Settings"):
+            return
+        snaps = self.backup_store.snapshots()[::-1]
+        self.backup_table.setRowCount(len(snaps))
+        for r, snap in enumerate(snaps):
+            cells = [snap["created"].replace("T", " "), snap.get("label", ""),
+                     memory_report.format_bytes(snap["size"]), memory_report.format_bytes(snap.get("new_bytes", 0))]
+            for c, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if c >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if c == 0:
+                    item.setData(Qt.UserRole, snap["id"])
+                self.backup_table.setItem(r, c, item)
+        self.backup_table.resizeColumnsToContents()
+        history_bytes = sum(snap["size"] for snap in snaps)
+        self.backup_info_label.setText(
+            f"{len(snaps)} backup(s) covering {memory_report.format_bytes(history_bytes)} of files, "
+            f"stored in <b>{memory_report.format_bytes(self.backup_store.stored_bytes())}</b> "
+            f"(unchanged chunks are shared between backups)")
+
+    def restore_selected_backup(self):
+        row = self.backup_table.currentRow()
+        if row < 0:
+            QMessageBox.warning(self, "No Selection", "Select a backup to restore.")
+            return
+        item = self.backup_table.item(row, 0)
+        reply = QMessageBox.question(
+            self, "Restore Backup",
+            f"Replace all transactions with the backup from {item.text()}?\n\n"
+            "The current transactions are backed up first, and Edit → Undo reverts the restore. "
+            "Account balances are adjusted for the applied transactions that change.",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        self._restore_backup(item.data(Qt.UserRole))
+
+    @undoable("Restore backup")
+    def _restore_backup(self, snapshot_id: str):
+        self._load_all_months()   # the undo step must hold the rows of every month the restore replaces
+        try:
+            # Not pruned until after the restore: the backup being restored may be the one retention drops
+            self.backup_transactions("Before restore", prune=False)
+            self.backup_store.restore(snapshot_id, TRANSACTIONS_FILE)
+        except Exception as e:
+            QMessageBox.warning(self, "Restore Backup", f"Could not restore the backup:\n{e}")
+            return
+        before = {a["name"]: self.ledger.applied_total(a["name"]) for a in self.accounts}
+        self.df = self._in_memory_order(self.load_transactions(keep=None))
+        self.repair_transaction_ids(save=True)
+        self.data_version += 1         # reloaded from disk: derived indexes must rebuild
+        self.ledger.rebuild(self.df, self._page_base["ledger"])
+        # Balances follow the applied rows that came back or went away, as they do for edits and deletes
+        self._apply_balance_deltas({name: self.ledger.applied_total(name) - total for name, total in before.items()})
+        try:
+            self.backup_store.prune(**self.backup_retention())
+        except Exception:
+            pass
+        self.update_backup_table()
+        self.update_table()
+        self.update_summary()
+        self.update_budgets_table()
+        self.update_dashboard_tab()
+        self.refresh_reports()
+        QMessageBox.information(self, "Restore Backup", f"Restored {len(self.df):,} transaction(s).")
+
     def update_settings_info(self):
         ov = self.settings.get("today_override")
         if ov:
@@ -2893,6 +4158,8 @@ class FinanceApp(QWidget):
     # ---------------- Tab change hook ----------------
     def on_tab_change(self, index):
         name = self.tabs.tabText(index)
+        if self._ensure_tab_built(name):
+            return  # init_* already filled the tab from current data
         if name == "Budgets":
             self.update_budgets_table()
         elif name == "Accounts":
@@ -2906,6 +4173,8 @@ class FinanceApp(QWidget):
             self.update_categories_table()
         elif name == "Reports":
             self.refresh_reports()
+        elif name == "Settings":
+            self.update_perf_table()
 
 
 # ----------------------------
@@ -2913,10 +4182,27 @@ class FinanceApp(QWidget):
 # ----------------------------
 if __name__ == "__main__":
     print("Launching app...")
-    app = QApplication(sys.argv)
+    print_startup_report = "--startup-report" in sys.argv
+    argv = [a for a in sys.argv if a not in ("--startup-report", "--startup-trace-alloc")]
+    with STARTUP.phase("qapplication"):
+        app = QApplication(argv)
     try:
         window = FinanceApp()
-        window.show()
+        with STARTUP.phase("show"):
+            window.show()
+
+        def _on_first_paint():
+            report = STARTUP.finish(transactions=int(len(window.df)))
+            print(f"Window ready in {report['total_ms']:.0f} ms")
+            try:
+                perf.append_startup_report(report)
+            except Exception as e:
+                print(f"Could not write {perf.STARTUP_PROFILE_FILE}: {e}")
+            if print_startup_report:
+                print(perf.format_startup_report(report))
+
+        # Report cold start once the first paint has been processed
+        QTimer.singleShot(0, _on_first_paint)
         sys.exit(app.exec())
     except Exception:
         import traceback
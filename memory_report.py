@@ -0,0 +1,145 @@
+# memory_report.py
+"""
+Memory footprint of the in-memory ledger, and compaction of the transaction frame.
+
+Sizes are what the process actually holds, not what pandas reports:
+memory_usage(deep=True) adds sys.getsizeof of every cell of an object column,
+so a value repeated in 10,000 rows is counted 10,000 times even when the rows
+share one str object (read_csv shares them within a chunk). column_bytes
+counts the 8-byte pointer per row plus each distinct object once.
+
+Rows appended by imports and edits do not share their strings with the rest
+of the column, and the import wizard appends AppliedToBalance as "True"/"False"
+strings. compact_frame undoes both: every object column is rebuilt from its
+distinct values (interned with sys.intern, so e.g. a vendor string is one
+object however many rows name it), and AppliedToBalance/Amount go back to the
+bool/float64 dtypes load_transactions gives them.
+
+Text columns stay object dtype rather than Categorical: the app writes new
+values into self.df in place (.at/.loc for a new category, vendor or transfer
+group), which a Categorical rejects. Amount stays float64: float32 only holds
+cents exactly below $167,772.16, and budget/rollup sums would accumulate in it.
+"""
+import sys
+import types
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+_TRUE_STRINGS = ("true", "1", "yes")
+_LEAVES = {str, int, float, bool, bytes, type(None)}   # sized without looking inside
+# Not followed by deep_sizeof: shared code and interpreter objects, not data
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} GB"
+
+
+def column_bytes(values) -> int:
+    """Bytes held by a column: its buffer, plus each distinct object once for object dtype."""
+    arr = values.to_numpy() if isinstance(values, (pd.Series, pd.Index)) else np.asarray(values)
+    if arr.dtype != object:
+        return int(arr.nbytes)
+    distinct = dict(zip(map(id, arr), arr))
+    return int(arr.nbytes) + sum(map(sys.getsizeof, distinct.values()))
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    return column_bytes(df.index) + sum(column_bytes(df[c]) for c in df.columns)
+
+
+def frame_rows(df: pd.DataFrame) -> list[dict]:
+    """One report row per column of df, plus its index: {"item", "kind", "entries", "bytes"}."""
+    rows = []
+    for c in df.columns:
+        col = df[c]
+        kind = str(col.dtype)
+        if col.dtype == object:
+            kind += f", {col.nunique(dropna=False):,} distinct"
+        rows.append({"item": c, "kind": kind, "entries": len(col), "bytes": column_bytes(col)})
+    rows.append({"item": "(index)", "kind": type(df.index).__name__, "entries": len(df.index),
+                 "bytes": column_bytes(df.index)})
+    return rows
+
+
+def deep_sizeof(obj) -> int:
+    """Approximate bytes held by obj and everything it references (each object once)."""
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        if type(o) in _LEAVES:
+            size += sys.getsizeof(o)
+        elif isinstance(o, _OPAQUE):
+            continue
+        elif isinstance(o, pd.DataFrame):
+            size += frame_bytes(o)
+        elif isinstance(o, (pd.Series, pd.Index)):
+            size += column_bytes(o)
+        elif isinstance(o, np.ndarray):
+            size += sys.getsizeof(o) + (int(o.nbytes) if o.base is not None else 0)
+        else:
+            size += sys.getsizeof(o)
+            if isinstance(o, dict):
+                stack.extend(o.keys())
+                stack.extend(o.values())
+            elif isinstance(o, (list, tuple, set, frozenset, deque)):
+                stack.extend(o)
+            elif hasattr(o, "__dict__"):
+                stack.append(vars(o))
+    return size
+
+
+def entries(obj) -> int | None:
+    """len(obj), or None for objects without a length."""
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+def compact_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    """
+    A copy of df holding the same values in less memory, and what was changed (one line per column).
+    Values compare equal to df's; the index is kept.
+    """
+    out = df.copy(deep=False)
+    changes = []
+    if "AppliedToBalance" in out.columns and out["AppliedToBalance"].dtype != bool:
+        flags = out["AppliedToBalance"]
+        out["AppliedToBalance"] = flags.map(
+            lambda v: v.strip().lower() in _TRUE_STRINGS if isinstance(v, str) else pd.notna(v) and bool(v)
+        ).astype(bool)
+        changes.append(f"AppliedToBalance: {flags.dtype} -> bool")
+    if "Amount" in out.columns and out["Amount"].dtype != np.float64:
+        amounts = pd.to_numeric(out["Amount"], errors="coerce")
+        # Only when nothing would be lost (text that does not parse stays as it is)
+        if not (amounts.isna() & out["Amount"].notna()).any():
+            changes.append(f"Amount: {out['Amount'].dtype} -> float64")
+            out["Amount"] = amounts.astype(np.float64)
+    for c in out.columns:
+        col = out[c]
+        if col.dtype != object:
+            continue
+        before = column_bytes(col)
+        codes, uniques = pd.factorize(col)
+        shared = np.empty(len(uniques), dtype=object)
+        shared[:] = [sys.intern(u) if type(u) is str else u for u in uniques]
+        values = col.to_numpy(dtype=object, copy=True)   # missing cells (code -1) keep their own NA value
+        hit = codes >= 0
+        values[hit] = shared[codes[hit]]
+        out[c] = pd.Series(values, index=out.index, dtype=object)
+        after = column_bytes(out[c])
+        if after < before:
+            changes.append(f"{c}: {len(uniques):,} distinct values shared, {format_bytes(before - after)} freed")
+    return out, changes
@@ -0,0 +1,350 @@
+# month_store.py
+"""
+The transactions file, read and written one month at a time.
+
+sample_transactions.csv stays the single file the rest of the app works with
+(backups, imports, benchmarks), but it is written grouped by month and comes
+with an index (transactions_index.json, tied to the file by its size and
+mtime). For each month, the index holds:
+
+- the byte ranges of its rows, so loading a month is a seek plus one read_csv
+  of those bytes;
+- its row count, count of pending (not applied) rows and largest numeric Id;
+- the aggregates the app keeps over the whole history: applied cents per
+  account per day (balance history, ledger.daily_applied), expense cents per
+  category per day (budget spend index, budget_engine.daily_spend) and the
+  month's Reports tables (rollups.month_tables).
+
+FinanceApp keeps only some months in self.df: recent months, the ranges the
+views show, and months with pending rows. The rest of the history reaches it
+through base(), the summed aggregates of the months that are not loaded. So
+memory follows the windows on screen, not the length of the ledger. Older
+months are read when something asks for them, such as a Custom Range, a
+report's partial edge month or undoing an old edit. They are dropped again
+once nothing shows them.
+
+write() streams the file month by month. Loaded months come from the frame;
+every other month is copied byte for byte from the current file. The new file
+then replaces the old one, and the index is updated from what was written.
+
+A file without a matching index is scanned once, in blocks, with flat memory.
+Some files cannot be paged safely: a different header, blank or duplicate
+Ids, or rows that the scan and pandas count differently. For those, open()
+returns False and the app loads the whole file, as before. The next save
+rewrites such a file in the paged layout.
+"""
+import io
+import json
+import os
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+import budget_engine
+import ledger
+import rollups
+
+DATELESS = -1            # month code of rows whose Date does not parse (always loaded)
+SCAN_BLOCK = 1 << 22     # bytes read per step when indexing a file
+COPY_BLOCK = 1 << 20     # bytes per read when copying a month that is not loaded
+INDEX_VERSION = 1
+
+
+def fingerprint(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def row_months(df: pd.DataFrame) -> np.ndarray:
+    """Month code (year * 12 + month - 1) of each row, DATELESS where the Date does not parse."""
+    out = np.full(len(df), DATELESS, dtype="int64")
+    if not len(df):
+        return out
+    dates = pd.to_datetime(df["Date"], errors="coerce")
+    ok = dates.notna().to_numpy()
+    if ok.any():
+        valid = dates[ok]
+        out[ok] = valid.dt.year.to_numpy() * 12 + valid.dt.month.to_numpy() - 1
+    return out
+
+
+def months_between(start, end) -> set[int]:
+    """Month codes from the month of start through the month of end."""
+    first, last = rollups.month_code(start), rollups.month_code(end)
+    return set(range(first, last + 1))
+
+
+# ---------- index entries
+def _summary(part: pd.DataFrame, month: int) -> dict:
+    """Index entry (without byte ranges) of one month's rows, part being app-normalized."""
+    ids = pd.to_numeric(part["Id"], errors="coerce")
+    return {
+        "runs": [],
+        "rows": len(part),
+        "pending": int((~part["AppliedToBalance"].astype(bool)).sum()),
+        "max_id": int(ids.max()) if ids.notna().any() else None,
+        "ledger": ledger.daily_applied(part),
+        "spend": budget_engine.daily_spend(part),
+        "tables": rollups.month_tables(part).get(month),
+    }
+
+
+def _summaries(df: pd.DataFrame, months: np.ndarray) -> dict[int, dict]:
+    return {int(m): _summary(part, int(m)) for m, part in df.groupby(months, sort=False)}
+
+
+def _add_nested(dst: dict, src: dict):
+    for name, days in src.items():
+        into = dst.setdefault(name, {})
+        for day, cents in days.items():
+            into[day] = into.get(day, 0) + cents
+
+
+def _add_cells(dst: list, src: list):
+    for k in range(3):
+        dst[k] += src[k]
+
+
+def _merge(into: dict, entry: dict):
+    """Fold a later piece of the same month (a month split across scan blocks) into its entry."""
+    into["rows"] += entry["rows"]
+    into["pending"] += entry["pending"]
+    ids = [i for i in (into["max_id"], entry["max_id"]) if i is not None]
+    into["max_id"] = max(ids) if ids else None
+    _add_nested(into["ledger"], entry["ledger"])
+    _add_nested(into["spend"], entry["spend"])
+    if entry["tables"] is not None:
+        if into["tables"] is None:
+            into["tables"] = {"totals": [0, 0, 0], "category": {}, "account": {}}
+        _add_cells(into["tables"]["totals"], entry["tables"]["totals"])
+        for dim in ("category", "account"):
+            for name, cells in entry["tables"][dim].items():
+                _add_cells(into["tables"][dim].setdefault(name, [0, 0, 0]), cells)
+
+
+def _entry_to_json(entry: dict) -> dict:
+    out = dict(entry)
+    for key in ("ledger", "spend"):
+        out[key] = {name: sorted(days.items()) for name, days in entry[key].items()}
+    return out
+
+
+def _entry_from_json(data: dict) -> dict:
+    entry = dict(data)
+    for key in ("ledger", "spend"):
+        entry[key] = {name: {int(day): int(cents) for day, cents in pairs} for name, pairs in data[key].items()}
+    return entry
+
+
+def _copy_runs(src, out, runs):
+    """Copy byte ranges of src to out, each ending with a line break."""
+    for start, end in runs:
+        src.seek(start)
+        left, last = end - start, b""
+        while left > 0:
+            block = src.read(min(COPY_BLOCK, left))
+            if not block:
+                break
+            out.write(block)
+            left -= len(block)
+            last = block
+        if last and not last.endswith(b"\n"):
+            out.write(b"\n")
+
+
+class MonthStore:
+    """Month index of a transactions CSV, with reads of chosen months and month-by-month saves."""
+
+    def __init__(self, path: str, index_path: str, columns: list[str], normalize):
+        self.path = path
+        self.index_path = index_path
+        self.columns = list(columns)
+        self.normalize = normalize         # read_csv(dtype=str) frame -> app frame, row by row
+        self.months: dict[int, dict] = {}  # month code -> index entry
+        self.paged = False                 # the index describes the file on disk
+
+    # ---------- index
+    def open(self) -> bool:
+        """Index the file (reusing the saved index while it matches). False: load the file whole instead."""
+        self.months, self.paged = {}, False
+        source = fingerprint(self.path)
+        if source is None:
+            self.paged = True   # no file yet: the first write creates it and its index
+            return True
+        try:
+            with open(self.index_path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = {}
+        if (saved.get("version") == INDEX_VERSION and saved.get("source") == source
+                and saved.get("columns") == self.columns):
+            try:
+                self.months = {int(m): _entry_from_json(e) for m, e in saved["months"].items()}
+                self.paged = True
+                return True
+            except (KeyError, TypeError, ValueError):
+                self.months = {}
+        try:
+            months = self._scan()
+        except (OSError, ValueError, pd.errors.ParserError):
+            months = None
+        if months is None:
+            return False
+        self.months = months
+        self.paged = True
+        self._save_index()
+        return True
+
+    def _scan(self) -> dict[int, dict] | None:
+        """Index entries of every month, read in blocks; None when the file cannot be paged."""
+        months: dict[int, dict] = {}
+        hashes = []
+        with open(self.path, "rb") as f:
+            header = f.readline()
+            if pd.read_csv(io.BytesIO(header), dtype=str, nrows=0).columns.tolist() != self.columns:
+                return None
+            offset, data = len(header), b""
+            while True:
+                block = f.read(SCAN_BLOCK)
+                data += block
+                if not block and data and not data.endswith(b"\n"):
+                    data += b"\n"   # last row without a line break
+                buf = np.frombuffer(data, dtype=np.uint8)
+                # A "\n" ends a row unless it is inside quotes (an odd number of quotes before it)
+                ends = np.flatnonzero((buf == 10) & ((np.cumsum(buf == 34) & 1) == 0))
+                if len(ends):
+                    cut = int(ends[-1]) + 1
+                    if not self._scan_rows(header, data[:cut], ends, offset, months, hashes):
+                        return None
+                    offset, data = offset + cut, data[cut:]
+                if not block:
+                    break
+        if data.strip():
+            return None   # an unterminated quote swallowed the end of the file
+        ids = np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+        if len(np.unique(ids)) != len(ids):
+            return None
+        return months
+
+    def _scan_rows(self, header: bytes, data: bytes, ends: np.ndarray, offset: int, months: dict, hashes: list) -> bool:
+        """Add the rows in data (ends: offset of each row's "\\n") to months; False if they cannot be paged."""
+        buf = np.frombuffer(data, dtype=np.uint8)
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        length = ends - starts
+        length -= (length > 0) & (buf[np.maximum(ends - 1, 0)] == 13)   # "\r\n"
+        keep = length > 0   # read_csv skips blank lines
+        raw = pd.read_csv(io.BytesIO(header + data), dtype=str)
+        if len(raw) != int(keep.sum()):
+            return False
+        ids = raw["Id"]
+        if ids.isna().any() or (ids.str.strip() != ids).any():
+            return False   # FinanceApp repairs Ids on a full load
+        hashes.append(pd.util.hash_array(ids.to_numpy(dtype=object)))
+        frame = self.normalize(raw)
+        codes = row_months(frame)
+        starts, stops = starts[keep] + offset, ends[keep] + 1 + offset
+        cuts = np.flatnonzero(np.diff(codes)) + 1
+        for lo, hi in zip(np.concatenate(([0], cuts)), np.concatenate((cuts, [len(codes)]))):
+            runs = months.setdefault(int(codes[lo]), {"runs": [], "rows": 0, "pending": 0, "max_id": None,
+                                                      "ledger": {}, "spend": {}, "tables": None})["runs"]
+            start, stop = int(starts[lo]), int(stops[hi - 1])
+            if runs and runs[-1][1] == start:
+                runs[-1][1] = stop
+            else:
+                runs.append([start, stop])
+        for month, entry in _summaries(frame, codes).items():
+            _merge(months[month], entry)
+        return True
+
+    def _save_index(self):
+        data = {
+            "version": INDEX_VERSION,
+            "source": fingerprint(self.path),
+            "columns": self.columns,
+            "months": {str(m): _entry_to_json(e) for m, e in sorted(self.months.items())},
+        }
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(json.dumps(data, separators=(",", ":")))   # one-shot: the C encoder
+        os.replace(tmp, self.index_path)
+
+    # ---------- queries
+    def rows(self) -> int:
+        return sum(e["rows"] for e in self.months.values())
+
+    def max_id(self) -> int | None:
+        ids = [e["max_id"] for e in self.months.values() if e["max_id"] is not None]
+        return max(ids) if ids else None
+
+    def pending_months(self) -> set[int]:
+        return {m for m, e in self.months.items() if e["pending"]}
+
+    def span(self) -> tuple[int, int] | None:
+        """(first, last) month code with rows, dateless rows aside."""
+        dated = [m for m in self.months if m != DATELESS]
+        return (min(dated), max(dated)) if dated else None
+
+    def base(self, loaded) -> dict:
+        """Summed aggregates of the indexed months not in loaded: {"ledger", "spend", "tables"}."""
+        by_account, by_category, tables = {}, {}, {}
+        for month, entry in self.months.items():
+            if month in loaded:
+                continue
+            _add_nested(by_account, entry["ledger"])
+            _add_nested(by_category, entry["spend"])
+            if entry["tables"] is not None:
+                tables[month] = entry["tables"]
+        return {"ledger": by_account, "spend": by_category, "tables": tables}
+
+    # ---------- reads / writes
+    def read_months(self, months) -> pd.DataFrame:
+        """The rows of the given months (file order), normalized like a full load."""
+        runs = sorted(run for m in months if m in self.months for run in self.months[m]["runs"])
+        buf = io.BytesIO()
+        buf.write((",".join(self.columns) + "\n").encode("utf-8"))
+        if runs:
+            with open(self.path, "rb") as f:
+                _copy_runs(f, buf, runs)
+        buf.seek(0)
+        return self.normalize(pd.read_csv(buf, dtype=str))
+
+    def write(self, frame: pd.DataFrame, loaded):
+        """
+        Save frame, which must hold every row of the months in loaded (and no other rows). Months
+        not in loaded are copied from the current file; the result is grouped by month.
+        """
+        frame = frame[self.columns]
+        codes = row_months(frame)
+        parts = {int(m): part for m, part in frame.groupby(codes, sort=False)}
+        stray = set(parts) - set(loaded)
+        if stray:
+            raise ValueError(f"rows of months that are not loaded: {sorted(stray)}")
+        summaries = _summaries(self.normalize(frame.copy(deep=False)), codes)
+        order = sorted(set(parts) | (set(self.months) - set(loaded)))
+        months = {}
+        tmp = self.path + ".tmp"
+        src = open(self.path, "rb") if set(self.months) - set(loaded) else None
+        try:
+            with open(tmp, "wb") as out:
+                out.write(frame.iloc[0:0].to_csv(index=False).encode("utf-8"))
+                for month in order:
+                    start = out.tell()
+                    if month in parts:
+                        out.write(parts[month].to_csv(index=False, header=False).encode("utf-8"))
+                        entry = summaries[month]
+                    else:
+                        entry = dict(self.months[month])
+                        _copy_runs(src, out, entry["runs"])
+                    entry["runs"] = [[start, out.tell()]]
+                    months[month] = entry
+        finally:
+            if src is not None:
+                src.close()
+        os.replace(tmp, self.path)
+        self.months = months
+        self.paged = True
+        self._save_index()
@@ -0,0 +1,435 @@
+# native_charts.py
+"""
+QPainter chart backend (Settings > Chart renderer > Native).
+
+Drop-in counterparts of the chart objects in charts.py: DonutChart,
+PairedBarChart and LineChart take the same constructor arguments and the same
+show() / message() / clear() calls, but draw on a NativeCanvas (a plain
+QWidget) instead of a Matplotlib figure. A refresh only stores the new numbers
+and schedules a repaint; paintEvent draws vectors straight onto the widget, so
+there is no offscreen Agg raster to fill and copy, and Matplotlib is never
+imported.
+
+The look follows the Matplotlib charts (dark background, Matplotlib's default
+color cycle, y grid lines, frameless legends) without trying to match them
+pixel for pixel.
+"""
+import datetime
+import math
+
+from PySide6.QtCore import Qt, QPointF, QRectF, QSize
+from PySide6.QtGui import QColor, QFont, QFontMetricsF, QPainter, QPainterPath, QPen, QPolygonF
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+from charts import DONUT_RING_WIDTH
+
+# Matplotlib's default color cycle, so a series gets the same color with either renderer
+PALETTE = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+           "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
+PAD = 8.0
+MAX_X_LABELS = 12
+MAX_DATE_LABELS = 8
+
+
+class NativeCanvas(QWidget):
+    """Widget the native charts paint on; stands in for main.MplCanvas."""
+
+    def __init__(self, width=4, height=3, dpi=100, background: str = "#121212", parent=None):
+        super().__init__(parent)
+        self._size_hint = QSize(int(width * dpi), int(height * dpi))
+        self.background = QColor(background)
+        self.chart = None        # chart object currently shown (the last one that drew)
+        self.render_key = None   # inputs of what the canvas currently shows (see needs_render)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def sizeHint(self) -> QSize:
+        return self._size_hint
+
+    def minimumSizeHint(self) -> QSize:
+        return QSize(10, 10)
+
+    def needs_render(self, key) -> bool:
+        """False when the canvas already shows these inputs; otherwise remembers key and returns True."""
+        if key == self.render_key:
+            return False
+        self.render_key = key
+        return True
+
+    def set_dark(self):
+        pass   # always painted dark
+
+    def draw(self):
+        self.update()
+
+    def paintEvent(self, _event):
+        p = QPainter(self)
+        p.setRenderHint(QPainter.Antialiasing)
+        p.fillRect(self.rect(), self.background)
+        if self.chart is not None:
+            self.chart.paint(p, QRectF(self.rect()))
+        p.end()
+
+
+def _color(value, index: int, alpha: float = 1.0) -> QColor:
+    color = QColor(value) if value else QColor(PALETTE[index % len(PALETTE)])
+    color.setAlphaF(alpha)
+    return color
+
+
+def _nice_ticks(lo: float, hi: float, target: int = 5) -> list[float]:
+    """Round tick values (1/2/2.5/5 x 10^k steps) covering lo..hi."""
+    if not hi > lo:
+        hi = lo + 1.0
+    raw = (hi - lo) / target
+    mag = 10 ** math.floor(math.log10(raw))
+    step = next(m * mag for m in (1, 2, 2.5, 5, 10) if m * mag >= raw)
+    first = math.ceil(lo / step - 1e-9)
+    last = math.floor(hi / step + 1e-9)
+    return [k * step for k in range(first, last + 1)]
+
+
+def _default_format(value, _pos=None) -> str:
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.2f}"
+
+
+class _NativeChart:
+    """Message / legend / axes painting shared by the chart types."""
+
+    def __init__(self, canvas: NativeCanvas, dark_fig: str, dark_ax: str, text_color: str,
+                 grid_color: str = "#2a2a2a"):
+        self.canvas = canvas
+        self.dark_fig = dark_fig
+        self.dark_ax = dark_ax
+        self.text_color = QColor(text_color)
+        self.grid_color = QColor(grid_color)
+        self._message = None
+
+    # ---------- state
+    def _show(self, message: str | None = None):
+        self._message = message
+        self.canvas.chart = self
+        self.canvas.update()
+
+    def clear(self):
+        """Blank canvas (nothing drawn until the next show)."""
+        self._reset()
+        self._show("")
+
+    def message(self, text: str):
+        """Centered note instead of a chart ("No data")."""
+        self._reset()
+        self._show(text)
+
+    def _reset(self):
+        pass
+
+    def paint(self, p: QPainter, rect: QRectF):
+        if self._message is not None:
+            p.setPen(self.text_color)
+            p.drawText(rect, Qt.AlignCenter, self._message)
+            return
+        self._paint(p, rect)
+
+    def _paint(self, p: QPainter, rect: QRectF):
+        """Draw the chart's data; subclasses override it (a bare chart paints an empty canvas)."""
+
+    # ---------- pieces
+    def _legend(self, p: QPainter, rect: QRectF, entries: list[tuple], loc: str = "upper right",
+                point_size: float | None = None):
+        """entries: [(label, QColor, marker)] with marker "box", "line" or "dash"."""
+        if not entries:
+            return
+        p.save()
+        if point_size:
+            font = QFont(p.font())
+            font.setPointSizeF(point_size)
+            p.setFont(font)
+        fm = QFontMetricsF(p.font())
+        row = fm.height() * 1.3
+        swatch = fm.height() * (0.8 if entries[0][2] == "box" else 1.6)
+        width = swatch + PAD * 0.75 + max(fm.horizontalAdvance(label) for label, _, _ in entries)
+        x = rect.left() + PAD if loc.endswith("left") else rect.right() - PAD - width
+        if loc.startswith("center"):
+            y = rect.center().y() - row * len(entries) / 2
+        else:
+            y = rect.top() + PAD * 0.5
+        for label, color, marker in entries:
+            mid = y + row / 2
+            if marker == "box":
+                p.fillRect(QRectF(x, mid - swatch / 2, swatch, swatch), color)
+            else:
+                pen = QPen(color, 2.0)
+                if marker == "dash":
+                    pen.setStyle(Qt.DashLine)
+                p.setPen(pen)
+                p.drawLine(QPointF(x, mid), QPointF(x + swatch, mid))
+            p.setPen(self.text_color)
+            text_rect = QRectF(x + swatch + PAD * 0.75, y, rect.right() - x - swatch, row)
+            p.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                       fm.elidedText(label, Qt.ElideRight, text_rect.width()))
+            y += row
+        p.restore()
+
+    def _plot_area(self, p: QPainter, rect: QRectF, y_labels: list[str], x_labels: list[str],
+                   rotate: bool, ylabel: str | None) -> QRectF:
+        """Rect left for the data once tick labels (and the y label) have their room."""
+        fm = QFontMetricsF(p.font())
+        left = PAD + max((fm.horizontalAdvance(t) for t in y_labels), default=0.0) + PAD / 2
+        if ylabel:
+            left += fm.height() + PAD / 2
+        widest_x = max((fm.horizontalAdvance(t) for t in x_labels), default=0.0)
+        if rotate:
+            bottom = PAD + (widest_x + fm.height()) * math.sin(math.radians(45))
+            right = PAD
+        else:
+            bottom = PAD + fm.height() + 4
+            right = PAD + widest_x / 2
+        return QRectF(rect.left() + left, rect.top() + PAD, max(rect.width() - left - right, 1.0),
+                      max(rect.height() - PAD - bottom, 1.0))
+
+    def _y_axis(self, p: QPainter, plot: QRectF, ticks: list[float], labels: list[str], to_y,
+                ylabel: str | None):
+        fm = QFontMetricsF(p.font())
+        grid = QColor(self.grid_color)
+        grid.setAlphaF(0.5)
+        for value, label in zip(ticks, labels):
+            y = to_y(value)
+            p.setPen(QPen(grid, 1.0))
+            p.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            p.setPen(self.text_color)
+            p.drawText(QRectF(plot.left() - PAD / 2 - 200, y - fm.height() / 2, 200, fm.height()),
+                       Qt.AlignRight | Qt.AlignVCenter, label)
+        p.setPen(QPen(self.grid_color, 1.0))
+        p.drawLine(QPointF(plot.left(), plot.bottom()), QPointF(plot.right(), plot.bottom()))
+        if ylabel:
+            p.save()
+            p.setPen(self.text_color)
+            p.translate(PAD + fm.height() / 2, plot.center().y())
+            p.rotate(-90)
+            p.drawText(QRectF(-plot.height() / 2, -fm.height() / 2, plot.height(), fm.height()),
+                       Qt.AlignCenter, ylabel)
+            p.restore()
+
+    def _x_labels(self, p: QPainter, plot: QRectF, ticks: list[tuple[float, str]], rotate: bool):
+        fm = QFontMetricsF(p.font())
+        p.setPen(self.text_color)
+        for x, label in ticks:
+            if rotate:
+                # right end of the text at the tick, like ha='right' with rotation=45
+                width = fm.horizontalAdvance(label) + 2
+                p.save()
+                p.translate(x, plot.bottom() + 4)
+                p.rotate(-45)
+                p.drawText(QRectF(-width, 0, width, fm.height()), Qt.AlignRight | Qt.AlignTop, label)
+                p.restore()
+            else:
+                p.drawText(QRectF(x - 100, plot.bottom() + 4, 200, fm.height()), Qt.AlignHCenter | Qt.AlignTop, label)
+
+
+class DonutChart(_NativeChart):
+    """Donut with a legend on the right and a total in the middle."""
+
+    def __init__(self, canvas, dark_fig: str, dark_ax: str, text_color: str, grid_color: str = "#2a2a2a"):
+        super().__init__(canvas, dark_fig, dark_ax, text_color, grid_color)
+        self._labels = []
+        self._values = []
+        self._center = ""
+
+    def _reset(self):
+        self._labels, self._values, self._center = [], [], ""
+
+    def show(self, labels: list[str], values: list[float], center_text: str):
+        self._labels = list(labels)
+        self._values = [max(float(v), 0.0) for v in values]
+        self._center = center_text
+        self._show()
+
+    def _paint(self, p: QPainter, rect: QRectF):
+        fm = QFontMetricsF(p.font())
+        legend_width = min(rect.width() * 0.45,
+                           fm.height() * 0.8 + PAD * 2.75 + max((fm.horizontalAdvance(t) for t in self._labels), default=0.0))
+        area = rect.adjusted(PAD, PAD, -legend_width - PAD, -PAD)
+        diameter = max(min(area.width(), area.height()), 1.0)
+        outer = QRectF(area.center().x() - diameter / 2, area.center().y() - diameter / 2, diameter, diameter)
+        hole = diameter * (1.0 - DONUT_RING_WIDTH)
+        inner = QRectF(outer.center().x() - hole / 2, outer.center().y() - hole / 2, hole, hole)
+
+        total = sum(self._values) or 1.0
+        edge = QPen(QColor(self.dark_fig), 1.0)
+        start = 90.0   # same as Axes.pie(startangle=90): counterclockwise from 12 o'clock
+        for i, value in enumerate(self._values):
+            span = 360.0 * value / total
+            path = QPainterPath()
+            path.arcMoveTo(outer, start)
+            path.arcTo(outer, start, span)
+            path.arcTo(inner, start + span, -span)
+            path.closeSubpath()
+            p.fillPath(path, _color(None, i))
+            p.strokePath(path, edge)
+            start += span
+
+        p.save()
+        font = QFont(p.font())
+        font.setPointSizeF(12)
+        font.setBold(True)
+        p.setFont(font)
+        p.setPen(self.text_color)
+        p.drawText(inner, Qt.AlignCenter, self._center)
+        p.restore()
+
+        legend_rect = QRectF(outer.right(), rect.top(), rect.right() - outer.right(), rect.height())
+        self._legend(p, legend_rect, [(label, _color(None, i), "box") for i, label in enumerate(self._labels)],
+                     loc="center left")
+
+
+class PairedBarChart(_NativeChart):
+    """Side-by-side bar series over category labels (e.g. income vs expenses per month)."""
+
+    def __init__(self, canvas, dark_fig: str, dark_ax: str, text_color: str, grid_color: str,
+                 bar_width: float = 0.38):
+        super().__init__(canvas, dark_fig, dark_ax, text_color, grid_color)
+        self.bar_width = bar_width
+        self._reset()
+
+    def _reset(self):
+        self._labels, self._series = [], []
+        self._ylabel, self._format, self._rotate = None, _default_format, True
+
+    def show(self, labels: list[str], series: list[tuple], ylabel: str | None = None,
+             yformatter=None, rotate: bool = True):
+        """labels: x tick labels; series: [(legend label, values, color or None)]."""
+        self._labels = [str(t) for t in labels]
+        self._series = [(name, [float(v) for v in values], color) for name, values, color in series]
+        self._ylabel = ylabel
+        self._format = yformatter or _default_format
+        self._rotate = rotate
+        self._show()
+
+    def _paint(self, p: QPainter, rect: QRectF):
+        peak = max((v for _, values, _ in self._series for v in values), default=0.0)
+        top = peak * 1.08 if peak > 0 else 1.0
+        ticks = [t for t in _nice_ticks(0.0, top) if t <= top]
+        tick_labels = [self._format(t, None) for t in ticks]
+        plot = self._plot_area(p, rect, tick_labels, self._labels, self._rotate, self._ylabel)
+
+        def to_y(value):
+            return plot.bottom() - value / top * plot.height()
+
+        self._y_axis(p, plot, ticks, tick_labels, to_y, self._ylabel)
+        n = max(len(self._labels), 1)
+        slot = plot.width() / n
+        width = slot * self.bar_width
+        for k, (_, values, color) in enumerate(self._series):
+            fill = _color(color, k)
+            offset = (k - (len(self._series) - 1) / 2) * width
+            for i, value in enumerate(values):
+                y = to_y(max(value, 0.0))
+                p.fillRect(QRectF(plot.left() + slot * (i + 0.5) + offset - width / 2, y, width, plot.bottom() - y), fill)
+        self._x_labels(p, plot, [(plot.left() + slot * (i + 0.5), t) for i, t in enumerate(self._labels)],
+                       self._rotate)
+        self._legend(p, plot, [(name, _color(color, k), "box") for k, (name, _, color) in enumerate(self._series)])
+
+
+class LineChart(_NativeChart):
+    """Line series over dates or positions (net worth, forecast, trailing totals)."""
+
+    def __init__(self, canvas, dark_fig: str, dark_ax: str, text_color: str, grid_color: str):
+        super().__init__(canvas, dark_fig, dark_ax, text_color, grid_color)
+        self._reset()
+
+    def _reset(self):
+        self._x, self._series, self._ticks = [], [], []
+        self._format, self._fill, self._zero, self._legend_opts = _default_format, False, False, None
+
+    def show(self, x: list, series: list[tuple], yformatter=None, xticklabels: list[str] | None = None,
+             fill: bool = False, zero_line: bool = False, legend: dict | None = None):
+        """Same arguments as charts.LineChart.show (style keys used: color, linewidth, linestyle, alpha)."""
+        dates = bool(x) and isinstance(x[0], datetime.date)
+        self._x = [d.toordinal() for d in x] if dates else [float(v) for v in x]
+        self._series = [(name, [float(v) for v in values], style) for name, values, style in series]
+        if xticklabels is not None:
+            step = max(1, len(self._x) // MAX_X_LABELS)
+            self._ticks = list(zip(self._x, xticklabels))[::step]
+        elif dates:
+            self._ticks = self._date_ticks(x[0], x[-1])
+        else:
+            self._ticks = [(v, f"{v:g}") for v in self._x]
+        self._format = yformatter or _default_format
+        self._fill, self._zero, self._legend_opts = fill, zero_line, legend
+        self._show()
+
+    @staticmethod
+    def _date_ticks(first: datetime.date, last: datetime.date) -> list[tuple[float, str]]:
+        """Month starts (or days for short spans), thinned to at most MAX_DATE_LABELS."""
+        if (last - first).days < 45:
+            days = [first + datetime.timedelta(days=k) for k in range((last - first).days + 1)]
+            ticks = [(d.toordinal(), d.strftime("%m-%d")) for d in days]
+        else:
+            ticks = []
+            y, m = first.year, first.month
+            while (y, m) <= (last.year, last.month):
+                d = datetime.date(y, m, 1)
+                if d >= first:
+                    ticks.append((d.toordinal(), d.strftime("%Y-%m")))
+                y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+        step = max(1, math.ceil(len(ticks) / MAX_DATE_LABELS))
+        return ticks[::step]
+
+    def _paint(self, p: QPainter, rect: QRectF):
+        values = [v for _, vals, _ in self._series for v in vals]
+        if not values or not self._x:
+            return
+        lo, hi = min(values), max(values)
+        if self._zero:
+            lo, hi = min(lo, 0.0), max(hi, 0.0)
+        margin = (hi - lo) * 0.05 or max(abs(hi) * 0.05, 1.0)
+        lo, hi = lo - margin, hi + margin
+        ticks = [t for t in _nice_ticks(lo, hi) if lo <= t <= hi]
+        tick_labels = [self._format(t, None) for t in ticks]
+        plot = self._plot_area(p, rect, tick_labels, [t for _, t in self._ticks], True, None)
+
+        x0, x1 = self._x[0], self._x[-1]
+        span = (x1 - x0) or 1.0
+
+        def to_x(value):
+            return plot.left() + plot.width() * (0.05 + 0.9 * (value - x0) / span)
+
+        def to_y(value):
+            return plot.bottom() - (value - lo) / (hi - lo) * plot.height()
+
+        self._y_axis(p, plot, ticks, tick_labels, to_y, None)
+        if self._zero:
+            p.setPen(QPen(self.grid_color, 1.0))
+            p.drawLine(QPointF(plot.left(), to_y(0.0)), QPointF(plot.right(), to_y(0.0)))
+
+        p.save()
+        p.setClipRect(plot)
+        entries = []
+        for k, (name, vals, style) in enumerate(self._series):
+            color = _color(style.get("color"), k, style.get("alpha", 1.0))
+            points = QPolygonF([QPointF(to_x(x), to_y(v)) for x, v in zip(self._x, vals)])
+            if self._fill and k == 0:
+                base = to_y(min(vals))
+                area = QPolygonF(points)
+                area.append(QPointF(to_x(self._x[len(vals) - 1]), base))
+                area.append(QPointF(to_x(self._x[0]), base))
+                shade = QColor(color)
+                shade.setAlphaF(0.15)
+                p.setPen(Qt.NoPen)
+                p.setBrush(shade)
+                p.drawPolygon(area)
+                p.setBrush(Qt.NoBrush)
+            pen = QPen(color, float(style.get("linewidth", 1.5)))
+            dashed = style.get("linestyle") in ("--", "dashed")
+            if dashed:
+                pen.setStyle(Qt.DashLine)
+            p.setPen(pen)
+            p.drawPolyline(points)
+            entries.append((name, color, "dash" if dashed else "line"))
+        p.restore()
+
+        self._x_labels(p, plot, [(to_x(x), label) for x, label in self._ticks], True)
+        if self._legend_opts is not None:
+            self._legend(p, plot, entries, loc=self._legend_opts.get("loc", "upper right"),
+                         point_size=self._legend_opts.get("fontsize"))
@@ -0,0 +1,289 @@
+# perf.py
+"""
+Performance instrumentation for FinanceTool.
+
+Stdlib only, so it can be imported before Qt/pandas and time their imports.
+"""
+import os
+import sys
+import json
+import math
+import time
+import platform
+import threading
+import datetime
+import functools
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+STARTUP_PROFILE_FILE = "startup_profile.json"
+STARTUP_HISTORY_LIMIT = 50   # launches kept in the JSON history
+
+
+# ----------------------------
+# Process memory (resident set size)
+# ----------------------------
+def _rss_bytes_windows() -> int:
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    handle = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+        return 0
+    return int(counters.WorkingSetSize)
+
+def rss_bytes() -> int:
+    """Current resident memory of this process in bytes (0 if unavailable)."""
+    try:
+        if sys.platform == "win32":
+            return _rss_bytes_windows()
+        if os.path.exists("/proc/self/statm"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+    except Exception:
+        return 0
+
+
+# ----------------------------
+# Startup profiler
+# ----------------------------
+class StartupProfiler:
+    """
+    Records wall-clock time and memory growth for each startup phase.
+    - Phases are flat (not nested) and recorded in order.
+    - RSS delta is always recorded; Python allocations (tracemalloc) only when
+      trace_alloc=True, because tracing slows imports down several times over.
+    - Once finish() is called, phase() becomes a no-op.
+    """
+    def __init__(self, enabled: bool = True, trace_alloc: bool = False):
+        self.enabled = enabled
+        self.trace_alloc = bool(enabled and trace_alloc)
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self._current = None
+        self.finished = not enabled
+        if self.trace_alloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000.0
+
+    def start(self, name: str):
+        """Begin a phase explicitly (use phase() where a with-block fits)."""
+        if self.finished:
+            return
+        self._current = {
+            "name": name,
+            "start": time.perf_counter(),
+            "rss": rss_bytes(),
+        }
+        if self.trace_alloc:
+            self._current["py"] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+    def stop(self):
+        """End the phase begun with start()."""
+        cur = getattr(self, "_current", None)
+        if self.finished or cur is None:
+            return
+        self._current = None
+        entry = {
+            "name": cur["name"],
+            "start_ms": round((cur["start"] - self.t0) * 1000.0, 2),
+            "ms": round((time.perf_counter() - cur["start"]) * 1000.0, 2),
+            "rss_kb": round((rss_bytes() - cur["rss"]) / 1024.0, 1),
+        }
+        if self.trace_alloc:
+            py_now, py_peak = tracemalloc.get_traced_memory()
+            entry["alloc_kb"] = round((py_now - cur["py"]) / 1024.0, 1)
+            entry["peak_kb"] = round((py_peak - cur["py"]) / 1024.0, 1)
+        self.phases.append(entry)
+
+    @contextmanager
+    def phase(self, name: str):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def finish(self, **extra) -> dict:
+        """Stop profiling and return the report for this launch."""
+        report = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "total_ms": round(self.elapsed_ms(), 2),
+            "rss_kb": round(rss_bytes() / 1024.0, 1),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "trace_alloc": self.trace_alloc,
+            "phases": list(self.phases),
+        }
+        report.update(extra)
+        self.finished = True
+        if self.trace_alloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return report
+
+
+def append_startup_report(report: dict, path: str = STARTUP_PROFILE_FILE, limit: int = STARTUP_HISTORY_LIMIT):
+    """Append a launch report to the JSON history file, keeping the last `limit` runs."""
+    runs = []
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                runs = json.load(f).get("runs", [])
+        except Exception:
+            runs = []
+    runs.append(report)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"runs": runs[-limit:]}, f, indent=2)
+
+
+def format_startup_report(report: dict) -> str:
+    """Human-readable phase breakdown (for --startup-report)."""
+    total = float(report.get("total_ms") or 0.0) or 1.0
+    show_alloc = bool(report.get("trace_alloc"))
+    lines = [f"Startup phases ({report.get('timestamp', '')})"]
+    header = f"{'Phase':<32}{'ms':>10}{'%':>7}{'RSS +KB':>11}"
+    if show_alloc:
+        header += f"{'Alloc KB':>11}{'Peak KB':>11}"
+    lines.append(header)
+    lines.append("-" * len(header))
+    for p in report.get("phases", []):
+        line = f"{p['name']:<32}{p['ms']:>10.1f}{p['ms'] / total * 100:>6.1f}%{p['rss_kb']:>11.0f}"
+        if show_alloc:
+            line += f"{p.get('alloc_kb', 0):>11.0f}{p.get('peak_kb', 0):>11.0f}"
+        lines.append(line)
+    lines.append("-" * len(header))
+    lines.append(f"{'Total (to first paint)':<32}{report.get('total_ms', 0):>10.1f}")
+    lines.append(f"Resident memory at first paint: {report.get('rss_kb', 0) / 1024.0:.1f} MB")
+    return "\n".join(lines)
+
+
+# ----------------------------
+# Hot-path operation timers
+# ----------------------------
+OP_SAMPLE_LIMIT = 2048   # latencies kept per operation for percentiles (most recent calls)
+
+class OpTimers:
+    """
+    Per-operation call counts, latency and rows processed.
+    Disabled by default; while disabled, timed() wrappers only check a flag.
+    Safe to record from worker threads (the dashboard snapshot runs on one).
+    """
+    def __init__(self):
+        self.enabled = False
+        self._ops = {}   # name -> {"calls", "total_ms", "max_ms", "rows", "samples"}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, ms: float, rows: int = 0):
+        with self._lock:
+            op = self._ops.get(name)
+            if op is None:
+                op = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0,
+                      "samples": deque(maxlen=OP_SAMPLE_LIMIT)}
+                self._ops[name] = op
+            op["calls"] += 1
+            op["total_ms"] += ms
+            op["rows"] += rows
+            if ms > op["max_ms"]:
+                op["max_ms"] = ms
+            op["samples"].append(ms)
+
+    def reset(self):
+        with self._lock:
+            self._ops = {}
+
+    def snapshot(self) -> dict:
+        """{op: {calls, total_ms, mean_ms, p50_ms, p95_ms, p99_ms, max_ms, rows}} sorted by total time."""
+        with self._lock:
+            ops = [(name, dict(op, samples=list(op["samples"]))) for name, op in self._ops.items()]
+        out = {}
+        for name, op in sorted(ops, key=lambda kv: -kv[1]["total_ms"]):
+            samples = sorted(op["samples"])
+            out[name] = {
+                "calls": op["calls"],
+                "total_ms": round(op["total_ms"], 3),
+                "mean_ms": round(op["total_ms"] / op["calls"], 3) if op["calls"] else 0.0,
+                "p50_ms": round(_percentile(samples, 50), 3),
+                "p95_ms": round(_percentile(samples, 95), 3),
+                "p99_ms": round(_percentile(samples, 99), 3),
+                "max_ms": round(op["max_ms"], 3),
+                "rows": op["rows"],
+            }
+        return out
+
+    def export_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "exported_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "sample_limit": OP_SAMPLE_LIMIT,
+                "ops": self.snapshot(),
+            }, f, indent=2)
+
+
+def _percentile(sorted_samples, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    k = max(0, min(len(sorted_samples) - 1, math.ceil(pct / 100.0 * len(sorted_samples)) - 1))
+    return float(sorted_samples[k])
+
+
+TIMERS = OpTimers()
+
+def timed(name: str | None = None, rows=None):
+    """
+    Decorator: record each call's latency in TIMERS when enabled.
+    rows(*args, result) -> int gives the number of rows the call processed.
+    """
+    def deco(fn):
+        op_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TIMERS.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            result = None
+            try:
+                result = fn(*args, **kwargs)
+                return result
+            finally:
+                ms = (time.perf_counter() - start) * 1000.0
+                n = 0
+                if rows is not None:
+                    try:
+                        n = int(rows(*args, result))
+                    except Exception:
+                        n = 0
+                TIMERS.record(op_name, ms, n)
+        return wrapper
+    return deco
+
+@contextmanager
+def timer(name: str, rows: int = 0):
+    """Context-manager form of timed() for ad-hoc blocks."""
+    if not TIMERS.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        TIMERS.record(name, (time.perf_counter() - start) * 1000.0, rows)
@@ -0,0 +1,182 @@
+# recurring.py
+"""
+Recurring transaction / subscription detection.
+
+One pass over the ledger sorted by (vendor key, direction, date):
+- rows are grouped by a normalized vendor key (the caller passes the key
+  function, e.g. main._vendor_root) and by sign, so refunds don't mix with charges
+- same-day charges within a group are merged
+- inter-arrival gaps and amount spread are computed with NumPy over the whole
+  sorted array, then reduced per group
+
+A group is recurring when its median gap matches a cadence (weekly, biweekly,
+monthly, quarterly, annual), most gaps fall within that cadence's tolerance and
+the amount barely varies. The next expected date is projected from the last one.
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+# name, nominal days between charges, tolerance (days), occurrences per year
+CADENCES = [
+    ("weekly", 7.0, 1.0, 52.0),
+    ("biweekly", 14.0, 2.0, 26.0),
+    ("monthly", 30.44, 4.0, 12.0),
+    ("quarterly", 91.31, 8.0, 4.0),
+    ("annual", 365.25, 15.0, 1.0),
+]
+_CALENDAR_MONTHS = {"monthly": 1, "quarterly": 3, "annual": 12}
+
+RESULT_COLUMNS = ["Vendor", "Key", "Category", "Account", "Cadence", "IntervalDays", "Amount",
+                  "AmountCV", "Count", "FirstDate", "LastDate", "NextDate", "Active", "MonthlyAmount"]
+
+
+_KEY_MEMO: dict = {}           # key function -> {raw vendor: key}
+_KEY_MEMO_LIMIT = 250_000
+
+
+def _empty() -> pd.DataFrame:
+    return pd.DataFrame(columns=RESULT_COLUMNS)
+
+
+def _default_key(vendor: str) -> str:
+    return vendor.strip().lower()
+
+
+def _vendor_keys(vendors, key_fn=None) -> list[str]:
+    """key_fn(v) for each vendor, memoized so re-detection after an edit only keys new vendors."""
+    key_fn = key_fn or _default_key
+    memo = _KEY_MEMO.setdefault(key_fn, {})
+    if len(memo) > _KEY_MEMO_LIMIT:
+        memo.clear()
+    out = []
+    for v in vendors:
+        k = memo.get(v)
+        if k is None:
+            k = memo[v] = key_fn(v)
+        out.append(k)
+    return out
+
+
+def detect_recurring(df: pd.DataFrame, vendor_key=None, today: datetime.date | None = None,
+                     min_occurrences: int = 3, min_regularity: float = 0.75,
+                     max_amount_cv: float = 0.25) -> pd.DataFrame:
+    """
+    Recurring series in df, one row per (vendor key, direction), RESULT_COLUMNS,
+    largest monthly amount first. Amount keeps its sign (negative = charge).
+    vendor_key maps a raw vendor string to its grouping key (default: lower-case).
+    """
+    if df is None or df.empty or not {"Date", "Vendor", "Amount"}.issubset(df.columns):
+        return _empty()
+    today = today or datetime.date.today()
+
+    amount = pd.to_numeric(df["Amount"], errors="coerce").to_numpy(dtype="float64")
+    dates = pd.to_datetime(df["Date"], errors="coerce")
+    mask = ~np.isnan(amount) & dates.notna().to_numpy() & (amount != 0)
+    for col in ("Type", "Category"):
+        if col in df.columns:
+            mask &= (df[col].astype(str).str.lower() != "transfer").to_numpy()
+    if not mask.any():
+        return _empty()
+
+    vendors = df["Vendor"].astype(str).to_numpy()[mask]
+    categories = (df["Category"].astype(str).to_numpy() if "Category" in df.columns else np.full(len(df), ""))[mask]
+    accounts = (df["Account"].astype(str).to_numpy() if "Account" in df.columns else np.full(len(df), ""))[mask]
+    amount = amount[mask]
+    days = dates.to_numpy()[mask].astype("datetime64[D]").astype("int64")
+
+    # Vendor key computed once per distinct raw vendor (and remembered across calls)
+    uniq, inverse = np.unique(vendors, return_inverse=True)
+    keys = np.array(_vendor_keys(uniq, vendor_key), dtype=object)[inverse]
+    key_code, key_labels = pd.factorize(keys)
+    group = key_code * 2 + (amount > 0)
+    valid = keys != ""
+
+    # --- the single sorted pass
+    order = np.lexsort((days, group))
+    order = order[valid[order]]
+    if len(order) == 0:
+        return _empty()
+    g, d, a = group[order], days[order], amount[order]
+
+    # merge same-day charges within a group
+    run_start = np.r_[True, (g[1:] != g[:-1]) | (d[1:] != d[:-1])]
+    run_id = np.cumsum(run_start) - 1
+    rg, rd = g[run_start], d[run_start]
+    ra = np.bincount(run_id, weights=a)
+    last_row = np.r_[np.flatnonzero(run_start)[1:] - 1, len(g) - 1]   # last original row of each run
+
+    same_group = np.r_[False, rg[1:] == rg[:-1]]
+    gaps = np.where(same_group, np.diff(rd, prepend=rd[0]), np.nan).astype("float64")
+
+    runs = pd.DataFrame({"g": rg, "day": rd, "amt": ra, "gap": gaps, "row": order[last_row]})
+    per = runs.groupby("g", sort=False)
+    stats = pd.DataFrame({
+        "count": per["day"].size(),
+        "first": per["day"].min(),
+        "last": per["day"].max(),
+        "mean_amt": per["amt"].mean(),
+        "std_amt": per["amt"].std(ddof=0),
+        "median_gap": per["gap"].median(),
+        "row": per["row"].last(),
+    })
+    stats = stats[stats["count"] >= min_occurrences]
+    if stats.empty:
+        return _empty()
+
+    # --- cadence from the median gap (first cadence whose tolerance band contains it)
+    nominal = np.array([c[1] for c in CADENCES])
+    tolerance = np.array([c[2] for c in CADENCES])
+    within = np.abs(stats["median_gap"].to_numpy()[:, None] - nominal[None, :]) <= tolerance[None, :]
+    has_cadence = within.any(axis=1)
+    stats = stats[has_cadence]
+    if stats.empty:
+        return _empty()
+    cadence_idx = within[has_cadence].argmax(axis=1)
+    stats["cadence"] = cadence_idx
+
+    # regularity: share of gaps within the chosen cadence's tolerance
+    runs = runs[runs["g"].isin(stats.index)]
+    idx_for_run = stats["cadence"].reindex(runs["g"]).to_numpy()
+    on_beat = np.abs(runs["gap"].to_numpy() - nominal[idx_for_run]) <= tolerance[idx_for_run]
+    regular = pd.Series(on_beat, index=runs["g"].to_numpy()).groupby(level=0).sum()
+    stats["regularity"] = regular.reindex(stats.index).to_numpy() / (stats["count"] - 1)
+    stats["cv"] = (stats["std_amt"] / stats["mean_amt"].abs()).fillna(0.0)
+    stats = stats[(stats["regularity"] >= min_regularity) & (stats["cv"] <= max_amount_cv)]
+    if stats.empty:
+        return _empty()
+
+    # --- next expected date: calendar step for monthly and longer, median gap otherwise
+    last = pd.to_datetime(stats["last"].to_numpy().astype("datetime64[D]"))
+    next_dates = pd.Series(last + pd.to_timedelta(stats["median_gap"].round().to_numpy(), unit="D"), index=stats.index)
+    for i, (name, *_rest) in enumerate(CADENCES):
+        months = _CALENDAR_MONTHS.get(name)
+        sel = (stats["cadence"] == i).to_numpy()
+        if months and sel.any():
+            next_dates[sel] = (last[sel] + pd.DateOffset(months=months)).to_numpy()
+
+    today_ord = np.datetime64(today, "D").astype("int64")
+    cad = stats["cadence"].to_numpy()
+    active = (today_ord - stats["last"].to_numpy()) <= nominal[cad] * 1.5 + tolerance[cad]
+    per_year = np.array([c[3] for c in CADENCES])[cad]
+    rows = stats["row"].to_numpy()
+    epoch = np.datetime64("1970-01-01", "D")
+
+    out = pd.DataFrame({
+        "Vendor": vendors[rows],
+        "Key": key_labels[(stats.index.to_numpy() // 2)],
+        "Category": categories[rows],
+        "Account": accounts[rows],
+        "Cadence": [CADENCES[i][0] for i in cad],
+        "IntervalDays": stats["median_gap"].to_numpy(),
+        "Amount": stats["mean_amt"].round(2).to_numpy(),
+        "AmountCV": stats["cv"].round(3).to_numpy(),
+        "Count": stats["count"].to_numpy(),
+        "FirstDate": (epoch + stats["first"].to_numpy().astype("timedelta64[D]")).astype(str),
+        "LastDate": (epoch + stats["last"].to_numpy().astype("timedelta64[D]")).astype(str),
+        "NextDate": pd.to_datetime(next_dates.to_numpy()).strftime("%Y-%m-%d"),
+        "Active": active,
+        "MonthlyAmount": (stats["mean_amt"].to_numpy() * per_year / 12.0).round(2),
+    })
+    return out.sort_values("MonthlyAmount", key=lambda s: -s.abs(), kind="stable").reset_index(drop=True)
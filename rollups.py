@@ -0,0 +1,342 @@
+# rollups.py
+"""
+Month-level rollups for Reports.
+
+Income and expense totals (cents) are kept per month, per (month, category)
+and per (month, account). A report over any date range reads whole months
+straight from these tables; only a partial first/last month is summed from
+that month's own rows. So the cost of a refresh depends on the number of
+months shown, not on the ledger size.
+
+Maintenance is incremental: every row's contribution and a hash of the
+columns that feed it are remembered by Id. sync(df) hashes the frame in one
+vectorized pass and re-applies only the rows that were added, changed or
+removed.
+
+The month tables (not the per-row state) can be saved to JSON together with a
+fingerprint of the transactions file, so Reports can be drawn at startup
+without regrouping the ledger; the per-row state is built on the first sync.
+
+Months whose rows are not loaded (see month_store.py) are passed to
+rebuild/sync as a base: their finished tables from the transactions index,
+added to the row-level ones. Partial-month queries only sum loaded rows, so
+the app loads the edge months of a report range.
+"""
+import datetime
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+HASH_COLUMNS = ["Date", "Category", "Account", "Amount"]
+
+
+def month_code(day: datetime.date) -> int:
+    return day.year * 12 + day.month - 1
+
+
+def month_label(code: int) -> str:
+    return f"{code // 12:04d}-{code % 12 + 1:02d}"
+
+
+def _month_bounds(code: int) -> tuple[int, int]:
+    """(first, last) day ordinal of a month code."""
+    first = datetime.date(code // 12, code % 12 + 1, 1)
+    nxt = datetime.date(code // 12 + (code % 12 == 11), (code % 12 + 1) % 12 + 1, 1)
+    return first.toordinal(), nxt.toordinal() - 1
+
+
+def _row_hashes(df: pd.DataFrame) -> pd.Series:
+    """Id -> hash of the columns a row contributes through (duplicate Id: last row wins)."""
+    cols = [c for c in HASH_COLUMNS if c in df.columns]
+    hashes = pd.Series(pd.util.hash_pandas_object(df[cols], index=False).to_numpy(),
+                       index=df["Id"].astype(str).to_numpy())
+    return hashes[~hashes.index.duplicated(keep="last")]
+
+
+def _frame_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Id, Month, Day, Category, Account, Cents per row (Month/Day -1 when the date or amount is unusable)."""
+    dates = pd.to_datetime(df["Date"], errors="coerce")
+    cents = (pd.to_numeric(df["Amount"], errors="coerce") * 100).round()
+    ok = (dates.notna() & cents.notna()).to_numpy()
+    day = np.full(len(df), -1, dtype="int64")
+    month = np.full(len(df), -1, dtype="int64")
+    if ok.any():
+        valid = dates[ok]
+        # datetime64[D] counts from 1970-01-01, ordinal 719163
+        day[ok] = valid.to_numpy().astype("datetime64[D]").astype("int64") + 719163
+        month[ok] = valid.dt.year.to_numpy() * 12 + valid.dt.month.to_numpy() - 1
+    return pd.DataFrame({
+        "Id": df["Id"].astype(str).to_numpy(),
+        "Month": month,
+        "Day": day,
+        "Category": df["Category"].astype(str).to_numpy() if "Category" in df.columns else "",
+        "Account": df["Account"].astype(str).to_numpy() if "Account" in df.columns else "",
+        "Cents": cents.fillna(0).astype("int64").to_numpy(),
+    })
+
+
+def _group_tables(valid: pd.DataFrame, totals: dict, by_cat: dict, by_acct: dict):
+    """Add [income, expense, rows] per month, month+category and month+account of _frame_rows output."""
+    valid = valid.assign(Income=valid["Cents"].clip(lower=0), Expense=(-valid["Cents"]).clip(lower=0))
+    for key, table in ((None, totals), ("Category", by_cat), ("Account", by_acct)):
+        by = ["Month"] if key is None else ["Month", key]
+        agg = valid.groupby(by, sort=False).agg(Income=("Income", "sum"), Expense=("Expense", "sum"),
+                                                Rows=("Cents", "size"))
+        for idx, inc, exp, n in zip(agg.index.tolist(), agg["Income"].tolist(),
+                                    agg["Expense"].tolist(), agg["Rows"].tolist()):
+            if key is None:
+                table[idx] = [inc, exp, n]
+            else:
+                table[idx[0]][idx[1]] = [inc, exp, n]
+
+
+def month_tables(df) -> dict[int, dict]:
+    """{month: {"totals": [income, expense, rows], "category": {...}, "account": {...}}} of df's rows."""
+    if df is None or df.empty or not {"Id", "Date", "Amount"}.issubset(df.columns):
+        return {}
+    rows = _frame_rows(df)
+    valid = rows[rows["Month"] >= 0]
+    if valid.empty:
+        return {}
+    totals, by_cat, by_acct = {}, defaultdict(dict), defaultdict(dict)
+    _group_tables(valid, totals, by_cat, by_acct)
+    return {m: {"totals": t, "category": by_cat.get(m, {}), "account": by_acct.get(m, {})}
+            for m, t in totals.items()}
+
+
+def _frame_entries(rows: pd.DataFrame):
+    """(Id, (month, day, category, account, cents)) for each row of _frame_rows output."""
+    return zip(rows["Id"].tolist(), zip(rows["Month"].tolist(), rows["Day"].tolist(), rows["Category"].tolist(),
+                                        rows["Account"].tolist(), rows["Cents"].tolist()))
+
+
+class MonthlyRollup:
+    """Income / expense cents per month, per month+category and per month+account."""
+
+    def __init__(self):
+        self._totals: dict[int, list] = {}                  # month -> [income, expense, rows]
+        self._by_cat: dict[int, dict] = defaultdict(dict)    # month -> {category: [income, expense, rows]}
+        self._by_acct: dict[int, dict] = defaultdict(dict)   # month -> {account: [income, expense, rows]}
+        self._rows: dict[str, tuple] = {}                    # Id -> (month, day, category, account, cents)
+        self._month_ids: dict[int, set] = defaultdict(set)   # month -> {Id}
+        self._hashes: pd.Series | None = None                # Id -> row hash; None until rows are known
+        self._base: dict[int, dict] = {}                     # month -> month_tables() entry of rows not in df
+
+    @classmethod
+    def from_frame(cls, df, base=None) -> "MonthlyRollup":
+        rollup = cls()
+        rollup.rebuild(df, base)
+        return rollup
+
+    @property
+    def has_rows(self) -> bool:
+        """False for tables loaded from disk (no per-row state until the first sync)."""
+        return self._hashes is not None
+
+    # ---------- bulk
+    def rebuild(self, df, base=None):
+        """Tables and per-row state from df, plus the base month tables (month -> month_tables() entry)."""
+        self._totals.clear()
+        self._by_cat.clear()
+        self._by_acct.clear()
+        self._rows.clear()
+        self._month_ids.clear()
+        self._hashes = pd.Series(dtype="uint64")
+        self._base = {}
+        if df is not None and not df.empty and {"Id", "Date", "Amount"}.issubset(df.columns):
+            self._hashes = _row_hashes(df)
+            rows = _frame_rows(df).drop_duplicates("Id", keep="last")
+            valid = rows[rows["Month"] >= 0]
+            if not valid.empty:
+                _group_tables(valid, self._totals, self._by_cat, self._by_acct)
+                for tx_id, entry in _frame_entries(valid):
+                    self._rows[tx_id] = entry
+                    self._month_ids[entry[0]].add(tx_id)
+        self._set_base(base or {})
+
+    def sync(self, df, base=None) -> int:
+        """
+        Bring the tables in line with df and the base month tables, touching only changed rows and
+        months. Returns how many rows changed.
+        """
+        if not self.has_rows:
+            self.rebuild(df, base)
+            return len(self._rows)
+        if df is None or df.empty or not {"Id", "Date", "Amount"}.issubset(df.columns):
+            changed = len(self._rows)
+            self.rebuild(df, base)
+            return changed
+        new = _row_hashes(df)
+        old = self._hashes.reindex(new.index)
+        changed_ids = new.index[(old.isna() | (old.to_numpy() != new.to_numpy())).to_numpy()]
+        gone = self._hashes.index.difference(new.index)
+        dirty = df.iloc[0:0]
+        if len(changed_ids):
+            dirty = df[df["Id"].astype(str).isin(changed_ids)]
+        dirty = _frame_rows(dirty).drop_duplicates("Id", keep="last")
+        for tx_id in gone:
+            self._remove(tx_id)
+        for tx_id, entry in _frame_entries(dirty):
+            self._remove(tx_id)
+            if entry[0] >= 0:
+                self._add(tx_id, entry)
+        self._hashes = new
+        self._set_base(base or {})
+        return len(dirty) + len(gone)
+
+    # ---------- persistence
+    def to_json(self) -> dict:
+        def table(nested):
+            return {month_label(m): entries for m, entries in sorted(nested.items()) if entries}
+        return {
+            "totals": {month_label(m): v for m, v in sorted(self._totals.items())},
+            "category": table(self._by_cat),
+            "account": table(self._by_acct),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "MonthlyRollup":
+        def code(label):
+            y, m = label.split("-")
+            return int(y) * 12 + int(m) - 1
+        rollup = cls()
+        rollup._totals = {code(k): list(v) for k, v in data.get("totals", {}).items()}
+        for src, dst in ((data.get("category", {}), rollup._by_cat), (data.get("account", {}), rollup._by_acct)):
+            for label, entries in src.items():
+                dst[code(label)] = {name: list(v) for name, v in entries.items()}
+        return rollup
+
+    # ---------- queries
+    def months(self) -> list[int]:
+        return sorted(self._totals)
+
+    def monthly_totals(self, start=None, end=None) -> pd.DataFrame:
+        """Income and Expense (positive amounts) per month label with activity in [start, end]."""
+        out = {}
+        for m, (inc, exp, _n) in self._collect(start, end, None).items():
+            if inc or exp:
+                out[month_label(m)] = (inc / 100.0, exp / 100.0)
+        frame = pd.DataFrame.from_dict(out, orient="index", columns=["Income", "Expense"])
+        return frame.sort_index()
+
+    def category_totals(self, start=None, end=None, kind: str = "expense") -> pd.Series:
+        """{category: positive income or expense total} over [start, end], largest first."""
+        return self._dimension_totals(start, end, "category", kind)
+
+    def account_totals(self, start=None, end=None, kind: str = "expense") -> pd.Series:
+        return self._dimension_totals(start, end, "account", kind)
+
+    def trailing_twelve(self, end_month: int, months: int = 24) -> pd.DataFrame:
+        """Trailing-12-month Income/Expense sums for each of the last `months` months up to end_month."""
+        first = end_month - months - 10
+        codes = range(first, end_month + 1)
+        inc = np.array([self._totals.get(m, (0, 0, 0))[0] for m in codes], dtype="float64")
+        exp = np.array([self._totals.get(m, (0, 0, 0))[1] for m in codes], dtype="float64")
+        kernel = np.ones(12)
+        t_inc = np.convolve(inc, kernel, mode="valid") / 100.0
+        t_exp = np.convolve(exp, kernel, mode="valid") / 100.0
+        labels = [month_label(m) for m in codes[11:]]
+        return pd.DataFrame({"Income": t_inc, "Expense": t_exp}, index=labels)
+
+    def year_over_year(self, year: int, kind: str = "expense") -> pd.DataFrame:
+        """Monthly totals of year and year - 1 side by side (index Jan..Dec as 1..12)."""
+        col = 0 if kind == "income" else 1
+        data = {}
+        for y in (year - 1, year):
+            data[str(y)] = [self._totals.get(y * 12 + k, (0, 0, 0))[col] / 100.0 for k in range(12)]
+        return pd.DataFrame(data, index=range(1, 13))
+
+    # ---------- internals
+    def _collect(self, start, end, dim) -> dict:
+        """Sum [income, expense, rows] over [start, end] keyed by month (dim None) or by category/account."""
+        months = self.months()
+        if not months:
+            return {}
+        lo = start.toordinal() if start is not None else _month_bounds(months[0])[0]
+        hi = end.toordinal() if end is not None else _month_bounds(months[-1])[1]
+        if hi < lo:
+            return {}
+        first_m = month_code(datetime.date.fromordinal(lo))
+        last_m = month_code(datetime.date.fromordinal(hi))
+        acc = defaultdict(lambda: [0, 0, 0])
+        for m in months:
+            if m < first_m or m > last_m:
+                continue
+            m_lo, m_hi = _month_bounds(m)
+            if lo <= m_lo and m_hi <= hi:
+                if dim is None:
+                    entries = {m: self._totals[m]}
+                else:
+                    entries = (self._by_cat if dim == "category" else self._by_acct).get(m, {})
+                for key, (inc, exp, n) in entries.items():
+                    a = acc[key]
+                    a[0] += inc
+                    a[1] += exp
+                    a[2] += n
+                continue
+            # partial month: sum its own rows
+            if not self.has_rows:
+                raise LookupError("partial-month query needs per-row state; sync() first")
+            for tx_id in self._month_ids.get(m, ()):
+                month, day, cat, acct, cents = self._rows[tx_id]
+                if lo <= day <= hi:
+                    a = acc[m if dim is None else (cat if dim == "category" else acct)]
+                    a[0] += max(cents, 0)
+                    a[1] += max(-cents, 0)
+                    a[2] += 1
+        return acc
+
+    def _dimension_totals(self, start, end, dim: str, kind: str) -> pd.Series:
+        col = 0 if kind == "income" else 1
+        totals = {k: v[col] / 100.0 for k, v in self._collect(start, end, dim).items() if v[col]}
+        return pd.Series(totals, dtype="float64").sort_values(ascending=False, kind="stable")
+
+    def _set_base(self, base: dict[int, dict]):
+        """Swap the base tables for base, re-applying only the months whose entry changed."""
+        for month, tables in self._base.items():
+            if base.get(month) != tables:
+                self._add_tables(month, tables, -1)
+        for month, tables in base.items():
+            if self._base.get(month) != tables:
+                self._add_tables(month, tables, 1)
+        self._base = dict(base)
+
+    def _add_tables(self, month: int, tables: dict, sign: int):
+        cells = [(self._totals, month, tables["totals"])]
+        cells += [(self._by_cat[month], cat, v) for cat, v in tables.get("category", {}).items()]
+        cells += [(self._by_acct[month], acct, v) for acct, v in tables.get("account", {}).items()]
+        for table, key, (inc, exp, n) in cells:
+            cell = table.setdefault(key, [0, 0, 0])
+            cell[0] += sign * inc
+            cell[1] += sign * exp
+            cell[2] += sign * n
+            if cell[2] == 0:
+                del table[key]
+
+    def _add(self, tx_id: str, entry: tuple):
+        month, _day, cat, acct, cents = entry
+        self._rows[tx_id] = entry
+        self._month_ids[month].add(tx_id)
+        inc, exp = max(cents, 0), max(-cents, 0)
+        for cell in (self._totals.setdefault(month, [0, 0, 0]),
+                     self._by_cat[month].setdefault(cat, [0, 0, 0]),
+                     self._by_acct[month].setdefault(acct, [0, 0, 0])):
+            cell[0] += inc
+            cell[1] += exp
+            cell[2] += 1
+
+    def _remove(self, tx_id: str):
+        entry = self._rows.pop(tx_id, None)
+        if entry is None:
+            return
+        month, _day, cat, acct, cents = entry
+        self._month_ids[month].discard(tx_id)
+        inc, exp = max(cents, 0), max(-cents, 0)
+        for table, key in ((self._totals, month), (self._by_cat[month], cat), (self._by_acct[month], acct)):
+            cell = table[key]
+            cell[0] -= inc
+            cell[1] -= exp
+            cell[2] -= 1
+            if cell[2] == 0:
+                del table[key]
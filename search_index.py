@@ -0,0 +1,108 @@
+# search_index.py
+"""
+Inverted token index for the Transactions search box.
+
+The index is over distinct cell values, not rows: each Vendor, Category and
+Account value gets an integer id and is split into tokens once (the tokenizer
+auto-categorization uses, passed in by the app); every token maps to the ids
+of the values that contain it. A query is tokenized the same way and each of
+its tokens matches as a prefix ("star bu" finds "Starbucks Burnaby"): the
+prefix range is found by bisecting the sorted vocabulary and the values of
+the tokens in that range are unioned.
+
+Rows are reached through the snapshot's factorized columns: the app maps each
+column's distinct values to value ids once per data version, and a query then
+turns the matched ids into a row mask with two numpy takes (value id -> hit,
+code -> hit). A keystroke costs the matching tokens plus one pass over the
+codes, with no string work per row.
+
+Maintenance is incremental: value_ids() only tokenizes values the index has
+not seen, so an edit or an import tokenizes just the new vendors/categories.
+Values that disappear from the ledger stay in the index; they match no rows.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+SEARCH_COLUMNS = ["Vendor", "Category", "Account"]
+MAX_CACHED_PREFIXES = 256
+
+
+class TokenIndex:
+    """tokenizer: str -> list of lower-case tokens (e.g. main._vendor_tokens)."""
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self._ids = {}                      # cell value -> value id (ids are never reused)
+        self._postings = defaultdict(list)  # token -> [value id]
+        self._vocab = None                  # sorted tokens, rebuilt after the vocabulary grows
+        self._prefixes = {}                 # prefix -> array of value ids, cleared when values are added
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ---------- maintenance
+    def value_ids(self, values) -> np.ndarray:
+        """Value ids for values (str), tokenizing the ones not seen yet."""
+        ids = self._ids
+        out = np.empty(len(values), dtype=np.int64)
+        added = False
+        for i, value in enumerate(values):
+            vid = ids.get(value)
+            if vid is None:
+                vid = ids[value] = len(ids)
+                for t in dict.fromkeys(self.tokenizer(value)):
+                    posting = self._postings[t]
+                    if not posting:
+                        self._vocab = None
+                    posting.append(vid)
+                added = True
+            out[i] = vid
+        if added:
+            self._prefixes = {}
+        return out
+
+    # ---------- queries
+    def terms(self, query: str) -> tuple:
+        return tuple(dict.fromkeys(self.tokenizer(query or "")))
+
+    def ids_with_prefix(self, prefix: str) -> np.ndarray:
+        hit = self._prefixes.get(prefix)
+        if hit is not None:
+            return hit
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        vocab = self._vocab
+        i = bisect_left(vocab, prefix)
+        matched = []
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            matched.extend(self._postings[vocab[i]])
+            i += 1
+        hit = np.asarray(matched, dtype=np.int64)
+        if len(self._prefixes) >= MAX_CACHED_PREFIXES:
+            self._prefixes.clear()
+        self._prefixes[prefix] = hit
+        return hit
+
+    def mask(self, query: str, columns: list[tuple]) -> np.ndarray | None:
+        """
+        Rows matching every query token as a prefix in any of the columns; None when the query has no
+        tokens. columns: [(codes, value ids)] where codes come from pd.factorize (-1 = missing) and
+        value ids = value_ids(distinct values).
+        """
+        terms = self.terms(query)
+        if not terms or not columns:
+            return None
+        out = None
+        for term in terms:
+            matched = np.zeros(len(self._ids), dtype=bool)
+            matched[self.ids_with_prefix(term)] = True
+            term_mask = np.zeros(len(columns[0][0]), dtype=bool)
+            for codes, vids in columns:
+                # Trailing False so code -1 (missing) never matches
+                term_mask |= np.append(matched[vids], False)[codes]
+            out = term_mask if out is None else out & term_mask
+            if not out.any():
+                break
+        return out
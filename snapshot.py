@@ -0,0 +1,160 @@
+# snapshot.py
+"""
+Versioned, immutable snapshots of the transaction table.
+
+FinanceApp.snapshot() returns the TransactionSnapshot of the current data
+version (FinanceApp.data_version, bumped on every save/reload). Taking one is
+df.copy(deep=False): with pandas Copy-on-Write (enabled in main) the snapshot
+shares every column with self.df, and the first write to self.df afterwards
+copies only the block it touches. Writers keep editing self.df as before and
+get a new version on save; readers holding the old snapshot still see the old
+data, so a background worker or an exporter can read it while the GUI edits.
+
+All readers of one version (Transactions view, Dashboard/Reports helpers, the
+dashboard worker thread) share one snapshot instead of each taking a full
+copy of the ledger, and the derived columns every reader used to rebuild on
+its own copy (parsed dates, numeric amounts, the transfer flag) are computed
+once per snapshot, on first use.
+
+The same goes for sort orders: sort_order(column, descending) is a row
+permutation built once per snapshot from dense ranks of the column (text
+case-folded on its distinct values only). Sorting any filtered subset is then
+a gather: keep the permutation entries whose rows pass the filter mask.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+PARSED_SORT_COLUMNS = ("Date", "Amount")   # sorted by parsed value; other columns as case-folded text
+
+
+def code_ranks(codes: np.ndarray, keys) -> np.ndarray:
+    """Dense ascending ranks for factorized codes, comparing their distinct values by keys; -1 stays -1."""
+    ranks, _ = pd.factorize(pd.Index(keys), sort=True)
+    return np.append(ranks, -1)[codes]
+
+
+def sort_ranks(values: pd.Series, casefold: bool = False) -> np.ndarray:
+    """Dense ascending ranks of values (equal values share a rank), -1 where missing."""
+    codes, uniques = pd.factorize(values)
+    return code_ranks(codes, pd.Index(uniques).astype(str).str.lower() if casefold else uniques)
+
+
+def sort_permutation(ranks: np.ndarray, descending: bool = False) -> np.ndarray:
+    """Stable row order by ranks; missing (-1) rows go last in either direction."""
+    if descending:
+        key = np.where(ranks < 0, 1, -ranks)
+    else:
+        key = np.where(ranks < 0, ranks.max(initial=0) + 1, ranks)
+    return np.argsort(key, kind="stable")
+
+
+def sort_column_ranks(frame: pd.DataFrame, column: str) -> np.ndarray:
+    """sort_ranks of a column the way the Transactions sort modes compare it (frame has Date/Amount parsed)."""
+    return sort_ranks(frame[column], casefold=column not in PARSED_SORT_COLUMNS)
+
+
+class TransactionSnapshot:
+    """One immutable version of the transactions. Frames handed out are CoW copies: edit them freely."""
+
+    def __init__(self, df: pd.DataFrame, version: int):
+        self.version = version
+        self.source = df   # the frame it was taken from (identity check only; never read)
+        self._frame = df.copy(deep=False)
+        self._parsed = None
+        self._transfer = None
+        self._factorized = {}
+        self._ranks = {}      # column -> sort ranks
+        self._orders = {}     # (column, descending) -> row permutation
+        self._lock = threading.Lock()   # derived columns may be first asked for from the worker thread
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    @property
+    def empty(self) -> bool:
+        return self._frame.empty
+
+    @property
+    def columns(self) -> pd.Index:
+        return self._frame.columns
+
+    def frame(self) -> pd.DataFrame:
+        """The transactions as stored (raw Date/Amount values)."""
+        return self._frame.copy(deep=False)
+
+    def parsed(self) -> pd.DataFrame:
+        """The transactions with Date as datetime64 (NaT when unparseable) and Amount numeric (NaN)."""
+        return self._parsed_frame().copy(deep=False)
+
+    def is_transfer(self) -> pd.Series:
+        """Rows whose Type is Transfer (any case); all False without a Type column."""
+        if self._transfer is None:
+            with self._lock:
+                if self._transfer is None:
+                    if "Type" in self._frame.columns:
+                        self._transfer = self._frame["Type"].astype(str).str.lower() == "transfer"
+                    else:
+                        self._transfer = pd.Series(False, index=self._frame.index)
+        return self._transfer
+
+    def factorized(self, column: str) -> tuple:
+        """(codes, distinct values as str) of a column, code -1 for missing; () without the column."""
+        hit = self._factorized.get(column)
+        if hit is None:
+            if column not in self._frame.columns:
+                return ()
+            with self._lock:
+                hit = self._factorized.get(column)
+                if hit is None:
+                    codes, uniques = pd.factorize(self._frame[column])
+                    hit = self._factorized[column] = (codes, pd.Index(uniques).astype(str))
+        return hit
+
+    def sort_order(self, column: str, descending: bool = False) -> np.ndarray:
+        """Row positions in sort order of column (see sort_column_ranks); missing values last."""
+        key = (column, descending)
+        order = self._orders.get(key)
+        if order is None:
+            ranks = self._ranks.get(column)
+            if ranks is None:
+                if column in PARSED_SORT_COLUMNS:
+                    ranks = sort_ranks(self._parsed_frame()[column])
+                else:
+                    # Text: case-fold the distinct values only, rows keep their factorized codes
+                    codes, uniques = self.factorized(column)
+                    ranks = code_ranks(codes, uniques.str.lower())
+                self._ranks[column] = ranks
+            order = self._orders[key] = sort_permutation(ranks, descending)
+        return order
+
+    def derived_nbytes(self) -> int:
+        """Bytes of what this snapshot built on top of the shared frame (parsed columns, codes, sort orders)."""
+        arrays = [a for pair in self._factorized.values() for a in pair]
+        arrays += list(self._ranks.values()) + list(self._orders.values())
+        if self._transfer is not None:
+            arrays.append(self._transfer)
+        if self._parsed is not None:
+            for c in self._parsed.columns:
+                col = self._parsed[c].to_numpy()
+                if not np.shares_memory(col, self._frame[c].to_numpy()):
+                    arrays.append(col)
+        return sum(int(a.nbytes) for a in arrays)
+
+    def in_range(self, start, end) -> pd.Series:
+        """Rows dated start <= date <= end (both inclusive)."""
+        dates = self._parsed_frame()["Date"]
+        return (dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))
+
+    def _parsed_frame(self) -> pd.DataFrame:
+        if self._parsed is None:
+            with self._lock:
+                if self._parsed is None:
+                    parsed = self._frame.copy(deep=False)
+                    if "Date" in parsed.columns:
+                        parsed["Date"] = pd.to_datetime(parsed["Date"], errors="coerce")
+                    if "Amount" in parsed.columns:
+                        parsed["Amount"] = pd.to_numeric(parsed["Amount"], errors="coerce")
+                    self._parsed = parsed
+        return self._parsed
@@ -0,0 +1,134 @@
+import datetime
+import os
+
+import pytest
+
+import backup_store
+from backup_store import BackupStore, chunk_bounds
+
+
+def _csv(ids) -> bytes:
+    lines = ["Id,Date,Vendor,Amount"] + [f"{i},2026-01-{i % 28 + 1:02d},Vendor {i % 97},-{i % 500}.25" for i in ids]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Backups are stamped from clock["now"], advanced by one second per snapshot unless set."""
+    clock = {"now": datetime.datetime(2026, 1, 1, 12, 0, 0)}
+
+    def now():
+        clock["now"] += datetime.timedelta(seconds=1)
+        return clock["now"]
+    monkeypatch.setattr(backup_store, "_now", now)
+    return clock
+
+
+def _write(path, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_chunk_bounds_cut_between_lines_within_size_limits():
+    data = _csv(range(40000))
+    bounds = chunk_bounds(data)
+    assert bounds[-1] == len(data) and bounds == sorted(set(bounds))
+    sizes = [b - a for a, b in zip([0] + bounds, bounds)]
+    assert len(bounds) > 10
+    assert all(s <= backup_store.MAX_CHUNK for s in sizes)
+    assert all(s >= backup_store.MIN_CHUNK for s in sizes[:-1])
+    assert all(data[b - 1:b] == b"\n" for b in bounds)
+    assert chunk_bounds(b"") == [] and chunk_bounds(b"a,b") == [3]
+
+
+def test_chunk_bounds_after_an_insert_keep_the_later_cuts():
+    base = _csv(range(40000))
+    edited = _csv(list(range(20000)) + [999999] + list(range(20000, 40000)))
+    shift = len(edited) - len(base)
+    late = [b for b in chunk_bounds(base) if b > len(base) * 0.6]
+    assert set(b + shift for b in late) <= set(chunk_bounds(edited))
+
+
+def test_backup_writes_only_changed_chunks(tmp_path, clock):
+    store = BackupStore(str(tmp_path / "backups"))
+    path = str(tmp_path / "tx.csv")
+    _write(path, _csv(range(40000)))
+    first = store.backup(path, "first")
+    assert first["new_chunks"] == len(first["chunks"]) > 10
+
+    assert store.backup(path, "again")["id"] == first["id"]   # unchanged file: nothing written
+    assert len(store.snapshots()) == 1
+
+    _write(path, _csv([i for i in range(40000) if i != 15000] + [40000, 40001]))
+    second = store.backup(path, "edited")
+    assert 1 <= second["new_chunks"] <= 4
+    assert second["new_chunks"] < len(second["chunks"]) // 5
+    reused = {h for h, _ in first["chunks"]} & {h for h, _ in second["chunks"]}
+    assert len(reused) == len(second["chunks"]) - second["new_chunks"]
+
+
+def test_restore_is_byte_identical(tmp_path, clock):
+    store = BackupStore(str(tmp_path / "backups"))
+    path = str(tmp_path / "tx.csv")
+    original = _csv(range(30000))
+    _write(path, original)
+    snap = store.backup(path)
+    _write(path, _csv(range(10)))
+    store.restore(snap["id"], path)
+    with open(path, "rb") as f:
+        assert f.read() == original
+    assert store.read(snap["id"]) == original
+
+
+def test_read_rejects_a_damaged_chunk(tmp_path, clock):
+    store = BackupStore(str(tmp_path / "backups"))
+    path = str(tmp_path / "tx.csv")
+    _write(path, _csv(range(30000)))
+    snap = store.backup(path)
+    h, _ = snap["chunks"][3]
+    _write(store._chunk_path(h), backup_store.zlib.compress(b"not the chunk"))
+    with pytest.raises(ValueError, match="damaged"):
+        store.read(snap["id"])
+    with pytest.raises(ValueError):
+        store.restore(snap["id"], path)   # dest is left as it was
+    with open(path, "rb") as f:
+        assert f.read() == _csv(range(30000))
+
+
+def test_read_rejects_a_checksum_mismatch(tmp_path, clock):
+    store = BackupStore(str(tmp_path / "backups"))
+    path = str(tmp_path / "tx.csv")
+    _write(path, _csv(range(30000)))
+    snap = store.backup(path)
+    # A chunk replaced by other bytes of the same length: its size checks out, the file hash does not
+    chunk = store._chunk_path(snap["chunks"][0][0])
+    with open(chunk, "rb") as f:
+        piece = backup_store.zlib.decompress(f.read())
+    _write(chunk, backup_store.zlib.compress(piece[::-1]))
+    with pytest.raises(ValueError, match="checksum"):
+        store.read(snap["id"])
+
+
+def test_prune_keeps_newest_per_day_and_week_and_collects_chunks(tmp_path, clock):
+    store = BackupStore(str(tmp_path / "backups"))
+    path = str(tmp_path / "tx.csv")
+    ids = []
+    start = datetime.datetime(2026, 1, 5, 9, 0, 0)   # a Monday
+    for day in range(21):
+        for hour in (9, 17):
+            clock["now"] = start + datetime.timedelta(days=day, hours=hour - 9) - datetime.timedelta(seconds=1)
+            _write(path, _csv(range(day * 100 + hour, day * 100 + hour + 3000)))
+            ids.append(store.backup(path, f"d{day}h{hour}")["id"])
+
+    deleted, freed = store.prune(keep_last=2, keep_daily=3, keep_weekly=2)
+    kept = [s["label"] for s in store.snapshots()]
+    # keep_last: the two newest; daily: newest of the last 3 days; weekly: newest of the last 2 ISO weeks
+    assert kept == ["d13h17", "d18h17", "d19h17", "d20h9", "d20h17"]
+    assert len(deleted) == len(ids) - len(kept) and freed > 0
+
+    used = {h for s in store.snapshots() for h, _ in s["chunks"]}
+    on_disk = {name[:-2] for _, _, names in os.walk(store.chunk_dir) for name in names}
+    assert on_disk == used
+    for s in store.snapshots():
+        store.read(s["id"])
+    assert store.collect_garbage() == 0
@@ -0,0 +1,24 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+import budget_engine
+import forecast
+
+
+def test_pending_charge_this_month_is_subtracted_from_budget_once():
+    today = datetime.date(2026, 3, 10)
+    pending = pd.DataFrame([{"Id": "1", "Date": "2026-03-05", "Account": "Checking", "Category": "Food",
+                             "Vendor": "Grocer", "Amount": -100.0, "Type": "Expense"}])
+    # The app passes spend from a SpendIndex over the whole ledger, which includes the pending row
+    index = budget_engine.SpendIndex.from_frame(pending)
+    projected, events = forecast.forecast(
+        {"Checking": 1000.0}, today, 1,
+        budgets={"Food": {"amount": 300.0, "period": "monthly"}},
+        pending=pending,
+        category_accounts={"Food": "Checking"},
+        spent_to_date={"Food": index.spent("Food", today.replace(day=1), today)},
+    )
+    assert len(events) == 1
+    assert projected.loc[pd.Timestamp("2026-03-31"), "Checking"] == pytest.approx(700.0)
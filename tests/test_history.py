@@ -0,0 +1,133 @@
+import pandas as pd
+import pytest
+
+import history
+
+pd.set_option("mode.copy_on_write", True)   # as main.py sets it: unchanged columns share memory
+
+
+def _frame(n=8):
+    return pd.DataFrame({
+        "Id": [str(i) for i in range(1, n + 1)],
+        "Date": [f"2026-01-{i:02d}" for i in range(1, n + 1)],
+        "Vendor": [f"Vendor {i}" for i in range(1, n + 1)],
+        "Amount": [-10.0 * i for i in range(1, n + 1)],
+        "AppliedToBalance": [i % 2 == 0 for i in range(1, n + 1)],
+    })
+
+
+def _delete_middle(df):
+    return df.drop(index=[3, 4]).reset_index(drop=True)
+
+
+def _append(df):
+    extra = pd.DataFrame({"Id": ["9", "10"], "Date": ["2026-02-01", "2026-02-02"], "Vendor": ["New", "New"],
+                          "Amount": [-1.5, 2.25], "AppliedToBalance": [False, True]})
+    return pd.concat([df, extra], ignore_index=True)
+
+
+def _edit(df):
+    out = df.copy()
+    out.loc[2, "Vendor"] = "Edited"
+    out.loc[5, "Amount"] = 99.0
+    return out
+
+
+def _delete_scattered_and_add(df):
+    out = df.drop(index=[0, 6]).reset_index(drop=True)
+    out.loc[1, "Vendor"] = "Edited"
+    extra = pd.DataFrame({"Id": ["42"], "Date": ["2026-03-01"], "Vendor": ["Inserted"],
+                          "Amount": [-7.0], "AppliedToBalance": [True]})
+    return pd.concat([out.iloc[:3], extra, out.iloc[3:]], ignore_index=True)
+
+
+def _reorder(df):
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def _duplicate_ids(df):
+    out = df.copy()
+    out.loc[3, "Id"] = out.loc[2, "Id"]
+    return out
+
+
+@pytest.mark.parametrize("change", [_delete_middle, _append, _edit, _delete_scattered_and_add, _reorder,
+                                    _duplicate_ids])
+def test_frame_changes_round_trip(change):
+    before = _frame()
+    after = change(before)
+    step = history.frame_changes(before, after)
+    assert step is not None
+    pd.testing.assert_frame_equal(history.apply_frame_changes(after, step, undo=True), before)
+    pd.testing.assert_frame_equal(history.apply_frame_changes(before, step), after)
+
+
+def test_slice_fast_paths_and_fallbacks():
+    before = _frame()
+    step = history.frame_changes(before, _delete_middle(before))
+    assert list(step["old"].index) == [3, 4] and step["old_values"].empty
+    step = history.frame_changes(before, _append(before))
+    assert list(step["new"].index) == [8, 9] and step["old"].empty
+    step = history.frame_changes(before, _edit(before))
+    assert set(step["old_values"].index) == {"3", "6"} and set(step["old_values"].columns) == {"Vendor", "Amount"}
+    assert "replace" in history.frame_changes(before, _reorder(before))
+    assert "replace" in history.frame_changes(before, _duplicate_ids(before))
+    assert history.frame_changes(before, before.copy()) is None
+
+
+def test_undo_of_delete_puts_rows_back_in_place_after_later_append():
+    before = _frame()
+    after = _delete_middle(before)
+    step = history.frame_changes(before, after)
+    later = _append(after)
+    restored = history.apply_frame_changes(later, step, undo=True)
+    assert list(restored["Id"]) == [str(i) for i in range(1, 11)]
+
+
+def test_doc_changes_round_trip():
+    before = {"Food": {"amount": 300}, "Rent": {"amount": 1000}}
+    after = {"Food": {"amount": 350}, "Fun": {"amount": 50}}
+    step = history.doc_changes(before, after)
+    assert history.apply_doc_changes({k: dict(v) for k, v in after.items()}, step, undo=True) == before
+    assert history.apply_doc_changes({k: dict(v) for k, v in before.items()}, step) == after
+    assert history.apply_doc_changes([1], history.doc_changes([1], [1, 2])) == [1, 2]
+
+
+def test_command_log_nested_steps_make_one_step():
+    log = history.CommandLog()
+    df = _frame()
+    docs = {"budgets": {"Food": 1}}
+    log.begin("Outer", df, docs)
+    df = _delete_middle(df)
+    log.begin("Inner", df, docs)
+    docs = {"budgets": {"Food": 2}}
+    assert log.end(df, docs) is None
+    step = log.end(df, docs)
+    assert step["label"] == "Outer" and len(log) == 1
+    assert set(step["docs"]) == {"budgets"}
+
+    assert log.undo() is step and log.undo_label() is None and log.redo_label() == "Outer"
+    assert log.redo() is step and log.undo_label() == "Outer"
+
+
+def test_command_log_skips_empty_steps_and_drops_oldest():
+    log = history.CommandLog(limit=2)
+    df = _frame()
+    log.begin("Nothing", df, {})
+    assert log.end(df, {}) is None and len(log) == 0
+    for label in ("a", "b", "c"):
+        log.begin(label, df, {})
+        df = _append(df.iloc[:8]) if label != "b" else _frame()
+        log.end(df, {})
+    assert len(log) == 2 and log.undo_label() == "c"
+
+
+def test_new_step_clears_redo():
+    log = history.CommandLog()
+    df = _frame()
+    log.begin("a", df, {})
+    log.end(_edit(df), {})
+    log.undo()
+    log.begin("b", df, {})
+    log.end(_delete_middle(df), {})
+    assert log.redo_label() is None and log.undo_label() == "b"
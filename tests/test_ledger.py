@@ -0,0 +1,18 @@
+import pandas as pd
+
+from ledger import BalanceLedger
+
+
+def test_rebuild_with_duplicate_ids_keeps_history_consistent():
+    df = pd.DataFrame({
+        "Id": ["1", "1", "2"],
+        "Date": ["2026-01-01", "2026-01-01", "2026-01-02"],
+        "Account": ["Checking"] * 3,
+        "Amount": [10.0, 10.0, 5.0],
+        "AppliedToBalance": [True, True, True],
+    })
+    ledger = BalanceLedger()
+    ledger.rebuild(df)
+    assert ledger.applied_total("Checking") == 15.0
+    assert ledger.balance_on("Checking", "2026-01-01") == 10.0
+    assert ledger.balance_on("Checking", "2026-01-02") == 15.0
@@ -0,0 +1,136 @@
+import datetime
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pandas as pd
+from PySide6.QtWidgets import QApplication, QMessageBox
+
+import budget_engine
+import main
+from benchmarks import synthetic
+from benchmarks.bench_ui import write_dataset
+from history import CommandLog
+from ledger import BalanceLedger
+from month_store import MonthStore, row_months
+from rollups import MonthlyRollup
+
+app = QApplication.instance() or QApplication([])
+
+
+def _write_ledger(path, n=3000, seed=3):
+    out = synthetic.generate_ledger(n, seed=seed)
+    out["AppliedToBalance"] = out["AppliedToBalance"].map(lambda x: "True" if x else "False")
+    out.to_csv(path, index=False)
+    return main.normalize_transactions(pd.read_csv(path, dtype=str))
+
+
+def _store(tmp_path):
+    return MonthStore(str(tmp_path / "tx.csv"), str(tmp_path / "tx_index.json"), main.TRANSACTION_COLUMNS,
+                      main.normalize_transactions)
+
+
+def _ids(df) -> list[str]:
+    return sorted(df["Id"].astype(str))
+
+
+def test_months_read_back_and_the_base_stands_in_for_the_rest(tmp_path):
+    full = _write_ledger(tmp_path / "tx.csv")
+    store = _store(tmp_path)
+    assert store.open()
+    assert store.rows() == len(full)
+
+    codes = row_months(full)
+    loaded = set(sorted(store.months)[-6:])
+    part = store.read_months(loaded)
+    assert _ids(part) == _ids(full[pd.Series(codes).isin(loaded).to_numpy()])
+
+    base = store.base(loaded)
+    ledger, whole = BalanceLedger.from_frame(part, base["ledger"]), BalanceLedger.from_frame(full)
+    for account in set(full["Account"]):
+        assert round(ledger.applied_total(account), 2) == round(whole.applied_total(account), 2)
+        assert round(ledger.balance_on(account, "2023-03-15"), 2) == round(whole.balance_on(account, "2023-03-15"), 2)
+
+    start, end = datetime.date(2021, 2, 10), synthetic.ANCHOR_DATE
+    spent = budget_engine.SpendIndex.from_frame(part, base["spend"]).spent_by_category(start, end)
+    expected = budget_engine.SpendIndex.from_frame(full).spent_by_category(start, end)
+    assert {k: round(v, 2) for k, v in spent.items()} == {k: round(v, 2) for k, v in expected.items()}
+
+    rollup = MonthlyRollup.from_frame(part, base["tables"])
+    assert rollup.monthly_totals().equals(MonthlyRollup.from_frame(full).monthly_totals())
+
+
+def test_write_keeps_the_months_that_are_not_loaded(tmp_path):
+    full = _write_ledger(tmp_path / "tx.csv")
+    store = _store(tmp_path)
+    store.open()
+    loaded = set(sorted(store.months)[-3:])
+    part = store.read_months(loaded)
+    part.loc[0, "Vendor"] = "Edited"
+    part = part.drop(index=[1]).reset_index(drop=True)
+    store.write(part, loaded)
+
+    back = main.normalize_transactions(pd.read_csv(tmp_path / "tx.csv", dtype=str))
+    assert len(back) == len(full) - 1
+    assert back.loc[back["Id"] == part.loc[0, "Id"], "Vendor"].tolist() == ["Edited"]
+    old = sorted(set(store.months) - loaded)
+    assert _ids(store.read_months(old)) == _ids(full[pd.Series(row_months(full)).isin(old).to_numpy()])
+
+    # The saved index is used as is on the next open
+    again = _store(tmp_path)
+    assert again.open()
+    assert again.months == store.months
+
+
+def test_file_with_duplicate_ids_is_not_paged(tmp_path):
+    full = _write_ledger(tmp_path / "tx.csv", n=200)
+    full.loc[5, "Id"] = full.loc[4, "Id"]
+    full.to_csv(tmp_path / "tx.csv", index=False)
+    store = _store(tmp_path)
+    assert not store.open()
+    assert store.months == {}
+
+
+def test_rows_loaded_during_a_step_are_not_recorded_as_inserts():
+    df = pd.DataFrame({"Id": ["1", "2"], "Date": ["2026-01-01", "2026-01-02"], "Amount": [-1.0, -2.0]})
+    older = pd.DataFrame({"Id": ["3"], "Date": ["2020-05-01"], "Amount": [-3.0]})
+    log = CommandLog()
+    log.begin("Edit", df, {})
+    df = pd.concat([df, older], ignore_index=True)
+    log.note_loaded(older)
+    df.loc[2, "Amount"] = -4.0
+    step = log.end(df, {})
+    assert step["rows"]["new"].empty
+    assert step["rows"]["old_values"]["Amount"].to_dict() == {"3": -3.0}
+
+
+def test_app_reads_old_months_on_demand(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(QMessageBox, "information", staticmethod(lambda *a, **k: None))
+    write_dataset(3000, 1)
+    main.FinanceApp().save_transactions()   # rewritten grouped by month, with its index
+    window = main.FinanceApp()
+    assert window.store.paged and len(window.df) < window.store.rows() == 3000
+
+    window.txn_filter_from_picker.setDate(datetime.date(2021, 1, 1))
+    window.txn_filter_to_picker.setDate(datetime.date(2021, 3, 31))
+    window.txn_filter_dropdown.setCurrentText("Custom Range")
+    window.update_table()
+    shown = window.get_sorted_transactions()
+    assert len(shown) == window.txn_model.total_rows() > 0
+
+    tx_id = str(shown["Id"].iloc[0])
+    # An edit to a 2021 row (the dialog is not driven here), then the view moves on and the month is dropped
+    window.begin_undo_step("Edit transaction")
+    window.df.loc[window.df["Id"].astype(str) == tx_id, "Vendor"] = "Edited"
+    window.save_transactions()
+    window.end_undo_step()
+
+    window.txn_filter_dropdown.setCurrentText("This Month")
+    window.update_table()
+    assert tx_id not in set(window.df["Id"].astype(str))
+    window.undo()
+    disk = pd.read_csv("sample_transactions.csv", dtype=str)
+    assert len(disk) == 3000
+    assert disk.loc[disk["Id"] == tx_id, "Vendor"].iloc[0] != "Edited"
+    window.close()
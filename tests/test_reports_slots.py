@@ -0,0 +1,24 @@
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+import main
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_custom_range_date_change_refreshes_reports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    errors = []
+    monkeypatch.setattr(sys, "excepthook", lambda *exc: errors.append(exc[1]))
+    window = main.FinanceApp()
+    window._ensure_tab_built("Reports")
+    window.reports_from_picker.dateChanged.emit(window.reports_from_picker.date().addDays(-3))
+    window.reports_to_picker.dateChanged.emit(window.reports_to_picker.date())
+    app.processEvents()
+
+    assert errors == []
+    window.close()
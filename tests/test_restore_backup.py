@@ -0,0 +1,40 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QMessageBox
+
+import main
+from benchmarks.bench_ui import write_dataset
+
+app = QApplication.instance() or QApplication([])
+
+
+def _drift(window) -> dict[str, float]:
+    """Stored balance minus (starting balance + applied transactions), per account."""
+    return {a["name"]: round(float(a["balance"]) - float(a["starting_balance"])
+                             - window.ledger.applied_total(a["name"]), 2) for a in window.accounts}
+
+
+def test_restore_keeps_balances_in_line_with_the_ledger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(QMessageBox, "information", staticmethod(lambda *a, **k: None))
+    monkeypatch.setattr(QMessageBox, "warning", staticmethod(lambda *a, **k: None))
+    monkeypatch.setattr(QMessageBox, "question", staticmethod(lambda *a, **k: QMessageBox.Yes))
+    write_dataset(500, 1)
+    window = main.FinanceApp()
+    drift = _drift(window)
+
+    backup = window.backup_transactions("Test")
+    applied = window.df[window.df["AppliedToBalance"] & (window.df["Amount"] != 0)]
+    window._delete_transaction_by_id(str(applied["Id"].iloc[0]))
+    assert _drift(window) == drift
+
+    window._restore_backup(backup["id"])
+    assert window.store.rows() == 500   # on disk: self.df keeps only the months on screen
+    assert _drift(window) == drift
+
+    window.undo()
+    assert window.store.rows() == 499
+    assert _drift(window) == drift
+    window.close()
@@ -0,0 +1,137 @@
+# transactions_model.py
+"""
+Transactions tab table as a lazily paged Qt model.
+
+The model holds no copy of the rows it shows: just the snapshot's parsed
+columns (shared, copy-on-write) and the array of row positions in display
+order that FinanceApp computes from the date window, filters, search and sort
+(8 bytes per row). Rows are handed to the view a page at a time through
+canFetchMore/fetchMore, so the view only lays out what has been scrolled to,
+and a cell is formatted only when Qt paints it. No QTableWidgetItem is
+created per cell; memory for the view stays flat however many rows match.
+
+The rows behind it are paged too, a month at a time: FinanceApp.df holds the
+months the date window covers (see month_store.py), so a snapshot is only as
+long as what the views show.
+"""
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QFont
+
+from formatting import fmt_money
+
+PAGE_ROWS = 500
+# data() runs for every role of every painted cell: compare plain ints, not Qt enum members
+_DISPLAY = Qt.ItemDataRole.DisplayRole.value
+_ALIGN = Qt.ItemDataRole.TextAlignmentRole.value
+_FONT = Qt.ItemDataRole.FontRole.value
+_TOOLTIP = Qt.ItemDataRole.ToolTipRole.value
+_RIGHT = (Qt.AlignRight | Qt.AlignVCenter).value
+
+
+class TransactionsTableModel(QAbstractTableModel):
+    """Columns of the ledger; rows are frame positions in display order."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns = []
+        self._arrays = []          # per column: numpy view of the frame column
+        self._positions = np.empty(0, dtype=np.int64)
+        self._loaded = 0
+        self._category_col = -1
+        self._source_col = -1       # CategorySource: Auto rows show their Category in italics
+        self._italic = None
+
+    def set_rows(self, frame: pd.DataFrame, positions: np.ndarray):
+        """Show frame's rows at positions (Date parsed, Amount numeric), from the first page."""
+        self.beginResetModel()
+        columns = list(frame.columns)
+        self._columns = columns
+        self._arrays = [frame[c].to_numpy() for c in columns]
+        self._positions = np.asarray(positions, dtype=np.int64)
+        self._loaded = min(PAGE_ROWS, len(self._positions))
+        self._category_col = columns.index("Category") if "Category" in columns else -1
+        self._source_col = columns.index("CategorySource") if "CategorySource" in columns else -1
+        self.endResetModel()
+
+    def total_rows(self) -> int:
+        """Rows matching, loaded or not."""
+        return len(self._positions)
+
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    def row_id(self, row: int) -> str | None:
+        """Id of a view row (None when out of range or blank)."""
+        if "Id" not in self._columns or not 0 <= row < len(self._positions):
+            return None
+        value = self._arrays[self._columns.index("Id")][self._positions[row]]
+        text = "" if _missing(value) else str(value)
+        return text or None
+
+    def nbytes(self) -> int:
+        """Bytes the model holds itself (the display order); the column arrays belong to the snapshot."""
+        return int(self._positions.nbytes)
+
+    # ---------- paging
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self._positions)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        n = min(PAGE_ROWS, len(self._positions) - self._loaded)
+        if n <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + n - 1)
+        self._loaded += n
+        self.endInsertRows()
+
+    # ---------- QAbstractTableModel
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self._columns):
+            return self._columns[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable if index.isValid() else Qt.NoItemFlags
+
+    def data(self, index, role=_DISPLAY):
+        if role == _DISPLAY:
+            col = index.column()
+            value = self._arrays[col][self._positions[index.row()]]
+            if _missing(value):
+                return ""
+            name = self._columns[col]
+            if name == "Date":
+                return pd.Timestamp(value).strftime("%Y-%m-%d")
+            if name == "Amount":
+                return fmt_money(value)
+            return str(value)
+        if role == _ALIGN:
+            return _RIGHT if self._columns[index.column()] == "Amount" else None
+        if (role == _FONT or role == _TOOLTIP) and index.column() == self._category_col \
+                and self._is_auto(self._positions[index.row()]):
+            # Sprint 12: auto-categorized rows show their category in italics with a tooltip
+            if role == _FONT:
+                if self._italic is None:
+                    self._italic = QFont()
+                    self._italic.setItalic(True)
+                return self._italic
+            return "Auto-categorized"
+        return None
+
+    def _is_auto(self, pos) -> bool:
+        return self._source_col >= 0 and str(self._arrays[self._source_col][pos] or "").lower() == "auto"
+
+
+def _missing(value) -> bool:
+    return value is None or value is pd.NaT or (isinstance(value, float) and value != value) \
+        or (isinstance(value, np.datetime64) and np.isnat(value))
@@ -0,0 +1,131 @@
+# transfers.py
+"""
+Automatic transfer-pair detection.
+
+A transfer shows up as two rows: an outflow on one account and an inflow of the
+same magnitude on another account a few days apart. Instead of comparing every
+pair of rows, candidates are found with a hash join on (amount in cents, date
+bucket): buckets are max_days + 1 wide, so two rows within max_days of each
+other are always in the same or adjacent buckets. Each inflow is joined against
+its own and both neighbouring buckets, then pairs are filtered on the exact day
+gap and assigned greedily (closest dates first, each row used once).
+"""
+import uuid
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_DAYS = 3
+
+SUGGESTION_COLUMNS = ["OutId", "InId", "OutAccount", "InAccount", "Amount",
+                      "OutDate", "InDate", "DaysApart", "OutVendor", "InVendor"]
+
+
+def _unlinked(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows that can still become half of a transfer (not linked, on a real account, non-zero)."""
+    out = df
+    if "TransferGroup" in out.columns:
+        out = out[out["TransferGroup"].fillna("").astype(str).str.strip() == ""]
+    if "Type" in out.columns:
+        out = out[out["Type"].astype(str) != "Transfer"]
+    acct = out["Account"].fillna("").astype(str)
+    return out[(acct != "") & (acct != "Unassigned")]
+
+
+def find_transfer_pairs(df: pd.DataFrame, max_days: int = DEFAULT_MAX_DAYS) -> pd.DataFrame:
+    """
+    Suggested (outflow, inflow) pairs with equal magnitude, different accounts and
+    dates at most max_days apart. One row per pair, columns SUGGESTION_COLUMNS,
+    ordered by outflow date.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=SUGGESTION_COLUMNS)
+    max_days = max(0, int(max_days))
+
+    cand = _unlinked(df)
+    dates = pd.to_datetime(cand["Date"], errors="coerce")
+    cents = (pd.to_numeric(cand["Amount"], errors="coerce") * 100).round()
+    ok = dates.notna() & cents.notna() & (cents != 0)
+    if not ok.any():
+        return pd.DataFrame(columns=SUGGESTION_COLUMNS)
+
+    rows = pd.DataFrame({
+        "Id": cand["Id"].astype(str)[ok].to_numpy(),
+        "Account": cand["Account"].astype(str)[ok].to_numpy(),
+        "Vendor": cand["Vendor"].astype(str)[ok].to_numpy() if "Vendor" in cand.columns else "",
+        "Cents": cents[ok].astype("int64").to_numpy(),
+        "Day": dates[ok].to_numpy().astype("datetime64[D]").astype("int64"),
+    })
+    rows["Key"] = rows["Cents"].abs()
+    rows["Bucket"] = rows["Day"] // (max_days + 1)
+
+    outs = rows[rows["Cents"] < 0]
+    ins = rows[rows["Cents"] > 0]
+    if outs.empty or ins.empty:
+        return pd.DataFrame(columns=SUGGESTION_COLUMNS)
+
+    # Each inflow probes its own bucket and both neighbours
+    probes = pd.concat([ins.assign(Bucket=ins["Bucket"] + shift) for shift in (-1, 0, 1)], ignore_index=True)
+    pairs = outs.merge(probes, on=["Key", "Bucket"], suffixes=("Out", "In"))
+    pairs = pairs[pairs["AccountOut"] != pairs["AccountIn"]]
+    pairs["DaysApart"] = (pairs["DayIn"] - pairs["DayOut"]).abs()
+    pairs = pairs[pairs["DaysApart"] <= max_days]
+    if pairs.empty:
+        return pd.DataFrame(columns=SUGGESTION_COLUMNS)
+
+    # Greedy one-to-one: closest dates first, inflow after outflow preferred, then ledger order
+    pairs["InBefore"] = (pairs["DayIn"] < pairs["DayOut"]).astype(int)
+    pairs = pairs.sort_values(["DaysApart", "InBefore", "DayOut", "IdOut", "IdIn"], kind="stable")
+    used_out, used_in, keep = set(), set(), []
+    for pos, (o, i) in enumerate(zip(pairs["IdOut"].tolist(), pairs["IdIn"].tolist())):
+        if o in used_out or i in used_in:
+            continue
+        used_out.add(o)
+        used_in.add(i)
+        keep.append(pos)
+    pairs = pairs.iloc[keep].sort_values(["DayOut", "IdOut"], kind="stable")
+
+    epoch = np.datetime64("1970-01-01", "D")
+    return pd.DataFrame({
+        "OutId": pairs["IdOut"].to_numpy(),
+        "InId": pairs["IdIn"].to_numpy(),
+        "OutAccount": pairs["AccountOut"].to_numpy(),
+        "InAccount": pairs["AccountIn"].to_numpy(),
+        "Amount": pairs["Key"].to_numpy() / 100.0,
+        "OutDate": (epoch + pairs["DayOut"].to_numpy().astype("timedelta64[D]")).astype(str),
+        "InDate": (epoch + pairs["DayIn"].to_numpy().astype("timedelta64[D]")).astype(str),
+        "DaysApart": pairs["DaysApart"].to_numpy(),
+        "OutVendor": pairs["VendorOut"].to_numpy(),
+        "InVendor": pairs["VendorIn"].to_numpy(),
+    }).reset_index(drop=True)
+
+
+def link_transfer_pairs(df: pd.DataFrame, pairs) -> int:
+    """
+    Link (out_id, in_id) pairs in place: shared new TransferGroup id, Type and
+    Category set to Transfer. Returns the number of pairs linked.
+    """
+    if df.empty:
+        return 0
+    if "TransferGroup" not in df.columns:
+        df["TransferGroup"] = ""
+    pos_by_id = pd.Series(np.arange(len(df)), index=df["Id"].astype(str))
+    pos_by_id = pos_by_id[~pos_by_id.index.duplicated()]
+
+    positions, groups = [], []
+    for out_id, in_id in pairs:
+        a = pos_by_id.get(str(out_id))
+        b = pos_by_id.get(str(in_id))
+        if a is None or b is None:
+            continue
+        tg = str(uuid.uuid4())
+        positions += [a, b]
+        groups += [tg, tg]
+    if not positions:
+        return 0
+
+    idx = df.index[positions]
+    df.loc[idx, "Type"] = "Transfer"
+    df.loc[idx, "Category"] = "Transfer"
+    df.loc[idx, "TransferGroup"] = groups
+    return len(positions) // 2